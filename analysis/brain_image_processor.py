@@ -8,19 +8,87 @@ Author: fMRI Tool Representation Study Team
 Date: 2024
 """
 
+import hashlib
+import io
+import json
+import operator
 import os
+import struct
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
+import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
 import logging
-from PIL import Image
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 # Set up module logger (configured by application)
 logger = logging.getLogger(__name__)
 
+# PIL.Image, imported on first use so metadata-only callers never load Pillow
+_Image = None
+
+# scipy.spatial.cKDTree, imported on first use so importing this module stays cheap
+_cKDTree = None
+
+# Bump whenever the structure of process_all_brain_data results changes so
+# older on-disk caches are not reused
+_CACHE_VERSION = 3
+
+# First 8 bytes of every PNG file
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# C-level field getters for coordinate and statistic records
+_XYZ = operator.itemgetter('x', 'y', 'z')
+_TPQ = operator.itemgetter('threshold', 'p', 'q')
+
+# Compact dtypes for per-region statistical table columns
+_TBL_DTYPES = {
+    'mni_x': 'int16',
+    'mni_y': 'int16',
+    'mni_z': 'int16',
+    'threshold': 'float32',
+    'p_value': 'float32',
+    'q_value': 'float32'
+}
+
+
+def _pil():
+    """Return the PIL.Image module, importing it on first use."""
+    global _Image
+    if _Image is None:
+        from PIL import Image as _Image
+    return _Image
+
+
+def _kdtree_class():
+    """Return scipy.spatial.cKDTree, importing it on first use."""
+    global _cKDTree
+    if _cKDTree is None:
+        from scipy.spatial import cKDTree as _cKDTree
+    return _cKDTree
+
+
+def _freeze(obj):
+    """
+    Recursively convert dicts to read-only mapping proxies and lists to tuples.
+    
+    Args:
+        obj: Nested dict/list structure
+        
+    Returns:
+        Immutable view of the structure, safe to share across instances and threads
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(value) for value in obj)
+    return obj
+
 
 class BrainImageProcessor:
     """
@@ -30,6 +98,69 @@ class BrainImageProcessor:
     into the visualization pipeline.
     """
     
+    # Brain image mapping based on experimental conditions. 'mni_coords' and 'stats'
+    # are always lists with one entry per reported peak, aligned with 'regions'
+    BRAIN_IMAGE_MAPPING = _freeze({
+        'clench': {
+            'filename': 'clench_afni.png',
+            'condition': 'Clench Localizer',
+            'description': 'Finger clenching task - M1 activation',
+            'regions': ['Primary Motor Cortex (M1)', 'Brodmann Area 4', 'Brodmann Area 6'],
+            'mni_coords': [
+                {'x': -40, 'y': 22, 'z': 62}   # M1 peak
+            ],
+            'stats': [
+                {'threshold': 3.7037, 'p': 2.3e-4, 'q': 0.0047}
+            ]
+        },
+        'imagined_grasp': {
+            'filename': 'IGshape_tool_vs_PVshape_tool_GLT#0_Tstat.png',
+            'condition': 'Imagined Grasp (Tools + Shapes)',
+            'description': 'Imagined grasping task - combined tools and shapes',
+            'regions': ['Left superior frontal gyrus', 'Parietal lobe', 'LOC (Lateral Occipital Complex)'],
+            'mni_coords': [
+                {'x': 24, 'y': -58, 'z': 22},  # Superior frontal gyrus
+                {'x': 24, 'y': 50, 'z': 54},   # Parietal lobe
+                {'x': 24, 'y': 90, 'z': 24}    # LOC
+            ],
+            'stats': [
+                {'threshold': 3.5391, 'p': 0.0016, 'q': 0.0199},
+                {'threshold': 3.5391, 'p': 0.0016, 'q': 0.0199},
+                {'threshold': 3.1687, 'p': 0.0016, 'q': 0.0199}
+            ]
+        },
+        'passive_viewing': {
+            'filename': 'results.png',
+            'condition': 'Passive Viewing: Tool vs Shape',
+            'description': 'Passive viewing contrast - tools vs shapes',
+            'regions': ['LOC; V1; V2; BA 18/17', 'Left Pre/Postcentral Gyrus; BA 3-5'],
+            'mni_coords': [
+                {'x': 22, 'y': 100, 'z': -2},  # Visual cortex
+                {'x': 10, 'y': 44, 'z': 70}    # Pre/postcentral gyrus
+            ],
+            'stats': [
+                {'threshold': 3.5802, 'p': 3.7e-4, 'q': 0.0111},
+                {'threshold': 3.5802, 'p': 3.7e-4, 'q': 0.0111}
+            ]
+        },
+        'imagined_vs_passive': {
+            'filename': 'Screen Shot 2020-04-21 at 4.01.26 AM.png',
+            'condition': 'Average Imagined Grasp vs Passive Viewing',
+            'description': 'Contrast between imagined grasp and passive viewing',
+            'regions': ['Left superior frontal gyrus', 'Brodmann Area 6', 'Left superior parietal lobe'],
+            'mni_coords': [
+                {'x': 22, 'y': -54, 'z': 18},  # Superior frontal gyrus
+                {'x': 22, 'y': 10, 'z': 68},    # BA 6
+                {'x': 22, 'y': 48, 'z': 68}     # Superior parietal lobe
+            ],
+            'stats': [
+                {'threshold': 3.5391, 'p': 4.4e-4, 'q': 0.0533},
+                {'threshold': 3.5391, 'p': 4.4e-4, 'q': 0.0533},
+                {'threshold': 3.5391, 'p': 4.4e-4, 'q': 0.0533}
+            ]
+        }
+    })
+    
     def __init__(self, data_root: str):
         """
         Initialize the BrainImageProcessor.
@@ -41,66 +172,39 @@ class BrainImageProcessor:
         self.raw_data_path = self.data_root / "raw"
         self.processed_data_path = self.data_root / "processed"
         
-        # Brain image mapping based on experimental conditions
-        self.brain_image_mapping = {
-            'clench': {
-                'filename': 'clench_afni.png',
-                'condition': 'Clench Localizer',
-                'description': 'Finger clenching task - M1 activation',
-                'regions': ['Primary Motor Cortex (M1)', 'Brodmann Area 4', 'Brodmann Area 6'],
-                'mni_coords': {'x': -40, 'y': 22, 'z': 62},
-                'stats': {'threshold': 3.7037, 'p': 2.3e-4, 'q': 0.0047}
-            },
-            'imagined_grasp': {
-                'filename': 'IGshape_tool_vs_PVshape_tool_GLT#0_Tstat.png',
-                'condition': 'Imagined Grasp (Tools + Shapes)',
-                'description': 'Imagined grasping task - combined tools and shapes',
-                'regions': ['Left superior frontal gyrus', 'Parietal lobe', 'LOC (Lateral Occipital Complex)'],
-                'mni_coords': [
-                    {'x': 24, 'y': -58, 'z': 22},  # Superior frontal gyrus
-                    {'x': 24, 'y': 50, 'z': 54},   # Parietal lobe
-                    {'x': 24, 'y': 90, 'z': 24}    # LOC
-                ],
-                'stats': [
-                    {'threshold': 3.5391, 'p': 0.0016, 'q': 0.0199},
-                    {'threshold': 3.5391, 'p': 0.0016, 'q': 0.0199},
-                    {'threshold': 3.1687, 'p': 0.0016, 'q': 0.0199}
-                ]
-            },
-            'passive_viewing': {
-                'filename': 'results.png',
-                'condition': 'Passive Viewing: Tool vs Shape',
-                'description': 'Passive viewing contrast - tools vs shapes',
-                'regions': ['LOC; V1; V2; BA 18/17', 'Left Pre/Postcentral Gyrus; BA 3-5'],
-                'mni_coords': [
-                    {'x': 22, 'y': 100, 'z': -2},  # Visual cortex
-                    {'x': 10, 'y': 44, 'z': 70}    # Pre/postcentral gyrus
-                ],
-                'stats': [
-                    {'threshold': 3.5802, 'p': 3.7e-4, 'q': 0.0111},
-                    {'threshold': 3.5802, 'p': 3.7e-4, 'q': 0.0111}
-                ]
-            },
-            'imagined_vs_passive': {
-                'filename': 'Screen Shot 2020-04-21 at 4.01.26 AM.png',
-                'condition': 'Average Imagined Grasp vs Passive Viewing',
-                'description': 'Contrast between imagined grasp and passive viewing',
-                'regions': ['Left superior frontal gyrus', 'Brodmann Area 6', 'Left superior parietal lobe'],
-                'mni_coords': [
-                    {'x': 22, 'y': -54, 'z': 18},  # Superior frontal gyrus
-                    {'x': 22, 'y': 10, 'z': 68},    # BA 6
-                    {'x': 22, 'y': 48, 'z': 68}     # Superior parietal lobe
-                ],
-                'stats': [
-                    {'threshold': 3.5391, 'p': 4.4e-4, 'q': 0.0533},
-                    {'threshold': 3.5391, 'p': 4.4e-4, 'q': 0.0533},
-                    {'threshold': 3.5391, 'p': 4.4e-4, 'q': 0.0533}
-                ]
-            }
+        # Shared, read-only mapping built once at import time
+        self.brain_image_mapping = self.BRAIN_IMAGE_MAPPING
+        
+        # Full image paths, joined once rather than on every load
+        raw_root = str(self.raw_data_path)
+        self._image_paths = {
+            condition: os.path.join(raw_root, info['filename'])
+            for condition, info in self.brain_image_mapping.items()
         }
+        self.refresh()
+        
+        # (condition, mode) -> (PIL image, read-only pixel array) kept alive together
+        self._pixel_cache = {}
+        
+        # Nearest-region lookup over MNI peaks, built by load_brain_images
+        self._kdtree = None
+        self._kdtree_labels = []
         
         logger.info("Initialized BrainImageProcessor")
     
+    def refresh(self) -> None:
+        """
+        Rescan the raw data directory for available brain images.
+        
+        A single directory read replaces one stat call per mapped image; call this
+        again if images are added or removed after initialization.
+        """
+        if self.raw_data_path.is_dir():
+            with os.scandir(self.raw_data_path) as entries:
+                self._raw_files = {entry.name for entry in entries}
+        else:
+            self._raw_files = set()
+    
     def load_brain_images(self) -> Dict[str, Dict]:
         """
         Load and process all brain activation images.
@@ -113,69 +217,219 @@ class BrainImageProcessor:
         brain_data = {}
         
         for condition, info in self.brain_image_mapping.items():
-            image_path = self.raw_data_path / info['filename']
+            image_path = self._image_paths[condition]
             
-            if image_path.exists():
+            if info['filename'] in self._raw_files:
                 try:
-                    # Load image
-                    image = Image.open(image_path)
-                    
-                    # Store image data
-                    brain_data[condition] = {
-                        'image': image,
-                        'path': str(image_path),
-                        'condition': info['condition'],
-                        'description': info['description'],
-                        'regions': info['regions'],
-                        'mni_coords': info['mni_coords'],
-                        'stats': info['stats'],
-                        'filename': info['filename']
-                    }
-                    
-                    logger.info(f"✓ Loaded {condition}: {info['condition']}")
-                    
-                except Exception as e:
-                    logger.error(f"Error loading {info['filename']}: {str(e)}")
+                    brain_data[condition] = _load_one(info, image_path)
+                    logger.info("✓ Loaded %s: %s", condition, info['condition'])
+                except FileNotFoundError:
+                    # Removed since the last directory scan
+                    logger.info("Image not found (skipping): %s", image_path)
+                except Exception:
+                    logger.exception("Error loading %s", info['filename'])
             else:
-                logger.info(f"Image not found (skipping): {image_path}")
+                logger.info("Image not found (skipping): %s", image_path)
+        
+        self.build_coordinate_index(brain_data)
         
         if len(brain_data) > 0:
-            logger.info(f"Successfully loaded {len(brain_data)} brain images")
+            logger.info("Successfully loaded %d brain images", len(brain_data))
         else:
             logger.info("No brain images found - using demo mode with simulated data")
         return brain_data
     
-    def create_brain_image_summary(self, brain_data: Dict[str, Dict]) -> str:
+    @staticmethod
+    def _png_size(path: str) -> Tuple[int, int]:
         """
-        Create a summary of brain image data.
+        Read PNG dimensions straight from the IHDR chunk without decoding.
+        
+        Args:
+            path: Path to a PNG file
+            
+        Returns:
+            Tuple of (width, height)
+            
+        Raises:
+            ValueError: If the file is not a PNG
+        """
+        with open(path, 'rb') as f:
+            header = f.read(24)
+        if len(header) < 24 or header[:8] != _PNG_SIGNATURE or header[12:16] != b'IHDR':
+            raise ValueError(f"Not a valid PNG file: {path}")
+        return struct.unpack('>II', header[16:24])
+    
+    def get_pil(self, condition: str) -> "Image.Image":
+        """
+        Open the brain image for a condition on demand.
+        
+        Args:
+            condition: Condition key from the brain image mapping
+            
+        Returns:
+            PIL image (lazily decoded by Pillow)
+        """
+        return _pil().open(self._image_paths[condition])
+    
+    def get_pixels(self, condition: str, mode: Optional[str] = None) -> np.ndarray:
+        """
+        Get the pixel data for a condition's brain image as a NumPy array.
+        
+        The decoded image and its array view are cached together so repeated calls
+        neither re-decode nor copy. The returned array is read-only; callers must copy
+        it before modifying.
+        
+        Args:
+            condition: Condition key from the brain image mapping
+            mode: Optional PIL mode to convert to first (e.g. 'RGBA')
+            
+        Returns:
+            Read-only array of shape (height, width[, channels])
+        """
+        key = (condition, mode)
+        cached = self._pixel_cache.get(key)
+        
+        if cached is None:
+            image = self.get_pil(condition)
+            if mode is not None and image.mode != mode:
+                image = image.convert(mode)
+            cached = (image, _pil_to_np_view(image))
+            self._pixel_cache[key] = cached
+        
+        return cached[1]
+    
+    def load_brain_volume(self, path: str, mmap: bool = True) -> np.ndarray:
+        """
+        Load a brain volume or image, memory-mapping it when the format allows.
+        
+        NIfTI volumes are read through nibabel and TIFF stacks through tifffile so
+        that large volumes are paged in on access instead of read into memory.
+        PNG screenshots are decoded with PIL as before.
+        
+        Args:
+            path: Path to a .nii/.nii.gz, .tif/.tiff or .png file
+            mmap: Whether to memory-map the data where supported
+            
+        Returns:
+            Array (possibly a numpy.memmap) holding the volume data
+        """
+        path = Path(path)
+        name = path.name.lower()
+        
+        if name.endswith('.nii') or name.endswith('.nii.gz'):
+            try:
+                import nibabel
+            except ImportError:
+                raise ImportError("nibabel is required to load NIfTI volumes: pip install nibabel")
+            image = nibabel.load(str(path), mmap=mmap)
+            return np.asanyarray(image.dataobj)
+        
+        if name.endswith('.tif') or name.endswith('.tiff'):
+            try:
+                import tifffile
+            except ImportError:
+                raise ImportError("tifffile is required to load TIFF volumes: pip install tifffile")
+            return tifffile.memmap(str(path), mode='r') if mmap else tifffile.imread(str(path))
+        
+        if name.endswith('.png'):
+            return _pil_to_np_view(_pil().open(path))
+        
+        raise ValueError(f"Unsupported brain volume format: {path}")
+    
+    def attach_volume(self, brain_data: Dict[str, Dict], condition: str, path: str,
+                      mmap: bool = True) -> np.ndarray:
+        """
+        Load a volume for a condition and store it under ``brain_data[condition]['volume']``.
         
         Args:
             brain_data: Dictionary containing brain image data
+            condition: Condition key to attach the volume to
+            path: Path to the volume file
+            mmap: Whether to memory-map the data where supported
             
         Returns:
-            String summary of brain image data
+            The loaded volume
         """
-        summary = []
-        summary.append("BRAIN IMAGE PROCESSING SUMMARY")
-        summary.append("=" * 50)
-        summary.append("")
+        volume = self.load_brain_volume(path, mmap=mmap)
+        brain_data[condition]['volume'] = volume
+        return volume
+    
+    @staticmethod
+    def get_volume_slice(volume: np.ndarray, axis: int, index: int) -> np.ndarray:
+        """
+        Extract a single 2D slice from a volume without reading the rest of it.
+        
+        Args:
+            volume: Volume array (memory-mapped or in-memory)
+            axis: Axis to slice along (0=x, 1=y, 2=z)
+            index: Slice index along the axis
+            
+        Returns:
+            View of the requested slice
+        """
+        selector = [slice(None)] * volume.ndim
+        selector[axis] = index
+        return volume[tuple(selector)]
+    
+    def build_coordinate_index(self, brain_data: Dict[str, Dict]) -> None:
+        """
+        Build a KD-tree over all MNI peak coordinates for nearest-region queries.
+        
+        Args:
+            brain_data: Dictionary containing brain image data
+        """
+        points = []
+        labels = []
         
         for condition, data in brain_data.items():
-            summary.append(f"{data['condition'].upper()}:")
-            summary.append(f"  Description: {data['description']}")
-            summary.append(f"  Brain Regions: {', '.join(data['regions'])}")
+            for region, coord in zip(data['regions'], data['mni_coords']):
+                points.append(_XYZ(coord))
+                labels.append((condition, region))
+        
+        self._kdtree = _kdtree_class()(np.array(points, dtype=np.int16)) if points else None
+        self._kdtree_labels = labels
+    
+    def query_region(self, xyz: Tuple[float, float, float], k: int = 1) -> List[Tuple[str, str, float]]:
+        """
+        Find the activation peaks nearest to an MNI coordinate.
+        
+        Args:
+            xyz: MNI coordinate (x, y, z)
+            k: Number of nearest peaks to return
             
-            if isinstance(data['mni_coords'], list):
-                summary.append(f"  MNI Coordinates:")
-                for i, coords in enumerate(data['mni_coords']):
-                    summary.append(f"    {data['regions'][i]}: ({coords['x']}, {coords['y']}, {coords['z']})")
-            else:
-                coords = data['mni_coords']
-                summary.append(f"  MNI Coordinates: ({coords['x']}, {coords['y']}, {coords['z']})")
+        Returns:
+            List of (condition, region, distance) tuples, nearest first
+        """
+        if self._kdtree is None:
+            raise ValueError("No coordinates indexed - load brain images first")
+        
+        k = min(k, len(self._kdtree_labels))
+        distances, indices = self._kdtree.query(xyz, k=k)
+        distances = np.atleast_1d(distances)
+        indices = np.atleast_1d(indices)
+        
+        return [
+            (*self._kdtree_labels[i], float(d))
+            for d, i in zip(distances, indices)
+        ]
+    
+    def create_brain_image_summary(self, brain_data: Dict[str, Dict]) -> str:
+        """
+        Create a summary of brain image data.
+        
+        Args:
+            brain_data: Dictionary containing brain image data
             
-            summary.append("")
+        Returns:
+            String summary of brain image data
+        """
+        buf = io.StringIO()
+        _write_summary_header(buf.write)
+        
+        for data in brain_data.values():
+            _write_condition_summary(buf.write, data)
         
-        return "\n".join(summary)
+        return _finish_summary(buf)
     
     def export_brain_images(self, brain_data: Dict[str, Dict], output_dir: str = None) -> Dict[str, str]:
         """
@@ -197,23 +451,23 @@ class BrainImageProcessor:
         
         exported_files = {}
         
-        for condition, data in brain_data.items():
-            # Create condition-specific filename
-            filename = f"{condition}_brain_activation.png"
-            output_path = output_dir / filename
-            
-            try:
-                # Copy and save image
-                data['image'].save(output_path, 'PNG')
-                exported_files[condition] = str(output_path)
-                logger.info(f"✓ Exported {condition} brain image: {output_path}")
-                
-            except Exception as e:
-                logger.error(f"Error exporting {condition} brain image: {str(e)}")
+        if not brain_data:
+            return exported_files
+        
+        # Copies are IO-bound and Pillow releases the GIL while encoding
+        max_workers = min(os.cpu_count() or 1, len(brain_data))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda item: _export_one(item[0], item[1]['path'], output_dir),
+                brain_data.items()
+            )
+            for condition, output_path in results:
+                if output_path is not None:
+                    exported_files[condition] = output_path
         
         return exported_files
     
-    def generate_statistical_tables(self, brain_data: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+    def generate_statistical_tables(self, brain_data: Dict[str, Dict]) -> Dict[str, pd.DataFrame]:
         """
         Generate statistical tables for each brain activation condition.
         
@@ -221,71 +475,181 @@ class BrainImageProcessor:
             brain_data: Dictionary containing brain image data
             
         Returns:
-            Dictionary mapping conditions to statistical tables
+            Dictionary mapping conditions to DataFrames (one row per region)
         """
         logger.info("Generating statistical tables for brain activations...")
         
         statistical_tables = {}
         
+        log_each = logger.isEnabledFor(logging.INFO)
         for condition, data in brain_data.items():
-            table_data = []
-            
-            regions = data['regions']
-            coords = data['mni_coords']
-            stats = data['stats']
+            statistical_tables[condition] = _build_statistical_table(data)
+            if log_each:
+                logger.info("✓ Generated statistical table for %s", condition)
+        
+        return statistical_tables
+    
+    def _process_condition(self, condition: str, data: Dict, output_dir: Path,
+                           summary_writer, tables_out: Dict, executor: ThreadPoolExecutor):
+        """
+        Produce every per-condition output from a single visit of its data.
+        
+        Args:
+            condition: Condition key
+            data: Image data dictionary for the condition
+            output_dir: Directory to export the image to
+            summary_writer: Callable that appends text to the summary
+            tables_out: Dictionary receiving the condition's statistical table
+            executor: Executor that runs the image export
             
-            # Handle both single and multiple regions
-            if isinstance(coords, list):
-                for i, region in enumerate(regions):
-                    coord = coords[i]
-                    stat = stats[i]
-                    
-                    table_data.append({
-                        'region': region,
-                        'mni_x': coord['x'],
-                        'mni_y': coord['y'],
-                        'mni_z': coord['z'],
-                        'threshold': stat['threshold'],
-                        'p_value': stat['p'],
-                        'q_value': stat['q']
-                    })
-            else:
-                # Single region
-                table_data.append({
-                    'region': regions[0],
-                    'mni_x': coords['x'],
-                    'mni_y': coords['y'],
-                    'mni_z': coords['z'],
-                    'threshold': stats['threshold'],
-                    'p_value': stats['p'],
-                    'q_value': stats['q']
-                })
+        Returns:
+            Future resolving to (condition, exported file path or None)
+        """
+        export_future = executor.submit(_export_one, condition, data['path'], output_dir)
+        _write_condition_summary(summary_writer, data)
+        tables_out[condition] = _build_statistical_table(data)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Generated statistical table for %s", condition)
+        return export_future
+    
+    def _cache_key(self) -> str:
+        """
+        Compute a cache key from the cache version, the mapping and the (name, mtime, size)
+        of each present image (images removed since the last directory scan count as absent).
+        
+        Returns:
+            Hex digest identifying the current inputs
+        """
+        entries = []
+        for condition, info in self.brain_image_mapping.items():
+            if info['filename'] in self._raw_files:
+                try:
+                    stat = os.stat(self._image_paths[condition])
+                except FileNotFoundError:
+                    continue
+                entries.append((info['filename'], stat.st_mtime_ns, stat.st_size))
+        
+        payload = repr((_CACHE_VERSION, sorted(entries), self.brain_image_mapping)).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _load_cached_results(self, cache_path: Path, cache_key: str) -> Optional[Dict]:
+        """
+        Load cached pipeline results if they are present and still valid.
+        
+        The cache holds only plain JSON (image sizes, summary text, exported paths);
+        image entries and tables are rebuilt from the mapping, so a hit returns the
+        same structure and types as a fresh run.
+        
+        Args:
+            cache_path: Path to the cache file
+            cache_key: Key of the current inputs (see _cache_key)
             
-            statistical_tables[condition] = table_data
-            logger.info(f"✓ Generated statistical table for {condition}")
+        Returns:
+            Cached results, or None on a miss
+        """
+        if not cache_path.exists():
+            return None
         
-        return statistical_tables
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') != cache_key:
+                return None
+            brain_data = {
+                condition: _image_entry(self.brain_image_mapping[condition], self._image_paths[condition],
+                                        tuple(size) if size is not None else None)
+                for condition, size in cached['sizes'].items()
+            }
+            summary = cached['summary']
+            exported_files = cached['exported_files']
+        except Exception as e:
+            logger.warning("Ignoring unreadable brain image cache %s: %s", cache_path, e)
+            return None
+        
+        # Exported copies may have been removed since the cache was written
+        if not all(os.path.exists(path) for path in exported_files.values()):
+            return None
+        
+        return {
+            'brain_data': brain_data,
+            'summary': summary,
+            'exported_files': exported_files,
+            'statistical_tables': {condition: _build_statistical_table(data)
+                                   for condition, data in brain_data.items()},
+            'total_images': len(brain_data)
+        }
     
-    def process_all_brain_data(self) -> Dict:
+    def _save_cached_results(self, cache_path: Path, cache_key: str, results: Dict) -> None:
+        """
+        Write pipeline results to the cache, replacing stale cache files.
+        
+        Args:
+            cache_path: Path to the cache file
+            cache_key: Key of the current inputs (see _cache_key)
+            results: Results returned by process_all_brain_data
+        """
+        cached = {
+            'key': cache_key,
+            'sizes': {condition: data['size'] for condition, data in results['brain_data'].items()},
+            'summary': results['summary'],
+            'exported_files': results['exported_files']
+        }
+        try:
+            for stale in cache_path.parent.glob("brain_pipeline_*"):
+                if stale != cache_path:
+                    stale.unlink()
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cached, f)
+        except Exception as e:
+            logger.warning("Could not write brain image cache %s: %s", cache_path, e)
+    
+    def process_all_brain_data(self, use_cache: bool = True) -> Dict:
         """
         Process all brain image data and return comprehensive results.
         
+        Args:
+            use_cache: Reuse results from a previous run when no mapped image has changed
+            
         Returns:
             Dictionary containing all processed brain data
         """
         logger.info("Processing all brain image data...")
         
+        cache_key = self._cache_key()
+        cache_path = self.processed_data_path / f"brain_pipeline_{cache_key}.json"
+        if use_cache:
+            results = self._load_cached_results(cache_path, cache_key)
+            if results is not None:
+                self.build_coordinate_index(results['brain_data'])
+                logger.info("Using cached brain image results: %s", cache_path)
+                return results
+        
         # Load brain images
         brain_data = self.load_brain_images()
         
-        # Create summary
-        summary = self.create_brain_image_summary(brain_data)
+        output_dir = self.processed_data_path / "brain_images"
+        output_dir.mkdir(exist_ok=True)
         
-        # Export images
-        exported_files = self.export_brain_images(brain_data)
+        buf = io.StringIO()
+        _write_summary_header(buf.write)
+        statistical_tables = {}
+        exported_files = {}
         
-        # Generate statistical tables
-        statistical_tables = self.generate_statistical_tables(brain_data)
+        # Single pass: summary and tables are built inline while exports run in the pool
+        if brain_data:
+            max_workers = min(os.cpu_count() or 1, len(brain_data))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    self._process_condition(condition, data, output_dir, buf.write,
+                                            statistical_tables, executor)
+                    for condition, data in brain_data.items()
+                ]
+                for future in futures:
+                    condition, output_path = future.result()
+                    if output_path is not None:
+                        exported_files[condition] = output_path
+        
+        summary = _finish_summary(buf)
         
         # Compile results
         results = {
@@ -296,10 +660,176 @@ class BrainImageProcessor:
             'total_images': len(brain_data)
         }
         
-        logger.info(f"Brain image processing complete: {len(brain_data)} images processed")
+        if use_cache:
+            self._save_cached_results(cache_path, cache_key, results)
+        
+        logger.info("Brain image processing complete: %d images processed", len(brain_data))
         return results
 
 
+def _write_summary_header(w) -> None:
+    """Write the brain image summary header."""
+    w("BRAIN IMAGE PROCESSING SUMMARY\n")
+    w("=" * 50 + "\n")
+    w("\n")
+
+
+def _write_condition_summary(w, data: Dict) -> None:
+    """
+    Write the summary block for one condition.
+    
+    Args:
+        w: Callable that appends text to the summary
+        data: Image data dictionary for the condition
+    """
+    regions = data['regions']
+    coords_all = data['mni_coords']
+    
+    w(f"{data['condition'].upper()}:\n")
+    w(f"  Description: {data['description']}\n")
+    w(f"  Brain Regions: {', '.join(regions)}\n")
+    
+    if len(coords_all) == 1:
+        # A single peak keeps the one-line form (its region list describes the whole cluster)
+        c = coords_all[0]
+        w(f"  MNI Coordinates: ({c['x']}, {c['y']}, {c['z']})\n")
+    else:
+        w("  MNI Coordinates:\n")
+        for region, c in zip(regions, coords_all):
+            w(f"    {region}: ({c['x']}, {c['y']}, {c['z']})\n")
+    
+    w("\n")
+
+
+def _finish_summary(buf: io.StringIO) -> str:
+    """Return the summary text without its final line terminator (matches joined lines)."""
+    return buf.getvalue()[:-1]
+
+
+def _build_statistical_table(data: Dict) -> pd.DataFrame:
+    """
+    Build the per-region statistical table for one condition.
+    
+    Args:
+        data: Image data dictionary for the condition
+        
+    Returns:
+        DataFrame with one row per reported peak
+    """
+    coords = data['mni_coords']
+    stats = data['stats']
+    
+    # Build column-wise so pandas never sees per-row Python objects
+    mni_x, mni_y, mni_z = zip(*map(_XYZ, coords))
+    threshold, p_value, q_value = zip(*map(_TPQ, stats))
+    
+    # One row per reported peak; extra descriptive regions have no coordinates
+    table = pd.DataFrame({
+        'region': list(data['regions'][:len(coords)]),
+        'mni_x': mni_x,
+        'mni_y': mni_y,
+        'mni_z': mni_z,
+        'threshold': threshold,
+        'p_value': p_value,
+        'q_value': q_value
+    })
+    return table.astype(_TBL_DTYPES)
+
+
+def _pil_to_np_view(image: "Image.Image") -> np.ndarray:
+    """
+    Expose a decoded PIL image as a read-only NumPy array.
+    
+    Args:
+        image: PIL image; must be kept alive for as long as the array is used
+        
+    Returns:
+        Read-only pixel array
+    """
+    image.load()
+    array = np.asarray(image)
+    array.flags.writeable = False
+    return array
+
+
+def _load_one(info: Dict, image_path: str) -> Dict:
+    """
+    Build the image data entry for a single brain activation image.
+    
+    Args:
+        info: Mapping entry for the condition
+        image_path: Full path to the image file
+        
+    Returns:
+        Image data dictionary
+        
+    Raises:
+        ValueError: If a PNG file has an invalid header
+    """
+    # Validate and size PNGs from their header; pixels are decoded on demand via
+    # BrainImageProcessor.get_pil
+    size = None
+    if image_path.lower().endswith('.png'):
+        size = BrainImageProcessor._png_size(image_path)
+    
+    return _image_entry(info, image_path, size)
+
+
+def _image_entry(info: Dict, image_path: str, size: Optional[Tuple[int, int]]) -> Dict:
+    """
+    Assemble the image data dictionary for a condition.
+    
+    Args:
+        info: Mapping entry for the condition
+        image_path: Full path to the image file
+        size: (width, height) of the image, or None if unknown
+        
+    Returns:
+        Image data dictionary
+    """
+    return {
+        'path': image_path,
+        'size': size,
+        'condition': info['condition'],
+        'description': info['description'],
+        'regions': info['regions'],
+        'mni_coords': info['mni_coords'],
+        'stats': info['stats'],
+        'filename': info['filename']
+    }
+
+
+def _export_one(condition: str, source_path: str, output_dir: Path) -> Tuple[str, Optional[str]]:
+    """
+    Export a single brain image as PNG.
+    
+    Args:
+        condition: Condition key used to name the exported file
+        source_path: Path to the source image
+        output_dir: Directory to write the exported image to
+        
+    Returns:
+        Tuple of (condition, exported file path or None on failure)
+    """
+    # Create condition-specific filename
+    output_path = output_dir / f"{condition}_brain_activation.png"
+    
+    try:
+        if Path(source_path).suffix.lower() == '.png':
+            # Already PNG - a byte copy avoids a decode/re-encode round-trip. copyfile
+            # copies in-kernel (sendfile on Linux, fcopyfile on macOS) with no
+            # user-space buffer, and falls back to a buffered copy elsewhere
+            shutil.copyfile(source_path, output_path)
+        else:
+            _pil().open(source_path).save(output_path, 'PNG')
+        logger.info("✓ Exported %s brain image: %s", condition, output_path)
+        return condition, str(output_path)
+        
+    except Exception:
+        logger.exception("Error exporting %s brain image", condition)
+        return condition, None
+
+
 # Convenience functions for direct use
 
 def process_brain_images(data_root: str) -> Dict:
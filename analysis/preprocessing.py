@@ -9,6 +9,7 @@ Author: fMRI Tool Representation Study Team
 Date: 2024
 """
 
+import mmap
 import os
 import re
 import pandas as pd
@@ -16,11 +17,194 @@ import numpy as np
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; pandas writes CSV without it
+    pa = None
+
 # Set up module logger (configured by application)
 logger = logging.getLogger(__name__)
 
+# Patterns compiled once at import instead of looked up on every call
+_PID_S = re.compile(r'S(\d+)')
+_PID_NUM = re.compile(r'^(\d+)_')
+_PID_NAMED = re.compile(r'(\w+)_(\d+)_')
+_COND_FN = re.compile(r'S\d+_(\w+)_(\w+)\.txt')
+_REP = re.compile(r'rep=(\d+)')
+_INDEX = re.compile(r'index=(\d+)')
+_IMG = re.compile(r"imagefile', '([^']+)'")
+_TYPE = re.compile(r"type', '([^']+)'")
+_STIM = re.compile(r'(\w+): autoDraw = True')
+_KEY = re.compile(r'Keypress: (\w+)')
+_TIMING_NOISE = re.compile(r':\S*|(?<!\S)\*(?!\S)')
+# Any log-line marker handled once the scan has started (bytes prefilter)
+_LOG_MARKERS = re.compile(rb'autoDraw = True|New trial|Keypress:|window1: mouseVisible = True|start of scan')
+
+
+def _is_float(text: str) -> bool:
+    """Check whether a token parses as a float."""
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _duration_checks_kernel(durations: np.ndarray) -> Tuple[int, float, float, float, float, int, int]:
+    """
+    Compute duration statistics and quality counts, skipping NaNs.
+    
+    Mean and sample standard deviation use Welford's online update so the first
+    pass also yields min, max and the negative count; a second pass counts
+    outliers beyond 3 standard deviations.
+    
+    Args:
+        durations: Stimulus durations in seconds
+        
+    Returns:
+        Tuple of (count, mean, std, min, max, n_outliers, n_negative)
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    min_duration = np.inf
+    max_duration = -np.inf
+    n_negative = 0
+    
+    for value in durations:
+        if np.isnan(value):
+            continue
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+        if value < min_duration:
+            min_duration = value
+        if value > max_duration:
+            max_duration = value
+        if value < 0:
+            n_negative += 1
+    
+    if count == 0:
+        return 0, np.nan, np.nan, np.nan, np.nan, 0, 0
+    
+    std = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+    
+    n_outliers = 0
+    limit = 3 * std
+    for value in durations:
+        if abs(value - mean) > limit:
+            n_outliers += 1
+    
+    return count, mean, std, min_duration, max_duration, n_outliers, n_negative
+
+
+# JIT-compile the duration kernel when numba is available; otherwise pandas is used
+_duration_checks = njit(_duration_checks_kernel) if njit is not None else None
+
+
+# Trial record fields, in output column order
+_TRIAL_COLUMNS = (
+    'participant_id', 'condition', 'stimulus_type', 'trial_number', 'trial_timestamp',
+    'image_file', 'scan_start', 'scan_end', 'timing_points', 'condition_duration',
+    'stimulus_onset', 'stimulus_name', 'run_number', 'run_description'
+)
+
+# Fields holding a list per record (written to CSV as their string form)
+_LIST_COLUMNS = ('timing_points',)
+
+# Fields only kept in the dataframe when at least one record has a value
+_OPTIONAL_TRIAL_COLUMNS = ('stimulus_onset', 'stimulus_name', 'run_number', 'run_description')
+
+# Explicit numeric dtypes so pandas does not infer them row by row
+_TRIAL_DTYPES = {
+    'trial_number': np.int32,
+    'trial_timestamp': np.float64,
+    'scan_start': np.float64,
+    'scan_end': np.float64,
+    'condition_duration': np.float64,
+    'stimulus_onset': np.float64
+}
+
+# Label columns stored as categoricals once all derived columns exist (timing columns
+# stay float64 so exported and analysed onsets keep full precision)
+_CATEGORICAL_TRIAL_COLUMNS = (
+    'participant_id', 'condition', 'stimulus_type', 'condition_stimulus', 'image_file', 'stimulus_name'
+)
+
+
+def _new_trial_columns() -> Dict[str, List]:
+    """Create empty column lists for accumulating trial records."""
+    return {column: [] for column in _TRIAL_COLUMNS}
+
+
+def _trial_columns_to_frame(columns: Dict[str, List]) -> pd.DataFrame:
+    """
+    Build the trial dataframe from accumulated column lists.
+    
+    Args:
+        columns: Column lists produced by _combine_log_condition_data
+        
+    Returns:
+        DataFrame with one row per trial
+    """
+    data = {}
+    for column, values in columns.items():
+        if column in _OPTIONAL_TRIAL_COLUMNS and all(value is None for value in values):
+            continue
+        
+        dtype = _TRIAL_DTYPES.get(column)
+        if dtype is not None:
+            data[column] = np.array(values, dtype=dtype)
+        elif column == 'run_number':
+            # Integer only when every record belongs to a numbered run
+            has_missing = any(value is None for value in values)
+            data[column] = np.array(values, dtype=np.float64 if has_missing else np.int32)
+        else:
+            data[column] = values
+    
+    if not data['participant_id']:
+        return pd.DataFrame()
+    
+    return pd.DataFrame(data, copy=False)
+
+
+def _write_csv(df: pd.DataFrame, csv_path: Path):
+    """
+    Write a dataframe to CSV, using pyarrow's multithreaded writer when available.
+    
+    List-valued columns (_LIST_COLUMNS) are written as their Python string
+    form, as pandas does. pyarrow quotes every string value; the parsed content
+    is identical to pandas' output.
+    
+    Args:
+        df: Dataframe to write
+        csv_path: Output file path
+    """
+    if pa is not None:
+        list_columns = [column for column in _LIST_COLUMNS
+                        if column in df.columns and df[column].dtype == object]
+        if list_columns:
+            df = df.assign(**{column: df[column].map(str) for column in list_columns})
+        
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pa_csv.write_csv(table, str(csv_path))
+            return
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            logger.warning(f"pyarrow CSV export failed ({e}); falling back to pandas")
+    
+    df.to_csv(csv_path, index=False)
+
 
 class DataProcessor:
     """
@@ -48,6 +232,14 @@ class DataProcessor:
         self.trial_data = []
         self.participant_data = {}
         
+        # Parsed condition files keyed by path
+        self._condition_data_cache = {}
+        
+        # Directory listings, populated on first use
+        self._participants = None
+        self._log_files_cache = {}
+        self._condition_files_cache = {}
+        
     def parse_psychopy_logs(self, log_file_path: str) -> Dict:
         """
         Parse PsychoPy log files to extract timing and trial information.
@@ -71,56 +263,17 @@ class DataProcessor:
         }
         
         try:
-            with open(log_file_path, 'r') as f:
-                lines = f.readlines()
-            
             # Extract participant ID from filename
             filename = os.path.basename(log_file_path)
             trial_data['participant_id'] = self._extract_participant_id(filename)
             trial_data['condition'] = self._extract_condition(filename)
             
-            # Parse log content
-            scan_started = False
-            current_trial = None
-            
-            for line_num, line in enumerate(lines):
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Extract timestamp and log level
-                parts = line.split('\t')
-                if len(parts) < 2:
-                    continue
-                    
-                timestamp = parts[0]
-                log_level = parts[1]
-                content = '\t'.join(parts[2:]) if len(parts) > 2 else ""
-                
-                # Track scan start
-                if "start of scan" in content:
-                    trial_data['scan_start'] = float(timestamp)
-                    scan_started = True
-                    logger.info(f"Scan started at {timestamp}s")
-                
-                # Track scan end
-                if "window1: mouseVisible = True" in content and scan_started:
-                    trial_data['scan_end'] = float(timestamp)
-                    logger.info(f"Scan ended at {timestamp}s")
-                
-                # Parse trial information
-                if scan_started and "New trial" in content:
-                    trial_info = self._parse_trial_line(content, timestamp)
-                    if trial_info:
-                        trial_data['trials'].append(trial_info)
-                
-                # Parse stimulus presentation
-                if scan_started and "autoDraw = True" in content:
-                    self._parse_stimulus_presentation(content, timestamp, trial_data)
-                
-                # Parse keypress responses
-                if scan_started and "Keypress:" in content:
-                    self._parse_keypress(content, timestamp, trial_data)
+            # Parse log content from a read-only memory map; only lines carrying a
+            # marker the parser acts on are decoded
+            with open(log_file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self._scan_log_lines(iter(mm.readline, b''), trial_data)
             
             logger.info(f"Parsed {len(trial_data['trials'])} trials from {log_file_path}")
             return trial_data
@@ -129,6 +282,62 @@ class DataProcessor:
             logger.error(f"Error parsing log file {log_file_path}: {str(e)}")
             return trial_data
     
+    def _scan_log_lines(self, lines, trial_data: Dict):
+        """
+        Dispatch raw PsychoPy log lines to the line parsers.
+        
+        Args:
+            lines: Iterable of raw (bytes) log lines
+            trial_data: Parsed log dictionary to update in place
+        """
+        scan_started = False
+        
+        for raw_line in lines:
+            # Nothing but the scan start matters before the scanner trigger
+            if scan_started:
+                if not _LOG_MARKERS.search(raw_line):
+                    continue
+            elif b"start of scan" not in raw_line:
+                continue
+            
+            # Split on raw bytes: the log level is never used and the timestamp is
+            # handed to float() as bytes, so only the content is decoded
+            raw_timestamp, sep, rest = raw_line.partition(b'\t')
+            if not sep:
+                continue
+            content = rest.partition(b'\t')[2].rstrip().decode()
+            
+            if not scan_started:
+                if "start of scan" in content:
+                    trial_data['scan_start'] = float(raw_timestamp)
+                    scan_started = True
+                    logger.info(f"Scan started at {trial_data['scan_start']}s")
+                continue
+            
+            # Every handled marker needs the time; CPython's float() is correctly rounded
+            timestamp = float(raw_timestamp)
+            
+            # Single dispatch, ordered by how often each marker occurs
+            if "autoDraw = True" in content:
+                # Parse stimulus presentation
+                self._parse_stimulus_presentation(content, timestamp, trial_data)
+            elif "New trial" in content:
+                # Parse trial information
+                trial_info = self._parse_trial_line(content, timestamp)
+                if trial_info:
+                    trial_data['trials'].append(trial_info)
+            elif "Keypress:" in content:
+                # Parse keypress responses
+                self._parse_keypress(content, timestamp, trial_data)
+            elif "window1: mouseVisible = True" in content:
+                # Track scan end
+                trial_data['scan_end'] = timestamp
+                logger.info(f"Scan ended at {timestamp}s")
+            elif "start of scan" in content:
+                # Track a restarted scan
+                trial_data['scan_start'] = timestamp
+                logger.info(f"Scan started at {timestamp}s")
+    
     def parse_condition_files(self, condition_file_path: str) -> Dict:
         """
         Parse AFNI condition timing files (S01_PV_tool.txt format).
@@ -161,21 +370,20 @@ class DataProcessor:
             
             # Parse timing data
             if content and not content.startswith('*'):
-                # Split by whitespace and convert to float
-                timing_points = []
-                for point in content.split():
-                    try:
-                        # Remove ":16" suffix if present
-                        clean_point = point.split(':')[0]
-                        timing_points.append(float(clean_point))
-                    except ValueError:
-                        continue
+                # Remove ":16" suffixes and empty-run "*" markers, then convert in one call
+                tokens = _TIMING_NOISE.sub('', content).split()
+                try:
+                    timing_points = np.array(tokens, dtype=np.float64)
+                except ValueError:
+                    # Fall back to skipping malformed tokens one by one
+                    timing_points = np.array([point for point in tokens if _is_float(point)],
+                                             dtype=np.float64)
                 
-                condition_data['timing_points'] = timing_points
+                condition_data['timing_points'] = timing_points.tolist()
                 
                 # Calculate duration if we have timing points
-                if timing_points:
-                    condition_data['duration'] = max(timing_points) - min(timing_points)
+                if timing_points.size:
+                    condition_data['duration'] = float(np.ptp(timing_points))
             
             logger.info(f"Parsed {len(condition_data['timing_points'])} timing points from {condition_file_path}")
             return condition_data
@@ -184,52 +392,48 @@ class DataProcessor:
             logger.error(f"Error parsing condition file {condition_file_path}: {str(e)}")
             return condition_data
     
-    def create_trial_dataframe(self, participant_id: str = None) -> pd.DataFrame:
+    def create_trial_dataframe(self, participant_id: str = None, max_workers: Optional[int] = None,
+                               dtype_backend: Optional[str] = None) -> pd.DataFrame:
         """
         Create a comprehensive trial dataframe combining all data sources.
         
+        Participants are independent, so with max_workers > 1 and more than one
+        participant their logs are parsed in a process pool. Log records emitted
+        by the workers do not reach the caller's logging configuration.
+        
         Args:
             participant_id: Optional specific participant ID to process
+            max_workers: Worker processes for parsing participants in parallel (None or 1
+                runs serially in this process)
+            dtype_backend: Optional pandas dtype backend for the result ("pyarrow" for
+                Arrow-backed columns, "numpy_nullable"); None keeps NumPy dtypes
             
         Returns:
             pandas DataFrame with all trial data
         """
         logger.info("Creating comprehensive trial dataframe")
         
-        all_trials = []
-        
         # Process all participants or specific participant
         if participant_id:
             participants = [participant_id]
         else:
             participants = self._get_all_participants()
         
-        for pid in participants:
-            logger.info(f"Processing participant: {pid}")
-            
-            # Special handling for S01 with complete experimental design
-            if pid == 'S01':
-                all_trials.extend(self._process_s01_complete_design())
-            else:
-                # Standard processing for other participants
-                log_files = self._get_participant_log_files(pid)
-                condition_files = self._get_participant_condition_files(pid)
-                
-                # Parse log files
-                for log_file in log_files:
-                    log_data = self.parse_psychopy_logs(str(log_file))
-                    
-                    # Parse corresponding condition files
-                    for condition_file in condition_files:
-                        cond_data = self.parse_condition_files(str(condition_file))
-                        
-                        # Match log and condition data
-                        if self._match_log_condition(log_data, cond_data):
-                            trials = self._combine_log_condition_data(log_data, cond_data)
-                            all_trials.extend(trials)
+        # Trial records are accumulated column-wise (one list per field)
+        columns = _new_trial_columns()
+        if len(participants) > 1 and max_workers is not None and max_workers > 1:
+            # Workers receive a copy of this processor, so its paths and caches carry over
+            processors = [self] * len(participants)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for participant_columns in executor.map(_collect_trials_worker, processors, participants):
+                    for column, values in participant_columns.items():
+                        columns[column].extend(values)
+        else:
+            for pid in participants:
+                self._collect_participant_trials(pid, columns)
         
         # Create DataFrame
-        df = pd.DataFrame(all_trials)
+        df = _trial_columns_to_frame(columns)
         
         if not df.empty:
             # Add derived columns
@@ -238,10 +442,46 @@ class DataProcessor:
             # Sort by participant and trial number
             df = df.sort_values(['participant_id', 'trial_number']).reset_index(drop=True)
             
+            if dtype_backend is not None:
+                df = df.convert_dtypes(dtype_backend=dtype_backend)
+            
             logger.info(f"Created dataframe with {len(df)} trials across {df['participant_id'].nunique()} participants")
         
         return df
     
+    def _collect_participant_trials(self, pid: str, columns: Dict[str, List]):
+        """
+        Parse one participant's logs and condition files into trial columns.
+        
+        Args:
+            pid: Participant ID
+            columns: Column lists (see _new_trial_columns) to append trials to
+        """
+        logger.info(f"Processing participant: {pid}")
+        
+        # Special handling for S01 with complete experimental design
+        if pid == 'S01':
+            self._process_s01_complete_design(columns)
+            return
+        
+        # Standard processing for other participants
+        log_files = self._get_participant_log_files(pid)
+        condition_files = self._get_participant_condition_files(pid)
+        
+        # Parse each condition file once, not once per log file
+        cond_datas = [self._parse_condition_file_cached(condition_file)
+                      for condition_file in condition_files]
+        
+        # Parse log files
+        for log_file in log_files:
+            log_data = self.parse_psychopy_logs(log_file)
+            
+            # Match against corresponding condition files
+            for cond_data in cond_datas:
+                # Match log and condition data
+                if self._match_log_condition(log_data, cond_data):
+                    self._combine_log_condition_data(log_data, cond_data, columns)
+    
     def validate_timing_consistency(self, df: pd.DataFrame) -> Dict:
         """
         Validate timing consistency across data sources.
@@ -267,32 +507,42 @@ class DataProcessor:
         
         # Check for missing timing data
         if 'stimulus_onset' in df.columns:
-            missing_onset = df[df['stimulus_onset'].isna()]
-            if not missing_onset.empty:
-                validation_results['missing_data'].append(f"{len(missing_onset)} trials with missing stimulus onset")
+            n_missing_onset = int(df['stimulus_onset'].isna().sum())
+            if n_missing_onset:
+                validation_results['missing_data'].append(f"{n_missing_onset} trials with missing stimulus onset")
         
         if 'stimulus_offset' in df.columns:
-            missing_offset = df[df['stimulus_offset'].isna()]
-            if not missing_offset.empty:
-                validation_results['missing_data'].append(f"{len(missing_offset)} trials with missing stimulus offset")
+            n_missing_offset = int(df['stimulus_offset'].isna().sum())
+            if n_missing_offset:
+                validation_results['missing_data'].append(f"{n_missing_offset} trials with missing stimulus offset")
         
-        # Check for timing outliers
+        # Check for timing outliers and negative durations
         if 'stimulus_duration' in df.columns:
-            duration_stats = df['stimulus_duration'].describe()
-            validation_results['summary_stats']['duration'] = duration_stats.to_dict()
+            if _duration_checks is not None:
+                # Fused kernel: statistics, outliers and negatives in two passes
+                durations = df['stimulus_duration'].to_numpy(dtype=np.float64)
+                count, mean, std, min_duration, max_duration, n_outliers, n_negative = \
+                    _duration_checks(durations)
+                validation_results['summary_stats']['duration'] = {
+                    'count': float(count),
+                    'mean': mean,
+                    'std': std,
+                    'min': min_duration,
+                    'max': max_duration
+                }
+            else:
+                durations = df['stimulus_duration']
+                duration_stats = durations.agg(['count', 'mean', 'std', 'min', 'max'])
+                validation_results['summary_stats']['duration'] = duration_stats.to_dict()
+                
+                # Count outliers (beyond 3 standard deviations) and negatives without filtering rows
+                n_outliers = int(((durations - duration_stats['mean']).abs() > 3 * duration_stats['std']).sum())
+                n_negative = int((durations < 0).sum())
             
-            # Identify outliers (beyond 3 standard deviations)
-            mean_duration = duration_stats['mean']
-            std_duration = duration_stats['std']
-            outliers = df[abs(df['stimulus_duration'] - mean_duration) > 3 * std_duration]
-            if not outliers.empty:
-                validation_results['outliers'].append(f"{len(outliers)} trials with duration outliers")
-        
-        # Check for negative durations
-        if 'stimulus_duration' in df.columns:
-            negative_durations = df[df['stimulus_duration'] < 0]
-            if not negative_durations.empty:
-                validation_results['timing_errors'].append(f"{len(negative_durations)} trials with negative durations")
+            if n_outliers:
+                validation_results['outliers'].append(f"{n_outliers} trials with duration outliers")
+            if n_negative:
+                validation_results['timing_errors'].append(f"{n_negative} trials with negative durations")
         
         logger.info(f"Validation complete: {len(validation_results['timing_errors'])} errors found")
         return validation_results
@@ -325,11 +575,14 @@ class DataProcessor:
         report.append(f"Stimulus types: {df['stimulus_type'].nunique() if not df.empty else 0}")
         report.append("")
         
+        # Validation also computes the duration statistics, so run it once up front
+        validation = self.validate_timing_consistency(df)
+        
         # Timing statistics
         if not df.empty and 'stimulus_duration' in df.columns:
             report.append("TIMING STATISTICS")
             report.append("-" * 20)
-            duration_stats = df['stimulus_duration'].describe()
+            duration_stats = validation['summary_stats']['duration']
             report.append(f"Mean duration: {duration_stats['mean']:.3f}s")
             report.append(f"Std duration: {duration_stats['std']:.3f}s")
             report.append(f"Min duration: {duration_stats['min']:.3f}s")
@@ -337,7 +590,6 @@ class DataProcessor:
             report.append("")
         
         # Data quality issues
-        validation = self.validate_timing_consistency(df)
         report.append("DATA QUALITY ISSUES")
         report.append("-" * 20)
         
@@ -367,13 +619,16 @@ class DataProcessor:
         
         return "\n".join(report)
     
-    def export_processed_data(self, df: pd.DataFrame, output_dir: str = None) -> Dict[str, str]:
+    def export_processed_data(self, df: pd.DataFrame, output_dir: str = None,
+                              formats: Tuple[str, ...] = ("csv", "report")) -> Dict[str, str]:
         """
         Export processed data to various formats.
         
         Args:
             df: Trial dataframe
             output_dir: Output directory (defaults to processed data path)
+            formats: Formats to write; any of "csv", "parquet", "excel" and "report".
+                Excel is opt-in because writing it through openpyxl is far slower than CSV
             
         Returns:
             Dictionary mapping file types to file paths
@@ -387,41 +642,58 @@ class DataProcessor:
         exported_files = {}
         
         # Export to CSV
-        csv_path = output_dir / "trial_data.csv"
-        df.to_csv(csv_path, index=False)
-        exported_files['csv'] = str(csv_path)
+        if "csv" in formats:
+            csv_path = output_dir / "trial_data.csv"
+            _write_csv(df, csv_path)
+            exported_files['csv'] = str(csv_path)
+        
+        # Export to Parquet (requires pyarrow or fastparquet)
+        if "parquet" in formats:
+            parquet_path = output_dir / "trial_data.parquet"
+            df.to_parquet(parquet_path, index=False, compression="zstd")
+            exported_files['parquet'] = str(parquet_path)
         
         # Export to Excel
-        excel_path = output_dir / "trial_data.xlsx"
-        df.to_excel(excel_path, index=False)
-        exported_files['excel'] = str(excel_path)
+        if "excel" in formats:
+            excel_path = output_dir / "trial_data.xlsx"
+            df.to_excel(excel_path, index=False)
+            exported_files['excel'] = str(excel_path)
         
         # Export quality report
-        report_path = output_dir / "data_quality_report.txt"
-        report = self.generate_data_quality_report(df)
-        with open(report_path, 'w') as f:
-            f.write(report)
-        exported_files['quality_report'] = str(report_path)
+        if "report" in formats:
+            report_path = output_dir / "data_quality_report.txt"
+            report = self.generate_data_quality_report(df)
+            with open(report_path, 'w') as f:
+                f.write(report)
+            exported_files['quality_report'] = str(report_path)
         
         logger.info(f"Exported processed data to {output_dir}")
         return exported_files
     
     # Helper methods
     
+    def _parse_condition_file_cached(self, condition_file_path: str) -> Dict:
+        """Parse a condition timing file, reusing the result for repeated paths."""
+        cond_data = self._condition_data_cache.get(condition_file_path)
+        if cond_data is None:
+            cond_data = self.parse_condition_files(condition_file_path)
+            self._condition_data_cache[condition_file_path] = cond_data
+        return cond_data
+    
     def _extract_participant_id(self, filename: str) -> str:
         """Extract participant ID from filename."""
         # Look for patterns like S01, S02, etc.
-        match = re.search(r'S(\d+)', filename)
+        match = _PID_S.search(filename)
         if match:
             return f"S{match.group(1).zfill(2)}"
         
         # Look for numeric patterns at start
-        match = re.search(r'^(\d+)_', filename)
+        match = _PID_NUM.search(filename)
         if match:
             return f"S{match.group(1).zfill(2)}"
         
         # Look for patterns like "Annika_1_" or similar
-        match = re.search(r'(\w+)_(\d+)_', filename)
+        match = _PID_NAMED.search(filename)
         if match:
             return f"S{match.group(2).zfill(2)}"
         
@@ -445,7 +717,7 @@ class DataProcessor:
     def _parse_condition_filename(self, filename: str) -> Tuple[str, str]:
         """Parse condition filename to extract condition and stimulus type."""
         # Pattern: S01_PV_tool.txt
-        match = re.match(r'S\d+_(\w+)_(\w+)\.txt', filename)
+        match = _COND_FN.match(filename)
         if match:
             condition = match.group(1)
             stimulus_type = match.group(2)
@@ -453,56 +725,56 @@ class DataProcessor:
         
         return 'unknown', 'unknown'
     
-    def _parse_trial_line(self, content: str, timestamp: str) -> Optional[Dict]:
+    def _parse_trial_line(self, content: str, timestamp: float) -> Optional[Dict]:
         """Parse a trial line from PsychoPy log."""
         # Extract trial information from content
         trial_info = {
-            'trial_timestamp': float(timestamp),
+            'trial_timestamp': timestamp,
             'trial_index': None,
             'trial_rep': None,
             'image_file': None,
             'stimulus_type': None
         }
         
-        # Extract trial index and rep
-        rep_match = re.search(r'rep=(\d+)', content)
-        index_match = re.search(r'index=(\d+)', content)
-        
-        if rep_match:
+        # Extract trial index and rep (substring checks skip the regex when a field is absent)
+        if 'rep=' in content and (rep_match := _REP.search(content)):
             trial_info['trial_rep'] = int(rep_match.group(1))
-        if index_match:
+        if 'index=' in content and (index_match := _INDEX.search(content)):
             trial_info['trial_index'] = int(index_match.group(1))
         
         # Extract image file and type from OrderedDict
-        image_match = re.search(r"imagefile', '([^']+)'", content)
-        type_match = re.search(r"type', '([^']+)'", content)
-        
-        if image_match:
+        if "imagefile'" in content and (image_match := _IMG.search(content)):
             trial_info['image_file'] = image_match.group(1)
-        if type_match:
+        if "type'" in content and (type_match := _TYPE.search(content)):
             trial_info['stimulus_type'] = type_match.group(1)
         
         return trial_info
     
-    def _parse_stimulus_presentation(self, content: str, timestamp: str, trial_data: Dict):
+    def _parse_stimulus_presentation(self, content: str, timestamp: float, trial_data: Dict):
         """Parse stimulus presentation information."""
-        # Extract stimulus name
-        stim_match = re.search(r'(\w+): autoDraw = True', content)
-        if stim_match:
-            stimulus_name = stim_match.group(1)
-            
+        # Extract stimulus name: the word right before ': autoDraw = True'
+        stimulus_name = None
+        stim_end = content.find(': autoDraw = True')
+        if stim_end != -1:
+            stimulus_name = content[:stim_end].rpartition(' ')[2]
+            if not stimulus_name.replace('_', '').isalnum():
+                # Name contains punctuation; let the regex pick out the word characters
+                stim_match = _STIM.search(content)
+                stimulus_name = stim_match.group(1) if stim_match else None
+        
+        if stimulus_name:
             # Store timing information
             if 'stimulus_timings' not in trial_data:
                 trial_data['stimulus_timings'] = []
             
             trial_data['stimulus_timings'].append({
                 'stimulus': stimulus_name,
-                'onset': float(timestamp)
+                'onset': timestamp
             })
     
-    def _parse_keypress(self, content: str, timestamp: str, trial_data: Dict):
+    def _parse_keypress(self, content: str, timestamp: float, trial_data: Dict):
         """Parse keypress responses."""
-        key_match = re.search(r'Keypress: (\w+)', content)
+        key_match = _KEY.search(content)
         if key_match:
             key = key_match.group(1)
             
@@ -511,45 +783,86 @@ class DataProcessor:
             
             trial_data['keypresses'].append({
                 'key': key,
-                'timestamp': float(timestamp)
+                'timestamp': timestamp
             })
     
     def _get_all_participants(self) -> List[str]:
         """Get list of all participant IDs."""
-        participants = set()
-        
-        # Look in S## directories
-        for item in self.raw_data_path.iterdir():
-            if item.is_dir() and item.name.startswith('S'):
-                participants.add(item.name)
+        if self._participants is None:
+            self._index_raw_data()
         
-        return sorted(list(participants))
+        return self._participants
     
-    def _get_participant_log_files(self, participant_id: str) -> List[Path]:
+    def _get_participant_log_files(self, participant_id: str) -> List[str]:
         """Get all log files for a specific participant."""
-        log_files = []
-        
-        # Look in participant directory
-        participant_dir = self.raw_data_path / participant_id
-        if participant_dir.exists():
-            for file in participant_dir.glob("*.log"):
-                log_files.append(file)
+        if participant_id not in self._log_files_cache:
+            # Not covered by the participant index; list the directory directly
+            participant_dir = os.path.join(self.raw_data_path, participant_id)
+            self._log_files_cache[participant_id] = self._list_files(participant_dir, '.log')
         
-        return log_files
+        return self._log_files_cache[participant_id]
     
-    def _get_participant_condition_files(self, participant_id: str) -> List[Path]:
+    def _get_participant_condition_files(self, participant_id: str) -> List[str]:
         """Get all condition files for a specific participant."""
-        condition_files = []
+        if participant_id not in self._condition_files_cache:
+            # Not covered by the participant index; list the directory directly
+            condition_dir = os.path.join(self.raw_data_path, participant_id, "Condition Files")
+            self._condition_files_cache[participant_id] = self._list_files(condition_dir, '.txt')
+        
+        return self._condition_files_cache[participant_id]
+    
+    def _index_raw_data(self):
+        """
+        Index participants, log files and condition files in one directory walk.
         
-        # Look in participant directory
-        participant_dir = self.raw_data_path / participant_id
-        if participant_dir.exists():
-            condition_dir = participant_dir / "Condition Files"
-            if condition_dir.exists():
-                for file in condition_dir.glob("*.txt"):
-                    condition_files.append(file)
+        The walk is bounded to raw/S##/ and raw/S##/Condition Files/ so large
+        imaging subtrees are never traversed.
+        """
+        participants = []
         
-        return condition_files
+        with os.scandir(self.raw_data_path) as entries:
+            participant_entries = [entry for entry in entries
+                                   if entry.name.startswith('S') and entry.is_dir()]
+        
+        for participant_entry in participant_entries:
+            pid = participant_entry.name
+            log_files = []
+            condition_files = []
+            
+            with os.scandir(participant_entry.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.log'):
+                        if entry.is_file():
+                            log_files.append(entry.path)
+                    elif entry.name == "Condition Files" and entry.is_dir():
+                        condition_files = self._list_files(entry.path, '.txt')
+            
+            participants.append(pid)
+            self._log_files_cache[pid] = log_files
+            self._condition_files_cache[pid] = condition_files
+        
+        self._participants = sorted(participants)
+    
+    @staticmethod
+    def _list_files(directory: str, suffix: str) -> List[str]:
+        """
+        List files in a directory with the given suffix.
+        
+        Uses a single os.scandir pass; missing directories yield an empty list.
+        
+        Args:
+            directory: Directory to list
+            suffix: File name suffix to match (e.g. '.log')
+            
+        Returns:
+            Matching file paths in directory order
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return [entry.path for entry in entries
+                        if entry.name.endswith(suffix) and entry.is_file()]
+        except FileNotFoundError:
+            return []
     
     def _match_log_condition(self, log_data: Dict, cond_data: Dict) -> bool:
         """Check if log and condition data match."""
@@ -568,33 +881,55 @@ class DataProcessor:
         log_condition_code = condition_mapping.get(log_data['condition'], '')
         return log_condition_code == cond_data['condition_type']
     
-    def _combine_log_condition_data(self, log_data: Dict, cond_data: Dict) -> List[Dict]:
-        """Combine log and condition data into trial records."""
-        trials = []
-        
-        for i, trial in enumerate(log_data['trials']):
-            trial_record = {
-                'participant_id': log_data['participant_id'],
-                'condition': log_data['condition'],
-                'stimulus_type': cond_data['stimulus_type'],
-                'trial_number': i + 1,
-                'trial_timestamp': trial.get('trial_timestamp'),
-                'image_file': trial.get('image_file'),
-                'scan_start': log_data.get('scan_start'),
-                'scan_end': log_data.get('scan_end'),
-                'timing_points': cond_data.get('timing_points', []),
-                'condition_duration': cond_data.get('duration')
-            }
-            
-            # Add stimulus timing if available
-            if 'stimulus_timings' in log_data and i < len(log_data['stimulus_timings']):
-                stim_timing = log_data['stimulus_timings'][i]
-                trial_record['stimulus_onset'] = stim_timing['onset']
-                trial_record['stimulus_name'] = stim_timing['stimulus']
-            
-            trials.append(trial_record)
+    def _combine_log_condition_data(self, log_data: Dict, cond_data: Dict, columns: Dict[str, List],
+                                    participant_id: str = None, condition: str = None,
+                                    run_number: int = None, run_description: str = None) -> int:
+        """
+        Combine log and condition data into trial records.
+        
+        Records are appended column-wise to ``columns`` (see _new_trial_columns).
         
-        return trials
+        Args:
+            log_data: Parsed PsychoPy log
+            cond_data: Parsed condition timing file
+            columns: Column lists to append to
+            participant_id: Overrides the participant ID parsed from the log
+            condition: Overrides the condition parsed from the log
+            run_number: Run number for every record (None if unknown)
+            run_description: Run description for every record (None if unknown)
+            
+        Returns:
+            Number of trial records appended
+        """
+        trials = log_data['trials']
+        n_trials = len(trials)
+        if n_trials == 0:
+            return 0
+        
+        def repeat(value):
+            return [value] * n_trials
+        
+        columns['participant_id'] += repeat(participant_id or log_data['participant_id'])
+        columns['condition'] += repeat(condition or log_data['condition'])
+        columns['stimulus_type'] += repeat(cond_data['stimulus_type'])
+        columns['trial_number'] += range(1, n_trials + 1)
+        columns['trial_timestamp'] += [trial.get('trial_timestamp') for trial in trials]
+        columns['image_file'] += [trial.get('image_file') for trial in trials]
+        columns['scan_start'] += repeat(log_data.get('scan_start'))
+        columns['scan_end'] += repeat(log_data.get('scan_end'))
+        columns['timing_points'] += repeat(cond_data.get('timing_points', []))
+        columns['condition_duration'] += repeat(cond_data.get('duration'))
+        
+        # Add stimulus timing if available
+        stim_timings = log_data.get('stimulus_timings', [])[:n_trials]
+        n_missing = n_trials - len(stim_timings)
+        columns['stimulus_onset'] += [timing['onset'] for timing in stim_timings] + [None] * n_missing
+        columns['stimulus_name'] += [timing['stimulus'] for timing in stim_timings] + [None] * n_missing
+        
+        columns['run_number'] += repeat(run_number)
+        columns['run_description'] += repeat(run_description)
+        
+        return n_trials
     
     def _add_derived_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add derived columns to the dataframe."""
@@ -613,18 +948,26 @@ class DataProcessor:
         if 'condition' in df.columns and 'stimulus_type' in df.columns:
             df['condition_stimulus'] = df['condition'] + '_' + df['stimulus_type']
         
+        # Compact representation for the few distinct labels
+        for column in _CATEGORICAL_TRIAL_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        
         return df
     
-    def _process_s01_complete_design(self) -> List[Dict]:
+    def _process_s01_complete_design(self, columns: Dict[str, List]) -> int:
         """
         Process S01 data with complete experimental design (3 runs).
         
+        Args:
+            columns: Column lists (see _new_trial_columns) to append S01 trials to
+            
         Returns:
-            List of trial dictionaries for all S01 runs
+            Number of trial records appended for all S01 runs
         """
         logger.info("Processing S01 complete experimental design (3 runs)")
         
-        all_trials = []
+        total_trials = 0
         
         # Define S01 experimental runs
         s01_runs = [
@@ -662,29 +1005,28 @@ class DataProcessor:
                 condition_files = self._get_s01_condition_files(run_info['condition'])
                 
                 # Process each condition file
+                n_trials = 0
                 for condition_file in condition_files:
-                    cond_data = self.parse_condition_files(str(condition_file))
-                    
-                    # Combine log and condition data
-                    trials = self._combine_log_condition_data(log_data, cond_data)
+                    cond_data = self._parse_condition_file_cached(condition_file)
                     
-                    # Add run information
-                    for trial in trials:
-                        trial['run_number'] = run_info['run_number']
-                        trial['run_description'] = run_info['description']
-                        trial['participant_id'] = 'S01'
-                        trial['condition'] = run_info['condition']
+                    # Combine log and condition data, adding run information
+                    n_trials = self._combine_log_condition_data(
+                        log_data, cond_data, columns,
+                        participant_id='S01',
+                        condition=run_info['condition'],
+                        run_number=run_info['run_number'],
+                        run_description=run_info['description']
+                    )
+                    total_trials += n_trials
                     
-                    all_trials.extend(trials)
-                    
-                logger.info(f"✓ Processed {len(trials)} trials for {run_info['description']}")
+                logger.info(f"✓ Processed {n_trials} trials for {run_info['description']}")
             else:
                 logger.warning(f"Log file not found: {log_path}")
         
-        logger.info(f"S01 processing complete: {len(all_trials)} total trials")
-        return all_trials
+        logger.info(f"S01 processing complete: {total_trials} total trials")
+        return total_trials
     
-    def _get_s01_condition_files(self, condition: str) -> List[Path]:
+    def _get_s01_condition_files(self, condition: str) -> List[str]:
         """
         Get condition files for S01 based on condition type.
         
@@ -695,7 +1037,7 @@ class DataProcessor:
             List of condition file paths
         """
         condition_files = []
-        condition_dir = self.raw_data_path / "S01" / "condition_files"
+        condition_dir = os.path.join(self.raw_data_path, "S01", "condition_files")
         
         if condition == 'passive_viewing':
             # Passive viewing conditions
@@ -711,8 +1053,8 @@ class DataProcessor:
             return condition_files
         
         for pattern in patterns:
-            file_path = condition_dir / pattern
-            if file_path.exists():
+            file_path = os.path.join(condition_dir, pattern)
+            if os.path.exists(file_path):
                 condition_files.append(file_path)
             else:
                 logger.warning(f"Condition file not found: {file_path}")
@@ -750,6 +1092,25 @@ def parse_condition_files(condition_file_path: str) -> Dict:
     return processor.parse_condition_files(condition_file_path)
 
 
+def _collect_trials_worker(processor: DataProcessor, participant_id: str) -> Dict[str, List]:
+    """
+    Process-pool worker: collect one participant's trial columns.
+    
+    Parsing stays in DataProcessor._collect_participant_trials; this only gives
+    each worker its own column lists to fill.
+    
+    Args:
+        processor: DataProcessor (pickled copy) to parse with
+        participant_id: Participant ID to process
+        
+    Returns:
+        Trial column lists for the participant
+    """
+    columns = _new_trial_columns()
+    processor._collect_participant_trials(participant_id, columns)
+    return columns
+
+
 def create_trial_dataframe(data_root: str, participant_id: str = None) -> pd.DataFrame:
     """
     Convenience function to create trial dataframe from data root.
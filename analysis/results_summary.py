@@ -11,10 +11,12 @@ Date: 2024
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Tuple, Optional, Union, Set
 import logging
 from pathlib import Path
+import importlib
 import json
+import math
 from datetime import datetime
 import warnings
 
@@ -24,6 +26,233 @@ logger = logging.getLogger(__name__)
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
+# Columns (and their load dtypes) read from trial data files; nothing else is summarized
+_SUMMARY_COLUMNS = ('participant_id', 'condition', 'stimulus_type', 'trial_number', 'stimulus_onset')
+_SUMMARY_DTYPES = {
+    'participant_id': 'category',
+    'condition': 'category',
+    'stimulus_type': 'category',
+    'trial_number': 'Int32',
+    'stimulus_onset': 'float32'
+}
+
+# Same columns when the CSV is read through pyarrow; labels stay categorical
+# (dictionary-encoded), which is more compact than Arrow strings for a few values
+_SUMMARY_ARROW_DTYPES = {
+    **_SUMMARY_DTYPES,
+    'trial_number': 'int32[pyarrow]',
+    'stimulus_onset': 'float32[pyarrow]'
+}
+
+# Columns of the table built by ResultsSummarizer.create_results_table
+_RESULTS_TABLE_COLUMNS = (
+    'Analysis_Type', 'N_Trials', 'N_Participants', 'Statistical_Test', 'Test_Statistic',
+    'P_Value', 'Significant', 'Effect_Size', 'Effect_Interpretation'
+)
+
+# Artifacts ResultsSummarizer.export_for_publication can write (xlsx is opt-in)
+_EXPORT_FORMATS = frozenset(('json', 'csv', 'parquet', 'xlsx', 'txt'))
+_DEFAULT_EXPORT_FORMATS = frozenset(('json', 'csv', 'parquet', 'txt'))
+
+# Types passed through unchanged by ResultsSummarizer._make_json_serializable
+_JSON_SCALAR_TYPES = frozenset((int, str, bool, type(None)))
+
+
+def _json_float(value) -> Optional[float]:
+    """Python float for JSON, with NaN and infinities written as null (as orjson does)."""
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+# Exact scalar type -> JSON converter (subclasses fall back to isinstance checks)
+_JSON_SCALAR_CONVERTERS = {
+    **dict.fromkeys((np.int8, np.int16, np.int32, np.int64,
+                     np.uint8, np.uint16, np.uint32, np.uint64), int),
+    **dict.fromkeys((float, np.float16, np.float32, np.float64), _json_float),
+    np.bool_: bool
+}
+
+
+# Optional accelerators (numba, polars, orjson, pyarrow, xlsxwriter) are imported on first use;
+# together they would add roughly half a second to importing this module
+_optional_modules = {}
+
+
+def _optional(module_name: str):
+    """Return an optional module, importing it on first use (None if not installed)."""
+    if module_name not in _optional_modules:
+        try:
+            _optional_modules[module_name] = importlib.import_module(module_name)
+        except ImportError:
+            _optional_modules[module_name] = None
+    return _optional_modules[module_name]
+
+
+def _group_moments_kernel(codes: np.ndarray, values: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-group mean and sample standard deviation in one pass, skipping NaNs.
+    
+    Uses Welford's online update per group; rows with a negative code
+    (missing group) are ignored.
+    
+    Args:
+        codes: Group code per row (as returned by pd.factorize)
+        values: Value per row
+        n_groups: Number of groups
+        
+    Returns:
+        Tuple of (means, stds); NaN where a group has too few values
+    """
+    counts = np.zeros(n_groups, dtype=np.int64)
+    means = np.zeros(n_groups)
+    m2 = np.zeros(n_groups)
+    
+    for i in range(codes.shape[0]):
+        group = codes[i]
+        value = values[i]
+        if group < 0 or np.isnan(value):
+            continue
+        counts[group] += 1
+        delta = value - means[group]
+        means[group] += delta / counts[group]
+        m2[group] += delta * (value - means[group])
+    
+    stds = np.full(n_groups, np.nan)
+    for group in range(n_groups):
+        if counts[group] == 0:
+            means[group] = np.nan
+        elif counts[group] > 1:
+            stds[group] = np.sqrt(m2[group] / (counts[group] - 1))
+    
+    return means, stds
+
+
+_compiled_group_moments = None
+
+
+def _group_moments():
+    """
+    Return the JIT-compiled group-moments kernel, or None without numba.
+    
+    Compilation happens on first use, so numba is only imported when needed.
+    """
+    global _compiled_group_moments
+    if _compiled_group_moments is None:
+        numba = _optional('numba')
+        _compiled_group_moments = numba.njit(_group_moments_kernel) if numba is not None else False
+    return _compiled_group_moments or None
+
+
+def _reduce_participant_statistics(trials: np.ndarray, means: Optional[np.ndarray] = None,
+                                   stds: Optional[np.ndarray] = None) -> Dict:
+    """
+    Summarize per-participant trial counts and onset timing.
+    
+    Args:
+        trials: Trials per participant
+        means: Mean stimulus onset per participant (NaN when undefined), if available
+        stds: Onset standard deviation per participant (NaN when undefined), if available
+        
+    Returns:
+        Dictionary with participant-level summary statistics
+    """
+    stats = {
+        'mean_trials_per_participant': float(trials.mean()),
+        'std_trials_per_participant': float(trials.std(ddof=1)) if len(trials) > 1 else float('nan'),
+        'min_trials': int(trials.min()),
+        'max_trials': int(trials.max())
+    }
+    
+    if means is not None:
+        # Per-participant values are rounded to 3 decimals before averaging
+        stats.update({
+            'mean_timing_per_participant': float(pd.Series(means.round(3)).mean()),
+            'std_timing_per_participant': float(pd.Series(stds.round(3)).mean())
+        })
+    
+    return stats
+
+
+def _describe_timing(onsets: pd.Series) -> Dict[str, float]:
+    """
+    Mean, std, min, max and quartiles of stimulus onsets from one materialised array.
+    
+    Args:
+        onsets: Onset column (missing values are ignored)
+        
+    Returns:
+        Dictionary of timing statistics (NaN when there is too little data)
+    """
+    # Accumulate in float64 regardless of the (possibly float32) storage dtype
+    values = onsets.dropna().to_numpy(dtype=np.float64)
+    if values.size == 0:
+        return dict.fromkeys(['mean', 'std', 'min', 'max', 'median', 'q25', 'q75'], float('nan'))
+    
+    q25, median, q75 = np.quantile(values, [0.25, 0.5, 0.75])
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std(ddof=1)) if values.size > 1 else float('nan'),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'median': float(median),
+        'q25': float(q25),
+        'q75': float(q75)
+    }
+
+
+def _format_fixed3(values: List) -> List[str]:
+    """
+    Format a column of numbers with three decimals in one vectorised call.
+    
+    Args:
+        values: Numbers, with None marking a missing value
+        
+    Returns:
+        List of formatted strings ('N/A' where the value is missing)
+    """
+    present = [value is not None for value in values]
+    if not any(present):
+        return ['N/A'] * len(values)
+    
+    numbers = np.array([value if value is not None else np.nan for value in values], dtype=np.float64)
+    formatted = np.char.mod('%.3f', numbers).tolist()
+    return [text if is_present else 'N/A' for text, is_present in zip(formatted, present)]
+
+
+def _orjson_default(obj):
+    """Fallback for values orjson cannot serialize natively."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def _write_xlsx_streaming(xlsxwriter, table: pd.DataFrame, path: Path):
+    """
+    Write a table to .xlsx with xlsxwriter in constant-memory mode.
+    
+    Rows are written strictly in order and flushed to disk as they go, so the
+    workbook is never held in memory. pandas' Excel writer cannot be used for
+    this because it does not write cells row by row.
+    
+    Args:
+        xlsxwriter: The xlsxwriter module
+        table: Table to write (header row plus one row per record)
+        path: Output file path
+    """
+    workbook = xlsxwriter.Workbook(str(path), {'constant_memory': True, 'nan_inf_to_errors': True})
+    try:
+        worksheet = workbook.add_worksheet('Sheet1')
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        worksheet.write_row(0, 0, list(table.columns), header_format)
+        
+        # to_dict('split') boxes numpy scalars as Python values xlsxwriter understands
+        for row_number, row in enumerate(table.to_dict(orient='split')['data'], start=1):
+            worksheet.write_row(row_number, 0, row)
+    finally:
+        workbook.close()
+
 
 class ResultsSummarizer:
     """
@@ -38,13 +267,15 @@ class ResultsSummarizer:
         """
         Initialize the ResultsSummarizer.
         
+        The DataFrame is referenced, not copied; ResultsSummarizer only reads it.
+        
         Args:
             data_path: Path to processed data file (CSV or Excel)
             df: Pre-loaded DataFrame (alternative to data_path)
             analysis_results: Pre-computed analysis results
         """
         if df is not None:
-            self.df = df.copy()
+            self.df = df
         elif data_path is not None:
             self.df = self._load_data(data_path)
         else:
@@ -52,16 +283,54 @@ class ResultsSummarizer:
         
         self.analysis_results = analysis_results or {}
         
+        # Memoized summary statistics and results table with the inputs they were built from
+        self._summary_cache = None
+        self._summary_source = None
+        self._summary_cache_key = None
+        self._results_table_cache = None
+        self._results_table_entries = None
+        
         logger.info(f"Initialized ResultsSummarizer with {len(self.df)} trials")
     
+    def set_dataframe(self, df: pd.DataFrame):
+        """
+        Replace the trial dataframe and drop cached summaries.
+        
+        Call this (with the same frame if need be) after editing the dataframe in
+        place; generate_summary_stats otherwise returns the summary memoized for it.
+        
+        Args:
+            df: New trial dataframe
+        """
+        self.df = df
+        self._summary_cache = None
+        self._summary_source = None
+        self._summary_cache_key = None
+    
     def _load_data(self, data_path: str) -> pd.DataFrame:
-        """Load data from file."""
+        """
+        Load data from file.
+        
+        Only the columns the summaries use are read, with compact dtypes
+        (categorical labels, float32 onsets).
+        """
         data_path = Path(data_path)
         
         if data_path.suffix == '.csv':
-            df = pd.read_csv(data_path)
+            header = pd.read_csv(data_path, nrows=0).columns
+            usecols = [column for column in _SUMMARY_COLUMNS if column in header]
+            if _optional('pyarrow') is not None:
+                # Arrow-backed numeric columns straight from the Arrow reader (no NumPy copy)
+                df = pd.read_csv(data_path, usecols=usecols,
+                                 dtype={column: _SUMMARY_ARROW_DTYPES[column] for column in usecols},
+                                 engine='pyarrow', dtype_backend='pyarrow')
+            else:
+                df = pd.read_csv(data_path, usecols=usecols,
+                                 dtype={column: _SUMMARY_DTYPES[column] for column in usecols})
         elif data_path.suffix in ['.xlsx', '.xls']:
-            df = pd.read_excel(data_path)
+            # Excel parsing is slow regardless; convert large inputs to CSV or Parquet first
+            df = pd.read_excel(data_path, usecols=lambda column: column in _SUMMARY_DTYPES)
+            df = df.astype({column: _SUMMARY_DTYPES[column] for column in df.columns})
         else:
             raise ValueError(f"Unsupported file format: {data_path.suffix}")
         
@@ -72,17 +341,26 @@ class ResultsSummarizer:
         """
         Generate comprehensive descriptive statistics.
         
+        The result is memoized per dataframe object and treated as read-only; after
+        editing the dataframe in place, pass it to set_dataframe to recompute.
+        
         Returns:
             Dictionary with descriptive statistics
         """
+        # Keyed on the frame object itself (not id(), which can be reused) plus its shape
+        cache_key = (len(self.df), tuple(self.df.columns))
+        if self.df is self._summary_source and cache_key == self._summary_cache_key:
+            return self._summary_cache
+        
         logger.info("Generating summary statistics")
         
+        participants = self._distinct_values('participant_id') if 'participant_id' in self.df.columns else []
         summary = {
             'data_overview': {
                 'total_trials': len(self.df),
-                'participants': self.df['participant_id'].nunique() if 'participant_id' in self.df.columns else 0,
-                'conditions': list(self.df['condition'].unique()) if 'condition' in self.df.columns else [],
-                'stimulus_types': list(self.df['stimulus_type'].unique()) if 'stimulus_type' in self.df.columns else []
+                'participants': sum(1 for participant in participants if not pd.isna(participant)),
+                'conditions': self._distinct_values('condition') if 'condition' in self.df.columns else [],
+                'stimulus_types': self._distinct_values('stimulus_type') if 'stimulus_type' in self.df.columns else []
             },
             'timing_statistics': {},
             'condition_statistics': {},
@@ -92,60 +370,184 @@ class ResultsSummarizer:
         
         # Timing statistics
         if 'stimulus_onset' in self.df.columns:
-            timing_data = self.df['stimulus_onset'].dropna()
-            summary['timing_statistics'] = {
-                'mean': float(timing_data.mean()),
-                'std': float(timing_data.std()),
-                'min': float(timing_data.min()),
-                'max': float(timing_data.max()),
-                'median': float(timing_data.median()),
-                'q25': float(timing_data.quantile(0.25)),
-                'q75': float(timing_data.quantile(0.75))
-            }
-        
-        # Condition statistics
-        if 'condition' in self.df.columns:
-            for condition in self.df['condition'].unique():
-                cond_data = self.df[self.df['condition'] == condition]
-                summary['condition_statistics'][condition] = {
-                    'n_trials': len(cond_data),
-                    'percentage': len(cond_data) / len(self.df) * 100,
-                    'participants': cond_data['participant_id'].nunique() if 'participant_id' in cond_data.columns else 0
-                }
-        
-        # Stimulus statistics
-        if 'stimulus_type' in self.df.columns:
-            for stim_type in self.df['stimulus_type'].unique():
-                stim_data = self.df[self.df['stimulus_type'] == stim_type]
-                summary['stimulus_statistics'][stim_type] = {
-                    'n_trials': len(stim_data),
-                    'percentage': len(stim_data) / len(self.df) * 100,
-                    'participants': stim_data['participant_id'].nunique() if 'participant_id' in stim_data.columns else 0
-                }
+            summary['timing_statistics'] = _describe_timing(self.df['stimulus_onset'])
         
-        # Participant statistics
-        if 'participant_id' in self.df.columns:
-            participant_stats = self.df.groupby('participant_id').agg({
-                'trial_number': 'count',
-                'stimulus_onset': ['mean', 'std'] if 'stimulus_onset' in self.df.columns else 'count'
-            }).round(3)
+        if _optional('polars') is not None:
+            # Condition, stimulus and participant statistics as one parallel Polars query
+            summary.update(self._polars_group_statistics())
+        else:
+            # Condition statistics
+            if 'condition' in self.df.columns:
+                summary['condition_statistics'] = self._group_statistics('condition')
             
-            summary['participant_statistics'] = {
-                'mean_trials_per_participant': float(participant_stats[('trial_number', 'count')].mean()),
-                'std_trials_per_participant': float(participant_stats[('trial_number', 'count')].std()),
-                'min_trials': int(participant_stats[('trial_number', 'count')].min()),
-                'max_trials': int(participant_stats[('trial_number', 'count')].max())
-            }
+            # Stimulus statistics
+            if 'stimulus_type' in self.df.columns:
+                summary['stimulus_statistics'] = self._group_statistics('stimulus_type')
             
-            if 'stimulus_onset' in self.df.columns:
-                summary['participant_statistics'].update({
-                    'mean_timing_per_participant': float(participant_stats[('stimulus_onset', 'mean')].mean()),
-                    'std_timing_per_participant': float(participant_stats[('stimulus_onset', 'std')].mean())
-                })
+            # Participant statistics
+            if 'participant_id' in self.df.columns:
+                summary['participant_statistics'] = self._participant_statistics()
+        
+        self._summary_cache = summary
+        self._summary_source = self.df
+        self._summary_cache_key = cache_key
         
         logger.info("Summary statistics generated")
         return summary
     
+    def _distinct_values(self, column: str) -> List:
+        """
+        Distinct values of a column in order of first appearance (missing values included).
+        
+        For categorical columns only the small integer codes are hashed, not the labels.
+        
+        Args:
+            column: Column name
+            
+        Returns:
+            List of distinct values, as Series.unique() would give
+        """
+        values = self.df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = values.cat.categories
+            return [categories[code] if code >= 0 else np.nan
+                    for code in pd.unique(values.cat.codes.to_numpy())]
+        return list(values.unique())
+    
+    def _group_statistics(self, column: str) -> Dict:
+        """
+        Trial counts, percentages and participant counts per value of a column.
+        
+        Args:
+            column: Grouping column (e.g. 'condition' or 'stimulus_type')
+            
+        Returns:
+            Dictionary keyed by group value, in order of first appearance
+        """
+        grouped = self.df.groupby(column, sort=False, observed=True)
+        if 'participant_id' in self.df.columns:
+            group_stats = grouped['participant_id'].agg(n_trials='size', participants='nunique')
+        else:
+            group_stats = grouped.size().to_frame('n_trials').assign(participants=0)
+        
+        total = len(self.df)
+        return {
+            value: {
+                'n_trials': int(n_trials),
+                'percentage': float(n_trials / total * 100),
+                'participants': int(participants)
+            }
+            for value, n_trials, participants in zip(group_stats.index, group_stats['n_trials'], group_stats['participants'])
+        }
+    
+    def _participant_statistics(self) -> Dict:
+        """
+        Distribution of per-participant trial counts and onset timing.
+        
+        Participants are factorized to integer codes once and every per-participant
+        reduction is a np.bincount over those codes (onset moments use a compiled
+        single-pass kernel when numba is available).
+        
+        Returns:
+            Dictionary with participant-level summary statistics
+        """
+        codes, participants = pd.factorize(self.df['participant_id'], sort=False)
+        n_participants = len(participants)
+        valid = codes >= 0
+        
+        # Trials per participant (non-missing trial numbers, as with a grouped count)
+        has_trial = valid & self.df['trial_number'].notna().to_numpy()
+        trials = np.bincount(codes[has_trial], minlength=n_participants)
+        
+        means = stds = None
+        if 'stimulus_onset' in self.df.columns:
+            onsets = self.df['stimulus_onset'].to_numpy(dtype=np.float64)
+            group_moments = _group_moments()
+            if group_moments is not None:
+                means, stds = group_moments(codes, onsets, n_participants)
+            else:
+                has_onset = valid & ~np.isnan(onsets)
+                onset_codes = codes[has_onset]
+                onsets = onsets[has_onset]
+                
+                n = np.bincount(onset_codes, minlength=n_participants)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    means = np.bincount(onset_codes, weights=onsets, minlength=n_participants) / n
+                    squares = np.bincount(onset_codes, weights=(onsets - means[onset_codes]) ** 2,
+                                          minlength=n_participants)
+                    stds = np.sqrt(squares / (n - 1))
+                means[n == 0] = np.nan
+                stds[n < 2] = np.nan
+        
+        return _reduce_participant_statistics(trials, means, stds)
+    
+    def _polars_group_statistics(self) -> Dict:
+        """
+        Condition, stimulus and participant statistics computed with Polars.
+        
+        The grouped aggregations are built as lazy queries over one Arrow-backed
+        copy of the needed columns and collected together, so Polars can share
+        the scan and run them in parallel. Results match the pandas path.
+        
+        Returns:
+            Dictionary with 'condition_statistics', 'stimulus_statistics' and
+            'participant_statistics' entries (empty when the column is missing)
+        """
+        pl = _optional('polars')
+        columns = [column for column in ('participant_id', 'condition', 'stimulus_type',
+                                         'trial_number', 'stimulus_onset')
+                   if column in self.df.columns]
+        frame = pl.from_pandas(self.df[columns]).lazy()
+        has_participant = 'participant_id' in columns
+        has_onset = 'stimulus_onset' in columns
+        
+        group_queries = {}
+        for column, key in (('condition', 'condition_statistics'), ('stimulus_type', 'stimulus_statistics')):
+            if column in columns:
+                participants = (pl.col('participant_id').drop_nulls().n_unique() if has_participant
+                                else pl.lit(0))
+                group_queries[key] = (
+                    frame.filter(pl.col(column).is_not_null())
+                    .group_by(column, maintain_order=True)
+                    .agg(pl.len().alias('n_trials'), participants.alias('participants'))
+                )
+        
+        if has_participant:
+            aggregations = [pl.col('trial_number').count().alias('trials')]
+            if has_onset:
+                aggregations += [pl.col('stimulus_onset').mean().alias('mean_onset'),
+                                 pl.col('stimulus_onset').std().alias('std_onset')]
+            group_queries['participant_statistics'] = (
+                frame.filter(pl.col('participant_id').is_not_null())
+                .group_by('participant_id', maintain_order=True)
+                .agg(aggregations)
+            )
+        
+        results = dict(zip(group_queries, pl.collect_all(list(group_queries.values()))))
+        statistics = {'condition_statistics': {}, 'stimulus_statistics': {}, 'participant_statistics': {}}
+        
+        total = len(self.df)
+        for key in ('condition_statistics', 'stimulus_statistics'):
+            if key in results:
+                statistics[key] = {
+                    value: {
+                        'n_trials': int(n_trials),
+                        'percentage': float(n_trials / total * 100),
+                        'participants': int(participants)
+                    }
+                    for value, n_trials, participants in results[key].iter_rows()
+                }
+        
+        if 'participant_statistics' in results:
+            participant_stats = results['participant_statistics']
+            statistics['participant_statistics'] = _reduce_participant_statistics(
+                participant_stats['trials'].to_numpy(),
+                participant_stats['mean_onset'].to_numpy().astype(np.float64) if has_onset else None,
+                participant_stats['std_onset'].to_numpy().astype(np.float64) if has_onset else None
+            )
+        
+        return statistics
+    
     def create_results_table(self, analysis_results: Dict = None) -> pd.DataFrame:
         """
         Create comprehensive results table from analysis results.
@@ -156,69 +558,86 @@ class ResultsSummarizer:
         Returns:
             pandas DataFrame with results table
         """
-        logger.info("Creating results table")
-        
         if analysis_results is None:
             analysis_results = self.analysis_results
         
-        results_data = []
+        # Memo holds the (name, results) entries it was built from; any added, removed or
+        # replaced entry rebuilds the table (entries themselves are treated as read-only)
+        entries = self._results_table_entries
+        if (entries is not None and len(entries) == len(analysis_results)
+                and all(name == key and value is results
+                        for (name, value), (key, results) in zip(entries, analysis_results.items()))):
+            return self._results_table_cache
+        
+        logger.info("Creating results table")
+        
+        # Table columns are filled in place (one list per column); numeric cells are
+        # collected raw (None when absent) and formatted in bulk after the loop
+        columns = {column: [] for column in _RESULTS_TABLE_COLUMNS}
         
         # Extract results from different analyses
         for analysis_type, results in analysis_results.items():
-            if isinstance(results, dict):
-                row = {
-                    'Analysis_Type': analysis_type,
-                    'N_Trials': results.get('n_trials', 'N/A'),
-                    'N_Participants': results.get('participants', 'N/A'),
-                    'Statistical_Test': 'N/A',
-                    'Test_Statistic': 'N/A',
-                    'P_Value': 'N/A',
-                    'Significant': 'N/A',
-                    'Effect_Size': 'N/A',
-                    'Effect_Interpretation': 'N/A'
-                }
-                
-                # Extract statistical test information
-                if 't_test' in results:
-                    row.update({
-                        'Statistical_Test': 't-test',
-                        'Test_Statistic': f"{results['t_test']['t_statistic']:.3f}",
-                        'P_Value': f"{results['t_test']['p_value']:.3f}",
-                        'Significant': 'Yes' if results['t_test']['significant'] else 'No'
-                    })
-                
-                if 'effect_size' in results:
-                    row.update({
-                        'Effect_Size': f"{results['effect_size']['cohens_d']:.3f}",
-                        'Effect_Interpretation': results['effect_size']['interpretation']
-                    })
-                
-                if 'anova' in results:
-                    row.update({
-                        'Statistical_Test': 'ANOVA',
-                        'Test_Statistic': f"{results['anova']['f_statistic']:.3f}",
-                        'P_Value': f"{results['anova']['p_value']:.3f}",
-                        'Significant': 'Yes' if results['anova']['significant'] else 'No'
-                    })
-                
-                results_data.append(row)
+            if not isinstance(results, dict):
+                continue
+            
+            statistical_test = significant = effect_interpretation = 'N/A'
+            test_statistic = p_value = effect_size = None
+            
+            # Extract statistical test information (an ANOVA takes precedence over a t-test)
+            if 'anova' in results:
+                test = results['anova']
+                statistical_test = 'ANOVA'
+                test_statistic = test['f_statistic']
+            elif 't_test' in results:
+                test = results['t_test']
+                statistical_test = 't-test'
+                test_statistic = test['t_statistic']
+            else:
+                test = None
+            
+            if test is not None:
+                p_value = test['p_value']
+                significant = 'Yes' if test['significant'] else 'No'
+            
+            if 'effect_size' in results:
+                effect_size = results['effect_size']['cohens_d']
+                effect_interpretation = results['effect_size']['interpretation']
+            
+            columns['Analysis_Type'].append(analysis_type)
+            columns['N_Trials'].append(results.get('n_trials', 'N/A'))
+            columns['N_Participants'].append(results.get('participants', 'N/A'))
+            columns['Statistical_Test'].append(statistical_test)
+            columns['Test_Statistic'].append(test_statistic)
+            columns['P_Value'].append(p_value)
+            columns['Significant'].append(significant)
+            columns['Effect_Size'].append(effect_size)
+            columns['Effect_Interpretation'].append(effect_interpretation)
+        
+        for column in ('Test_Statistic', 'P_Value', 'Effect_Size'):
+            columns[column] = _format_fixed3(columns[column])
         
         # Create DataFrame
-        results_df = pd.DataFrame(results_data)
+        results_df = pd.DataFrame(columns, copy=False)
         
         if results_df.empty:
             logger.warning("No results data found for table creation")
-            return pd.DataFrame()
+            results_df = pd.DataFrame()
+        else:
+            logger.info(f"Results table created with {len(results_df)} rows")
         
-        logger.info(f"Results table created with {len(results_df)} rows")
+        self._results_table_cache = results_df
+        self._results_table_entries = list(analysis_results.items())
         return results_df
     
-    def write_results_report(self, output_path: str = None) -> str:
+    def write_results_report(self, output_path: str = None, *, summary_stats: Dict = None,
+                             results_table: pd.DataFrame = None) -> str:
         """
         Write comprehensive results report to file.
         
         Args:
             output_path: Path to save the report
+            summary_stats: Precomputed generate_summary_stats() result (computed if None)
+            results_table: Precomputed create_results_table() result (computed if None)
             
         Returns:
             Path to the saved report file
@@ -231,128 +650,145 @@ class ResultsSummarizer:
             output_path = Path(output_path)
         
         # Generate summary statistics
-        summary_stats = self.generate_summary_stats()
+        if summary_stats is None:
+            summary_stats = self.generate_summary_stats()
         
         # Create results table
-        results_table = self.create_results_table()
-        
-        # Write report
-        with open(output_path, 'w') as f:
-            f.write("=" * 80 + "\n")
-            f.write("fMRI Tool Representation Study - Results Report\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Analysis Pipeline Version: 1.0\n")
-            f.write("\n")
-            
-            # Data overview
-            f.write("DATA OVERVIEW\n")
-            f.write("-" * 40 + "\n")
-            overview = summary_stats['data_overview']
-            f.write(f"Total Trials: {overview['total_trials']}\n")
-            f.write(f"Participants: {overview['participants']}\n")
-            f.write(f"Conditions: {', '.join(overview['conditions'])}\n")
-            f.write(f"Stimulus Types: {', '.join(overview['stimulus_types'])}\n")
-            f.write("\n")
-            
-            # Timing statistics
-            if summary_stats['timing_statistics']:
-                f.write("TIMING STATISTICS\n")
-                f.write("-" * 40 + "\n")
-                timing = summary_stats['timing_statistics']
-                f.write(f"Mean Onset Time: {timing['mean']:.3f}s\n")
-                f.write(f"Standard Deviation: {timing['std']:.3f}s\n")
-                f.write(f"Range: {timing['min']:.3f}s - {timing['max']:.3f}s\n")
-                f.write(f"Median: {timing['median']:.3f}s\n")
-                f.write(f"IQR: {timing['q25']:.3f}s - {timing['q75']:.3f}s\n")
-                f.write("\n")
-            
-            # Condition statistics
-            if summary_stats['condition_statistics']:
-                f.write("CONDITION STATISTICS\n")
-                f.write("-" * 40 + "\n")
-                for condition, stats in summary_stats['condition_statistics'].items():
-                    f.write(f"{condition}:\n")
-                    f.write(f"  Trials: {stats['n_trials']} ({stats['percentage']:.1f}%)\n")
-                    f.write(f"  Participants: {stats['participants']}\n")
-                f.write("\n")
-            
-            # Stimulus statistics
-            if summary_stats['stimulus_statistics']:
-                f.write("STIMULUS STATISTICS\n")
-                f.write("-" * 40 + "\n")
-                for stim_type, stats in summary_stats['stimulus_statistics'].items():
-                    f.write(f"{stim_type}:\n")
-                    f.write(f"  Trials: {stats['n_trials']} ({stats['percentage']:.1f}%)\n")
-                    f.write(f"  Participants: {stats['participants']}\n")
-                f.write("\n")
-            
-            # Participant statistics
-            if summary_stats['participant_statistics']:
-                f.write("PARTICIPANT STATISTICS\n")
-                f.write("-" * 40 + "\n")
-                part_stats = summary_stats['participant_statistics']
-                f.write(f"Mean Trials per Participant: {part_stats['mean_trials_per_participant']:.1f}\n")
-                f.write(f"SD Trials per Participant: {part_stats['std_trials_per_participant']:.1f}\n")
-                f.write(f"Trial Range: {part_stats['min_trials']} - {part_stats['max_trials']}\n")
-                if 'mean_timing_per_participant' in part_stats:
-                    f.write(f"Mean Timing per Participant: {part_stats['mean_timing_per_participant']:.3f}s\n")
-                f.write("\n")
-            
-            # Results table
-            if not results_table.empty:
-                f.write("STATISTICAL RESULTS\n")
-                f.write("-" * 40 + "\n")
-                f.write(results_table.to_string(index=False))
-                f.write("\n\n")
-            
-            # Research questions summary
-            f.write("RESEARCH QUESTIONS SUMMARY\n")
-            f.write("-" * 40 + "\n")
-            f.write("RQ1: Are Tools Special?\n")
-            f.write("  - Compare tools vs shapes across all tasks\n")
-            f.write("  - Analyze passive viewing: Tools vs Shapes\n")
-            f.write("  - Analyze active grasp: Tools vs Shapes\n")
-            f.write("  - Compare screen-optimized stimuli\n")
-            f.write("\n")
-            f.write("RQ2: Action Potentiation\n")
-            f.write("  - Compare passive viewing vs active grasping\n")
-            f.write("  - Analyze tools: Passive vs Active\n")
-            f.write("  - Analyze shapes: Passive vs Active\n")
-            f.write("  - Test interaction effects\n")
-            f.write("\n")
-            f.write("RQ3: Functional vs Structural\n")
-            f.write("  - Compare functional tools vs neutral shapes\n")
-            f.write("  - Analyze standard vs screen-optimized stimuli\n")
-            f.write("\n")
-            
-            # Key findings
-            f.write("KEY FINDINGS\n")
-            f.write("-" * 40 + "\n")
-            f.write("1. Data Processing: Successfully processed experimental data\n")
-            f.write("2. Statistical Analysis: Comprehensive analysis pipeline implemented\n")
-            f.write("3. Visualization: Publication-ready plots generated\n")
-            f.write("4. Results: Analysis-ready datasets created\n")
-            f.write("\n")
-            
-            f.write("=" * 80 + "\n")
-            f.write("End of Report\n")
-            f.write("=" * 80 + "\n")
+        if results_table is None:
+            results_table = self.create_results_table()
+        
+        # Build the report as a list of lines and write it in one call
+        report = []
+        report.append("=" * 80)
+        report.append("fMRI Tool Representation Study - Results Report")
+        report.append("=" * 80)
+        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        report.append(f"Analysis Pipeline Version: 1.0")
+        report.append("")
+        
+        # Data overview
+        report.append("DATA OVERVIEW")
+        report.append("-" * 40)
+        overview = summary_stats['data_overview']
+        report.append(f"Total Trials: {overview['total_trials']}")
+        report.append(f"Participants: {overview['participants']}")
+        report.append(f"Conditions: {', '.join(overview['conditions'])}")
+        report.append(f"Stimulus Types: {', '.join(overview['stimulus_types'])}")
+        report.append("")
+        
+        # Timing statistics
+        if summary_stats['timing_statistics']:
+            report.append("TIMING STATISTICS")
+            report.append("-" * 40)
+            timing = summary_stats['timing_statistics']
+            report.append(f"Mean Onset Time: {timing['mean']:.3f}s")
+            report.append(f"Standard Deviation: {timing['std']:.3f}s")
+            report.append(f"Range: {timing['min']:.3f}s - {timing['max']:.3f}s")
+            report.append(f"Median: {timing['median']:.3f}s")
+            report.append(f"IQR: {timing['q25']:.3f}s - {timing['q75']:.3f}s")
+            report.append("")
+        
+        # Condition statistics
+        if summary_stats['condition_statistics']:
+            report.append("CONDITION STATISTICS")
+            report.append("-" * 40)
+            for condition, stats in summary_stats['condition_statistics'].items():
+                report.append(f"{condition}:")
+                report.append(f"  Trials: {stats['n_trials']} ({stats['percentage']:.1f}%)")
+                report.append(f"  Participants: {stats['participants']}")
+            report.append("")
+        
+        # Stimulus statistics
+        if summary_stats['stimulus_statistics']:
+            report.append("STIMULUS STATISTICS")
+            report.append("-" * 40)
+            for stim_type, stats in summary_stats['stimulus_statistics'].items():
+                report.append(f"{stim_type}:")
+                report.append(f"  Trials: {stats['n_trials']} ({stats['percentage']:.1f}%)")
+                report.append(f"  Participants: {stats['participants']}")
+            report.append("")
+        
+        # Participant statistics
+        if summary_stats['participant_statistics']:
+            report.append("PARTICIPANT STATISTICS")
+            report.append("-" * 40)
+            part_stats = summary_stats['participant_statistics']
+            report.append(f"Mean Trials per Participant: {part_stats['mean_trials_per_participant']:.1f}")
+            report.append(f"SD Trials per Participant: {part_stats['std_trials_per_participant']:.1f}")
+            report.append(f"Trial Range: {part_stats['min_trials']} - {part_stats['max_trials']}")
+            if 'mean_timing_per_participant' in part_stats:
+                report.append(f"Mean Timing per Participant: {part_stats['mean_timing_per_participant']:.3f}s")
+            report.append("")
+        
+        # Results table
+        if not results_table.empty:
+            report.append("STATISTICAL RESULTS")
+            report.append("-" * 40)
+            report.append(results_table.to_string(index=False))
+            report.append("")
+        
+        # Research questions summary
+        report.append("RESEARCH QUESTIONS SUMMARY")
+        report.append("-" * 40)
+        report.append("RQ1: Are Tools Special?")
+        report.append("  - Compare tools vs shapes across all tasks")
+        report.append("  - Analyze passive viewing: Tools vs Shapes")
+        report.append("  - Analyze active grasp: Tools vs Shapes")
+        report.append("  - Compare screen-optimized stimuli")
+        report.append("")
+        report.append("RQ2: Action Potentiation")
+        report.append("  - Compare passive viewing vs active grasping")
+        report.append("  - Analyze tools: Passive vs Active")
+        report.append("  - Analyze shapes: Passive vs Active")
+        report.append("  - Test interaction effects")
+        report.append("")
+        report.append("RQ3: Functional vs Structural")
+        report.append("  - Compare functional tools vs neutral shapes")
+        report.append("  - Analyze standard vs screen-optimized stimuli")
+        report.append("")
+        
+        # Key findings
+        report.append("KEY FINDINGS")
+        report.append("-" * 40)
+        report.append("1. Data Processing: Successfully processed experimental data")
+        report.append("2. Statistical Analysis: Comprehensive analysis pipeline implemented")
+        report.append("3. Visualization: Publication-ready plots generated")
+        report.append("4. Results: Analysis-ready datasets created")
+        report.append("")
+        
+        report.append("=" * 80)
+        report.append("End of Report")
+        report.append("=" * 80)
+        
+        with open(output_path, 'w', buffering=1 << 20) as f:
+            f.write("\n".join(report) + "\n")
         
         logger.info(f"Results report written to {output_path}")
         return str(output_path)
     
-    def export_for_publication(self, output_dir: str = None) -> Dict[str, str]:
+    def export_for_publication(self, output_dir: str = None, include_excel: bool = False,
+                               formats: Set[str] = None) -> Dict[str, str]:
         """
         Export results in publication-ready formats.
         
         Args:
             output_dir: Output directory
+            include_excel: Also write results_table.xlsx (same as adding 'xlsx' to formats)
+            formats: Artifacts to write, any of 'json', 'csv', 'parquet', 'xlsx' and 'txt'
+                (default: all but 'xlsx'). Batch pipelines that only consume the tables can
+                leave out 'txt' to skip building the comprehensive report.
             
         Returns:
             Dictionary mapping file types to file paths
         """
-        logger.info("Exporting results for publication")
+        formats = set(_DEFAULT_EXPORT_FORMATS if formats is None else formats)
+        unknown = formats - _EXPORT_FORMATS
+        if unknown:
+            raise ValueError(f"Unknown export formats {sorted(unknown)}; expected a subset of {sorted(_EXPORT_FORMATS)}")
+        if include_excel:
+            formats.add('xlsx')
+        
+        logger.info(f"Exporting results for publication ({', '.join(sorted(formats))})")
         
         if output_dir is None:
             output_dir = Path.cwd() / "publication_results"
@@ -363,40 +799,56 @@ class ResultsSummarizer:
         
         exported_files = {}
         
-        # Generate summary statistics
-        summary_stats = self.generate_summary_stats()
+        # Generate summary statistics (needed by the JSON export and the report)
+        summary_stats = self.generate_summary_stats() if formats & {'json', 'txt'} else None
         
         # Export summary statistics as JSON
-        summary_path = output_dir / "summary_statistics.json"
-        with open(summary_path, 'w') as f:
-            json.dump(summary_stats, f, indent=2)
-        exported_files['summary_json'] = str(summary_path)
+        if 'json' in formats:
+            summary_path = output_dir / "summary_statistics.json"
+            self._write_json(summary_stats, summary_path)
+            exported_files['summary_json'] = str(summary_path)
         
         # Create and export results table
-        results_table = self.create_results_table()
-        if not results_table.empty:
+        results_table = self.create_results_table() if formats - {'json'} else None
+        if results_table is not None and not results_table.empty:
             # CSV format
-            csv_path = output_dir / "results_table.csv"
-            results_table.to_csv(csv_path, index=False)
-            exported_files['results_csv'] = str(csv_path)
+            if 'csv' in formats:
+                csv_path = output_dir / "results_table.csv"
+                results_table.to_csv(csv_path, index=False)
+                exported_files['results_csv'] = str(csv_path)
+            
+            # Parquet format (mixed-type columns such as N_Trials are stored as text)
+            if 'parquet' in formats:
+                parquet_path = output_dir / "results_table.parquet"
+                mixed_columns = results_table.select_dtypes(include='object').columns
+                try:
+                    results_table.astype({column: str for column in mixed_columns}).to_parquet(
+                        parquet_path, index=False, compression='zstd'
+                    )
+                    exported_files['results_parquet'] = str(parquet_path)
+                except ImportError:
+                    logger.warning("Skipping Parquet export: install pyarrow or fastparquet")
             
             # Excel format
-            excel_path = output_dir / "results_table.xlsx"
-            results_table.to_excel(excel_path, index=False)
-            exported_files['results_excel'] = str(excel_path)
+            if 'xlsx' in formats:
+                excel_path = output_dir / "results_table.xlsx"
+                xlsxwriter = _optional('xlsxwriter')
+                if xlsxwriter is not None:
+                    _write_xlsx_streaming(xlsxwriter, results_table, excel_path)
+                else:
+                    results_table.to_excel(excel_path, index=False)
+                exported_files['results_excel'] = str(excel_path)
         
         # Write comprehensive report
-        report_path = output_dir / "comprehensive_report.txt"
-        self.write_results_report(report_path)
-        exported_files['comprehensive_report'] = str(report_path)
+        if 'txt' in formats:
+            report_path = output_dir / "comprehensive_report.txt"
+            self.write_results_report(report_path, summary_stats=summary_stats, results_table=results_table)
+            exported_files['comprehensive_report'] = str(report_path)
         
         # Export analysis results if available
-        if self.analysis_results:
+        if 'json' in formats and self.analysis_results:
             analysis_path = output_dir / "analysis_results.json"
-            # Convert numpy types and booleans to JSON-serializable types
-            serializable_results = self._make_json_serializable(self.analysis_results)
-            with open(analysis_path, 'w') as f:
-                json.dump(serializable_results, f, indent=2)
+            self._write_json(self.analysis_results, analysis_path)
             exported_files['analysis_results'] = str(analysis_path)
         
         logger.info(f"Publication-ready results exported to {output_dir}")
@@ -460,21 +912,51 @@ class ResultsSummarizer:
         
         return "\n".join(interpretation)
     
+    def _write_json(self, obj, path: Path):
+        """
+        Write results as indented JSON.
+        
+        With orjson installed, numpy scalars and arrays are serialized natively in
+        a single C pass; otherwise the tree is converted with
+        _make_json_serializable and written with the standard library. Both write
+        the same document (numpy booleans as booleans, NaN as null).
+        
+        Args:
+            obj: Results dictionary (may contain numpy values)
+            path: Output file path
+        """
+        orjson = _optional('orjson')
+        if orjson is not None:
+            options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(obj, default=_orjson_default, option=options))
+        else:
+            with open(path, 'w') as f:
+                json.dump(self._make_json_serializable(obj), f, indent=2)
+    
     def _make_json_serializable(self, obj):
         """Convert numpy types and other non-JSON-serializable objects to serializable types."""
+        # Exact-type lookups first: plain JSON scalars and the common numpy scalars
+        obj_type = type(obj)
+        if obj_type in _JSON_SCALAR_TYPES:
+            return obj
+        converter = _JSON_SCALAR_CONVERTERS.get(obj_type)
+        if converter is not None:
+            return converter(obj)
+        
         if isinstance(obj, dict):
             return {key: self._make_json_serializable(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
+        elif isinstance(obj, (list, tuple)):
             return [self._make_json_serializable(item) for item in obj]
+        elif isinstance(obj, np.bool_):
+            return bool(obj)
         elif isinstance(obj, np.integer):
             return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
+        elif isinstance(obj, (float, np.floating)):
+            return _json_float(obj)
         elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, bool):
-            return obj
-        elif isinstance(obj, (int, float, str, type(None))):
+            return self._make_json_serializable(obj.tolist())
+        elif isinstance(obj, (int, str, type(None))):
             return obj
         else:
             return str(obj)
@@ -500,10 +982,11 @@ def write_results_report(data_path: str, output_path: str = None) -> str:
     return summarizer.write_results_report(output_path)
 
 
-def export_for_publication(data_path: str, output_dir: str = None) -> Dict[str, str]:
+def export_for_publication(data_path: str, output_dir: str = None, include_excel: bool = False,
+                           formats: Set[str] = None) -> Dict[str, str]:
     """Convenience function to export for publication."""
     summarizer = ResultsSummarizer(data_path)
-    return summarizer.export_for_publication(output_dir)
+    return summarizer.export_for_publication(output_dir, include_excel=include_excel, formats=formats)
 
 
 if __name__ == "__main__":
@@ -12,20 +12,409 @@ Date: 2024
 import pandas as pd
 import numpy as np
 import scipy.stats as stats
-from scipy.stats import ttest_rel, ttest_ind, f_oneway, chi2_contingency
+from scipy.stats import f_oneway, chi2_contingency
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from typing import Dict, List, Tuple, Optional, Union
 import logging
+import importlib.util
+import os
 from pathlib import Path
+from itertools import combinations
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
 # Set up module logger (configured by application)
 logger = logging.getLogger(__name__)
 
-# Suppress warnings for cleaner output
-warnings.filterwarnings('ignore')
+# Stimulus classes, keyed by lower-cased stimulus label (any other label is _OTHER_STIMULUS)
+_STANDARD_TOOL, _SCR_TOOL, _STANDARD_SHAPE, _SCR_SHAPE, _OTHER_STIMULUS = range(5)
+_STIMULUS_CLASSES = {
+    'tool': _STANDARD_TOOL,
+    'scrtool': _SCR_TOOL,
+    'shape': _STANDARD_SHAPE,
+    'scrshape': _SCR_SHAPE
+}
+_TOOL_CLASSES = (_STANDARD_TOOL, _SCR_TOOL)
+_SHAPE_CLASSES = (_STANDARD_SHAPE, _SCR_SHAPE)
+
+# Cohen's d magnitude cut-offs and the labels of the bands they delimit
+_COHENS_D_CUTS = np.array([0.2, 0.5, 0.8])
+_COHENS_D_LABELS = ('negligible', 'small', 'medium', 'large')
+
+# Per-condition analyses run on a thread pool from this many trials up (numpy/scipy release the GIL)
+_PARALLEL_MIN_TRIALS = 100_000
+
+# Conditions selected by the motor analyses
+_MOTOR_CONDITIONS = ('active_grasp', 'imagined_grasp', 'clench')
+
+# Label columns loaded as pandas categoricals
+_CATEGORICAL_COLUMNS = ('participant_id', 'condition', 'stimulus_type')
+
+# Columns read from a data file (the analyses use no others)
+_ANALYSIS_COLUMNS = _CATEGORICAL_COLUMNS + ('stimulus_onset',)
+
+# Optional faster readers: pyarrow for CSV, python-calamine for Excel (pandas defaults otherwise)
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+_HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+
+def _selection(stimulus_classes: Tuple[int, ...] = None, conditions: Tuple[str, ...] = None,
+               exclude_conditions: bool = False) -> Tuple:
+    """
+    Canonical (hashable) description of a subset of trials.
+    
+    Args:
+        stimulus_classes: Stimulus classes to keep (None for all)
+        conditions: Conditions to keep (None for all)
+        exclude_conditions: Keep the trials outside `conditions` instead
+        
+    Returns:
+        Selection tuple usable as a cache key
+    """
+    return (
+        frozenset(stimulus_classes) if stimulus_classes is not None else None,
+        frozenset(conditions) if conditions is not None else None,
+        exclude_conditions
+    )
+
+
+def _category_codes(labels: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Integer category codes of a label column (-1 for missing values).
+    
+    Args:
+        labels: Label column (categorical columns are used as-is)
+        
+    Returns:
+        Tuple of (codes array, categories index)
+    """
+    categorical = labels if isinstance(labels.dtype, pd.CategoricalDtype) else labels.astype('category')
+    return categorical.cat.codes.to_numpy(), categorical.cat.categories
+
+
+@dataclass
+class _ColumnStore:
+    """
+    Columnar (struct-of-arrays) copy of the trial columns used by the analyses.
+    
+    Label columns are held as integer category codes (-1 for missing labels), with their
+    labels in `categories`; onsets keep a float32 column as float32 and are float64
+    otherwise (None when the column is absent).
+    """
+    onset: Optional[np.ndarray]
+    onset_ok: Optional[np.ndarray]
+    stim_class: np.ndarray
+    stype_codes: np.ndarray
+    cond_codes: np.ndarray
+    pid_codes: np.ndarray
+    categories: Dict[str, pd.Index]
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> '_ColumnStore':
+        """
+        Build the store from a trial DataFrame.
+        
+        Args:
+            df: Trial data with participant_id, condition and stimulus_type columns
+            
+        Returns:
+            Populated column store
+        """
+        stype_codes, stype_categories = _category_codes(df['stimulus_type'])
+        cond_codes, cond_categories = _category_codes(df['condition'])
+        pid_codes, pid_categories = _category_codes(df['participant_id'])
+        
+        # One int8 stimulus class per trial, looked up per category (missing labels map to
+        # the trailing _OTHER_STIMULUS entry through code -1)
+        category_classes = [_STIMULUS_CLASSES.get(label, _OTHER_STIMULUS)
+                            for label in stype_categories.astype(str).str.lower()]
+        stim_class = np.array(category_classes + [_OTHER_STIMULUS], dtype=np.int8)[stype_codes]
+        
+        onset = None
+        if 'stimulus_onset' in df.columns:
+            onset_dtype = np.float32 if df['stimulus_onset'].dtype == np.float32 else np.float64
+            onset = df['stimulus_onset'].to_numpy(dtype=onset_dtype, na_value=np.nan)
+        
+        return cls(
+            onset=onset,
+            onset_ok=~np.isnan(onset) if onset is not None else None,
+            stim_class=stim_class,
+            stype_codes=stype_codes,
+            cond_codes=cond_codes,
+            pid_codes=pid_codes,
+            categories={
+                'stimulus_type': stype_categories,
+                'condition': cond_categories,
+                'participant_id': pid_categories
+            }
+        )
+    
+    def __len__(self) -> int:
+        return len(self.stim_class)
+    
+    def _codes(self, column: str) -> np.ndarray:
+        """Category code array of a label column."""
+        return {'stimulus_type': self.stype_codes, 'condition': self.cond_codes,
+                'participant_id': self.pid_codes}[column]
+    
+    def distinct(self, column: str, mask: np.ndarray = None) -> List:
+        """Distinct labels of a coded column among the masked trials, in order of first appearance."""
+        codes = self._codes(column)
+        if mask is not None:
+            codes = codes[mask]
+        categories = self.categories[column]
+        return [categories[code] if code >= 0 else np.nan for code in pd.unique(codes)]
+    
+    def count_distinct(self, column: str, mask: np.ndarray = None) -> int:
+        """Number of distinct non-missing labels of a coded column among the masked trials."""
+        codes = self._codes(column)
+        if mask is not None:
+            codes = codes[mask]
+        return int(np.count_nonzero(np.bincount(codes[codes >= 0])))
+
+
+def _sample_moments_kernel(values: np.ndarray) -> Tuple[int, float, float]:
+    """
+    Count, mean and sum of squared deviations of a NaN-free array in one (Welford) pass.
+    
+    Args:
+        values: Sample values
+        
+    Returns:
+        Tuple of (count, mean, sum of squared deviations from the mean)
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for value in values:
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        m2 += delta * (value - mean)
+    return n, mean, m2
+
+
+# JIT-compile the moments kernel when numba is available; otherwise numpy is used
+_sample_moments = njit(_sample_moments_kernel) if njit is not None else None
+
+
+def _moments(onsets: np.ndarray) -> Tuple[int, float, float]:
+    """
+    Count, mean and sample variance of a NaN-free onset array.
+    
+    Args:
+        onsets: Stimulus onsets of one group
+        
+    Returns:
+        Tuple of (count, mean, variance with ddof=1), NaN where undefined
+    """
+    n = onsets.size
+    if n == 0:
+        return 0, np.nan, np.nan
+    if _sample_moments is not None:
+        _, mean, m2 = _sample_moments(onsets)
+        return n, mean, m2 / (n - 1) if n > 1 else np.nan
+    return (n, float(onsets.mean(dtype=np.float64)),
+            float(onsets.var(ddof=1, dtype=np.float64)) if n > 1 else np.nan)
+
+
+def _pooled_stats(moments1: np.ndarray, moments2: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mean difference, pooled standard deviation and degrees of freedom of group pairs.
+    
+    Shared by the Student t statistic and Cohen's d so both derive from the same values.
+    
+    Args:
+        moments1: (..., 3) array of (count, mean, variance) of the first groups
+        moments2: (..., 3) array of (count, mean, variance) of the second groups
+        
+    Returns:
+        Tuple of (mean differences, pooled standard deviations, degrees of freedom)
+    """
+    n1, mean1, var1 = np.moveaxis(np.asarray(moments1, dtype=np.float64), -1, 0)
+    n2, mean2, var2 = np.moveaxis(np.asarray(moments2, dtype=np.float64), -1, 0)
+    dof = n1 + n2 - 2
+    # A single observation contributes no squared deviations (its variance itself is undefined)
+    ss1 = np.where(n1 > 1, (n1 - 1) * var1, 0.0)
+    ss2 = np.where(n2 > 1, (n2 - 1) * var2, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pooled_std = np.sqrt((ss1 + ss2) / dof)
+    return mean1 - mean2, pooled_std, dof
+
+
+def _student_t_tests(moments1: np.ndarray, moments2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Independent two-sample Student t-tests (pooled variance) for many pairs at once.
+    
+    Equivalent to scipy.stats.ttest_ind with equal_var=True, computed from group moments.
+    
+    Args:
+        moments1: (n_pairs, 3) array of (count, mean, variance) of the first groups
+        moments2: (n_pairs, 3) array of (count, mean, variance) of the second groups
+        
+    Returns:
+        Tuple of (t statistics, two-sided p-values) arrays
+    """
+    mean_diff, pooled_std, dof = _pooled_stats(moments1, moments2)
+    n1, n2 = moments1[:, 0], moments2[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stats = mean_diff / (pooled_std * np.sqrt(1 / n1 + 1 / n2))
+    p_values = 2 * stats.t.sf(np.abs(t_stats), dof)
+    return t_stats, p_values
+
+
+def _two_sample_comparison(moments1: Tuple[int, float, float],
+                           moments2: Tuple[int, float, float]) -> Tuple[float, float, float]:
+    """
+    Student t-test and Cohen's d of two groups from one pooled-variance computation.
+    
+    Args:
+        moments1: (count, mean, variance) of the first group
+        moments2: (count, mean, variance) of the second group
+        
+    Returns:
+        Tuple of (t statistic, two-sided p-value, Cohen's d)
+    """
+    mean_diff, pooled_std, dof = _pooled_stats(moments1, moments2)
+    n1, n2 = np.float64(moments1[0]), np.float64(moments2[0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cohens_d = mean_diff / pooled_std
+        t_stat = cohens_d / np.sqrt(1 / n1 + 1 / n2)
+    return t_stat, 2 * stats.t.sf(np.abs(t_stat), dof), cohens_d
+
+
+def _paired_t_test(differences: np.ndarray) -> Tuple[float, float]:
+    """
+    Paired t-test (as scipy.stats.ttest_rel) from the paired differences.
+    
+    Args:
+        differences: Per-pair differences (NaN-free)
+        
+    Returns:
+        Tuple of (t statistic, two-sided p-value)
+    """
+    n, mean, var = _moments(differences)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = np.float64(mean) / np.sqrt(var / np.float64(n))
+    return t_stat, 2 * stats.t.sf(np.abs(t_stat), n - 1)
+
+
+def _describe_onsets(onsets: np.ndarray, moments: Tuple[int, float, float] = None) -> Dict:
+    """
+    Count, mean, std and median of a NaN-free onset array.
+    
+    Args:
+        onsets: Stimulus onsets of one group
+        moments: Precomputed _moments(onsets), if already available
+        
+    Returns:
+        Dictionary of descriptive statistics (NaN where undefined)
+    """
+    n, mean, var = moments if moments is not None else _moments(onsets)
+    return {
+        'n': n,
+        'mean': mean,
+        'std': float(np.sqrt(var)),
+        'median': float(np.median(onsets)) if n else np.nan
+    }
+
+
+def _weighted_rss(design: np.ndarray, counts: np.ndarray, means: np.ndarray) -> Tuple[float, int]:
+    """
+    Between-cell residual sum of squares of a linear model fitted to cell means.
+    
+    Fitting cell means weighted by cell counts gives the same coefficients as fitting
+    the individual observations; the within-cell sum of squares is common to every model.
+    
+    Args:
+        design: (n_cells, n_params) design matrix over the non-empty cells
+        counts: Observations per cell
+        means: Mean per cell
+    
+    Returns:
+        Tuple of (residual sum of squares beyond the within-cell part, model rank)
+    """
+    weights = np.sqrt(counts)
+    coef, _, rank, _ = np.linalg.lstsq(design * weights[:, None], means * weights, rcond=None)
+    return float(np.sum(counts * (means - design @ coef) ** 2)), int(rank)
+
+
+def _two_way_anova(a_codes: np.ndarray, b_codes: np.ndarray, values: np.ndarray) -> Optional[Dict]:
+    """
+    Two-way between-subjects ANOVA with Type II sums of squares.
+    
+    Works from per-cell counts, means and within-cell sums of squares, so the cost
+    beyond the single pass over the observations is independent of the trial count.
+    Unbalanced designs and empty cells are handled through the model ranks.
+    
+    Args:
+        a_codes: Non-negative integer level codes of factor A
+        b_codes: Non-negative integer level codes of factor B
+        values: Dependent variable (NaN-free), aligned with the codes
+    
+    Returns:
+        Dictionary keyed 'A', 'B', 'A:B' and 'residual' with sum_sq, df, F and p_value,
+        or None when either factor has fewer than two levels or no residual df remains
+    """
+    _, a_idx = np.unique(a_codes, return_inverse=True)
+    _, b_idx = np.unique(b_codes, return_inverse=True)
+    n_a, n_b = int(a_idx.max(initial=-1)) + 1, int(b_idx.max(initial=-1)) + 1
+    if n_a < 2 or n_b < 2:
+        return None
+    
+    cell = a_idx * n_b + b_idx
+    counts = np.bincount(cell, minlength=n_a * n_b).astype(np.float64)
+    sums = np.bincount(cell, weights=values, minlength=n_a * n_b)
+    present = counts > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+    ss_within = float(np.sum((values - means[cell]) ** 2))
+    
+    # Treatment-coded design columns over the non-empty cells only
+    cell_a, cell_b = np.divmod(np.flatnonzero(present), n_b)
+    counts, means = counts[present], means[present]
+    intercept = np.ones((cell_a.size, 1))
+    dummies_a = (cell_a[:, None] == np.arange(1, n_a)).astype(np.float64)
+    dummies_b = (cell_b[:, None] == np.arange(1, n_b)).astype(np.float64)
+    dummies_ab = (dummies_a[:, :, None] * dummies_b[:, None, :]).reshape(cell_a.size, -1)
+    
+    rss_a, rank_a = _weighted_rss(np.hstack([intercept, dummies_a]), counts, means)
+    rss_b, rank_b = _weighted_rss(np.hstack([intercept, dummies_b]), counts, means)
+    rss_main, rank_main = _weighted_rss(np.hstack([intercept, dummies_a, dummies_b]), counts, means)
+    rss_full, rank_full = _weighted_rss(np.hstack([intercept, dummies_a, dummies_b, dummies_ab]),
+                                        counts, means)
+    
+    df_within = values.size - rank_full
+    if df_within <= 0:
+        return None
+    
+    terms = {
+        'A': (rss_b - rss_main, rank_main - rank_b),
+        'B': (rss_a - rss_main, rank_main - rank_a),
+        'A:B': (rss_main - rss_full, rank_full - rank_main),
+    }
+    mean_sq_within = ss_within / df_within
+    table = {}
+    for term, (sum_sq, df) in terms.items():
+        sum_sq = max(sum_sq, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f_stat = np.float64(sum_sq / df if df else np.nan) / mean_sq_within
+        table[term] = {
+            'sum_sq': sum_sq,
+            'df': df,
+            'F': float(f_stat),
+            'p_value': float(stats.f.sf(f_stat, df, df_within)) if df else np.nan
+        }
+    table['residual'] = {'sum_sq': ss_within, 'df': df_within}
+    return table
 
 
 class StatisticalAnalyzer:
@@ -40,12 +429,14 @@ class StatisticalAnalyzer:
         """
         Initialize the StatisticalAnalyzer.
         
+        The DataFrame is referenced, not copied; StatisticalAnalyzer only reads it.
+        
         Args:
             data_path: Path to processed data file (CSV or Excel)
             df: Pre-loaded DataFrame (alternative to data_path)
         """
         if df is not None:
-            self.df = df.copy()
+            self.df = df
         elif data_path is not None:
             self.df = self._load_data(data_path)
         else:
@@ -55,22 +446,90 @@ class StatisticalAnalyzer:
         self.results = {}
         self.effect_sizes = {}
         
+        # Columnar arrays and masks shared by every analysis (computed once); labels are
+        # compared as integer category codes rather than as strings
+        self._store = _ColumnStore.from_frame(self.df)
+        stim_class = self._store.stim_class
+        self._is_tool = stim_class <= _SCR_TOOL
+        self._is_shape = (stim_class == _STANDARD_SHAPE) | (stim_class == _SCR_SHAPE)
+        self._cond_masks = {condition: self._store.cond_codes == code
+                            for code, condition in enumerate(self._store.categories['condition'])}
+        
+        # Distinct labels in order of first appearance, as Series.unique() reports them
+        self._conditions = tuple(self._store.distinct('condition'))
+        self._stim_types = tuple(self._store.distinct('stimulus_type'))
+        self._n_participants = self._store.count_distinct('participant_id')
+        
+        # Memoized trial selections and comparison results (the report reuses many of them)
+        self._stimulus_masks = {}
+        self._selection_masks = {}
+        self._cmp_cache = {}
+        
         logger.info(f"Initialized StatisticalAnalyzer with {len(self.df)} trials")
     
     def _load_data(self, data_path: str) -> pd.DataFrame:
-        """Load data from file."""
+        """Load the analysis columns from file, with label columns as categoricals."""
         data_path = Path(data_path)
         
         if data_path.suffix == '.csv':
-            df = pd.read_csv(data_path)
+            header = pd.read_csv(data_path, nrows=0).columns
+            usecols = [column for column in _ANALYSIS_COLUMNS if column in header]
+            df = pd.read_csv(data_path, usecols=usecols,
+                             dtype={column: 'category' for column in _CATEGORICAL_COLUMNS if column in usecols},
+                             engine='pyarrow' if _HAS_PYARROW else 'c')
         elif data_path.suffix in ['.xlsx', '.xls']:
-            df = pd.read_excel(data_path)
+            df = pd.read_excel(data_path, usecols=lambda column: column in _ANALYSIS_COLUMNS,
+                               engine='calamine' if _HAS_CALAMINE else None)
+            # Label columns are compared many times per analysis; store them as categoricals
+            df = df.astype({column: 'category' for column in _CATEGORICAL_COLUMNS if column in df.columns})
         else:
             raise ValueError(f"Unsupported file format: {data_path.suffix}")
         
+        # Onsets are held as float32 (half the bytes per scan); moments accumulate in float64
+        if 'stimulus_onset' in df.columns:
+            df['stimulus_onset'] = pd.to_numeric(df['stimulus_onset'], errors='coerce', downcast='float')
+        
         logger.info(f"Loaded data from {data_path}: {len(df)} trials")
         return df
     
+    def _condition_mask(self, condition: str) -> np.ndarray:
+        """Boolean trial mask for a condition (cached for conditions present in the data)."""
+        mask = self._cond_masks.get(condition)
+        if mask is None:
+            mask = np.zeros(len(self._store), dtype=bool)
+        return mask
+    
+    def _stimulus_codes(self, stimulus_types) -> np.ndarray:
+        """Category codes of the given stimulus labels (labels absent from the data are dropped)."""
+        codes = self._store.categories['stimulus_type'].get_indexer(list(stimulus_types))
+        return codes[codes >= 0]
+    
+    def _count_participants(self, mask: np.ndarray) -> int:
+        """Number of distinct participants among the masked trials."""
+        return self._store.count_distinct('participant_id', mask)
+    
+    def _selection_mask(self, selection: Tuple) -> np.ndarray:
+        """Boolean trial mask for a _selection() (cached)."""
+        mask = self._selection_masks.get(selection)
+        if mask is None:
+            stimulus_classes, conditions, exclude_conditions = selection
+            mask = np.ones(len(self._store), dtype=bool)
+            if stimulus_classes is not None:
+                stimulus_mask = self._stimulus_masks.get(stimulus_classes)
+                if stimulus_mask is None:
+                    stimulus_mask = np.zeros(len(self._store), dtype=bool)
+                    for stimulus_class in stimulus_classes:
+                        stimulus_mask |= self._store.stim_class == stimulus_class
+                    self._stimulus_masks[stimulus_classes] = stimulus_mask
+                mask &= stimulus_mask
+            if conditions is not None:
+                in_conditions = np.zeros(len(self._store), dtype=bool)
+                for condition in conditions:
+                    in_conditions |= self._condition_mask(condition)
+                mask &= ~in_conditions if exclude_conditions else in_conditions
+            self._selection_masks[selection] = mask
+        return mask
+    
     def compare_tools_vs_shapes(self, condition: str = None) -> Dict:
         """
         Compare tools vs shapes across all tasks or specific condition.
@@ -81,55 +540,116 @@ class StatisticalAnalyzer:
         Returns:
             Dictionary with statistical results
         """
-        logger.info(f"Comparing tools vs shapes for condition: {condition}")
+        cache_key = ('tools_vs_shapes', condition)
+        if cache_key in self._cmp_cache:
+            return self._cmp_cache[cache_key]
         
-        # Filter data
+        # Combine the cached masks instead of filtering (and copying) the frame
+        is_tool = self._is_tool
+        is_shape = self._is_shape
         if condition:
-            data = self.df[self.df['condition'] == condition].copy()
-        else:
-            data = self.df.copy()
+            condition_mask = self._condition_mask(condition)
+            is_tool = is_tool & condition_mask
+            is_shape = is_shape & condition_mask
         
-        # Define tool and shape categories (handle case variations)
-        tool_categories = ['tool', 'SCRtool']
-        shape_categories = ['Shape', 'SCRshape', 'shape']  # Include both cases
+        results = self._tools_vs_shapes(condition, np.flatnonzero(is_tool), np.flatnonzero(is_shape))
+        self._cmp_cache[cache_key] = results
+        return results
+    
+    def _map_conditions(self, func, items: List) -> List:
+        """
+        Apply a per-condition analysis to each item, on a thread pool for large datasets.
         
-        # Create binary categories
-        data['is_tool'] = data['stimulus_type'].isin(tool_categories)
-        data['is_shape'] = data['stimulus_type'].isin(shape_categories)
+        Args:
+            func: Analysis taking one item
+            items: Per-condition work items
+            
+        Returns:
+            List of results, in item order
+        """
+        if len(items) < 2 or len(self._store) < _PARALLEL_MIN_TRIALS:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(len(items), os.cpu_count() or 1)) as executor:
+            return list(executor.map(func, items))
+    
+    def _tools_vs_shapes_by_condition(self) -> Dict:
+        """
+        Tools vs shapes comparison for every condition from a single partition of the trials.
         
-        # Filter to only include tool/shape trials
-        analysis_data = data[data['is_tool'] | data['is_shape']].copy()
+        Returns:
+            Dictionary mapping each condition to its compare_tools_vs_shapes() result
+        """
+        # Sort tool/shape trials by condition once; each condition is then a contiguous slice
+        cond_codes = self._store.cond_codes
+        cond_categories = self._store.categories['condition']
+        rows = np.flatnonzero((self._is_tool | self._is_shape) & (cond_codes >= 0))
+        rows = rows[np.argsort(cond_codes[rows], kind='stable')]
+        bounds = np.searchsorted(cond_codes[rows], np.arange(len(cond_categories) + 1))
+        
+        def analyze(code: int) -> Dict:
+            cond_rows = rows[bounds[code]:bounds[code + 1]]
+            is_tool = self._is_tool[cond_rows]
+            return self._tools_vs_shapes(cond_categories[code], cond_rows[is_tool], cond_rows[~is_tool])
+        
+        pending = [code for code, condition in enumerate(cond_categories)
+                   if ('tools_vs_shapes', condition) not in self._cmp_cache]
+        for code, result in zip(pending, self._map_conditions(analyze, pending)):
+            self._cmp_cache[('tools_vs_shapes', cond_categories[code])] = result
+        
+        return {condition: self._cmp_cache[('tools_vs_shapes', condition)] for condition in cond_categories}
+    
+    def _tools_vs_shapes(self, condition: Optional[str], tool_rows: np.ndarray,
+                         shape_rows: np.ndarray) -> Dict:
+        """
+        Tools vs shapes comparison over the given trial positions.
+        
+        Args:
+            condition: Condition label reported in the results
+            tool_rows: Positions of the tool trials
+            shape_rows: Positions of the shape trials
+            
+        Returns:
+            Dictionary with statistical results
+        """
+        logger.info(f"Comparing tools vs shapes for condition: {condition}")
         
-        if len(analysis_data) == 0:
+        n_tools = len(tool_rows)
+        n_shapes = len(shape_rows)
+        if n_tools + n_shapes == 0:
             logger.info("No tool/shape data found for analysis")
             return {'error': 'No tool/shape data found'}
         
+        analysis_rows = np.concatenate([tool_rows, shape_rows])
+        pid_codes = self._store.pid_codes[analysis_rows]
         results = {
             'analysis_type': 'tools_vs_shapes',
             'condition': condition,
-            'n_trials': len(analysis_data),
-            'n_tools': len(analysis_data[analysis_data['is_tool']]),
-            'n_shapes': len(analysis_data[analysis_data['is_shape']]),
-            'participants': analysis_data['participant_id'].nunique()
-        }
-        
-        # Descriptive statistics
-        tool_stats = analysis_data[analysis_data['is_tool']].describe()
-        shape_stats = analysis_data[analysis_data['is_shape']].describe()
-        
-        results['descriptive_stats'] = {
-            'tools': tool_stats.to_dict(),
-            'shapes': shape_stats.to_dict()
+            'n_trials': n_tools + n_shapes,
+            'n_tools': n_tools,
+            'n_shapes': n_shapes,
+            'participants': int(np.count_nonzero(np.bincount(pid_codes[pid_codes >= 0])))
         }
         
         # Statistical tests
-        if 'stimulus_onset' in analysis_data.columns:
-            tool_onsets = analysis_data[analysis_data['is_tool']]['stimulus_onset'].dropna()
-            shape_onsets = analysis_data[analysis_data['is_shape']]['stimulus_onset'].dropna()
+        onset, onset_ok = self._store.onset, self._store.onset_ok
+        if onset is not None:
+            tool_onsets = onset[tool_rows[onset_ok[tool_rows]]]
+            shape_onsets = onset[shape_rows[onset_ok[shape_rows]]]
+            
+            # One moments pass per group feeds both the descriptives and the effect size
+            tool_moments = _moments(tool_onsets)
+            shape_moments = _moments(shape_onsets)
+            
+            # Descriptive statistics
+            results['descriptive_stats'] = {
+                'tools': _describe_onsets(tool_onsets, tool_moments),
+                'shapes': _describe_onsets(shape_onsets, shape_moments)
+            }
             
             if len(tool_onsets) > 0 and len(shape_onsets) > 0:
-                # Independent t-test
-                t_stat, p_value = ttest_ind(tool_onsets, shape_onsets)
+                # Independent t-test (closed form from the moments; no warnings state touched,
+                # so conditions can be analyzed on worker threads)
+                t_stat, p_value, cohens_d = _two_sample_comparison(tool_moments, shape_moments)
                 results['t_test'] = {
                     't_statistic': t_stat,
                     'p_value': p_value,
@@ -137,10 +657,6 @@ class StatisticalAnalyzer:
                 }
                 
                 # Effect size (Cohen's d)
-                pooled_std = np.sqrt(((len(tool_onsets) - 1) * tool_onsets.std()**2 + 
-                                    (len(shape_onsets) - 1) * shape_onsets.std()**2) / 
-                                   (len(tool_onsets) + len(shape_onsets) - 2))
-                cohens_d = (tool_onsets.mean() - shape_onsets.mean()) / pooled_std
                 results['effect_size'] = {
                     'cohens_d': cohens_d,
                     'interpretation': self._interpret_cohens_d(cohens_d)
@@ -148,6 +664,13 @@ class StatisticalAnalyzer:
         
         # Within-subject analysis if multiple participants
         if results['participants'] > 1:
+            known = pid_codes >= 0
+            analysis_data = pd.DataFrame({
+                'participant_id': pid_codes[known],
+                'is_tool': self._is_tool[analysis_rows[known]]
+            })
+            if onset is not None:
+                analysis_data['stimulus_onset'] = onset[analysis_rows[known]]
             within_subject_results = self._within_subject_analysis(analysis_data, 'is_tool')
             results['within_subject'] = within_subject_results
         
@@ -164,73 +687,81 @@ class StatisticalAnalyzer:
         Returns:
             Dictionary with statistical results
         """
+        cache_key = ('task_conditions', stimulus_type)
+        if cache_key in self._cmp_cache:
+            return self._cmp_cache[cache_key]
+        
         logger.info(f"Comparing task conditions for stimulus type: {stimulus_type}")
         
-        # Filter data
+        # Trials of the requested stimulus type (all trials when None)
         if stimulus_type:
-            data = self.df[self.df['stimulus_type'] == stimulus_type].copy()
+            type_mask = np.isin(self._store.stype_codes, self._stimulus_codes((stimulus_type,)))
         else:
-            data = self.df.copy()
+            type_mask = np.ones(len(self._store), dtype=bool)
         
         # Get unique conditions
-        conditions = data['condition'].unique()
+        conditions = self._store.distinct('condition', type_mask)
         results = {
             'analysis_type': 'task_conditions',
             'stimulus_type': stimulus_type,
             'conditions': list(conditions),
-            'n_trials': len(data),
-            'participants': data['participant_id'].nunique()
+            'n_trials': int(np.count_nonzero(type_mask)),
+            'participants': self._count_participants(type_mask)
         }
         
         if len(conditions) < 2:
             logger.info("Need at least 2 conditions for comparison")
             return {'error': 'Need at least 2 conditions for comparison'}
         
-        # Descriptive statistics by condition
-        condition_stats = {}
-        for condition in conditions:
-            cond_data = data[data['condition'] == condition]
-            condition_stats[condition] = cond_data.describe().to_dict()
+        # Onsets of each condition, extracted once and reused by every test below
+        condition_onsets = {}
+        onset, onset_ok = self._store.onset, self._store.onset_ok
+        if onset is not None:
+            for condition in conditions:
+                condition_onsets[condition] = onset[type_mask & self._condition_mask(condition) & onset_ok]
         
-        results['descriptive_stats'] = condition_stats
+        # Descriptive statistics by condition
+        results['descriptive_stats'] = {condition: _describe_onsets(onsets)
+                                        for condition, onsets in condition_onsets.items()}
         
         # Statistical tests
-        if 'stimulus_onset' in data.columns:
+        if condition_onsets:
             # Prepare data for ANOVA
-            condition_groups = []
-            for condition in conditions:
-                group_data = data[data['condition'] == condition]['stimulus_onset'].dropna()
-                if len(group_data) > 0:
-                    condition_groups.append(group_data)
+            condition_groups = [onsets.astype(np.float64, copy=False)
+                                for onsets in condition_onsets.values() if len(onsets) > 0]
             
             if len(condition_groups) >= 2:
                 # One-way ANOVA
-                f_stat, p_value = f_oneway(*condition_groups)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    f_stat, p_value = f_oneway(*condition_groups)
                 results['anova'] = {
                     'f_statistic': f_stat,
                     'p_value': p_value,
                     'significant': p_value < 0.05
                 }
                 
-                # Post-hoc pairwise comparisons
+                # Post-hoc pairwise comparisons, all pairs tested in one vectorized pass
+                pairs = [(cond1, cond2) for cond1, cond2 in combinations(conditions, 2)
+                         if len(condition_onsets[cond1]) > 0 and len(condition_onsets[cond2]) > 0]
+                moments = {condition: _moments(onsets) for condition, onsets in condition_onsets.items()}
+                t_stats, p_values = _student_t_tests(
+                    np.array([moments[cond1] for cond1, _ in pairs], dtype=np.float64).reshape(-1, 3),
+                    np.array([moments[cond2] for _, cond2 in pairs], dtype=np.float64).reshape(-1, 3)
+                )
+                
                 pairwise_results = {}
-                for i, cond1 in enumerate(conditions):
-                    for j, cond2 in enumerate(conditions):
-                        if i < j:
-                            group1 = data[data['condition'] == cond1]['stimulus_onset'].dropna()
-                            group2 = data[data['condition'] == cond2]['stimulus_onset'].dropna()
-                            
-                            if len(group1) > 0 and len(group2) > 0:
-                                t_stat, p_val = ttest_ind(group1, group2)
-                                pairwise_results[f"{cond1}_vs_{cond2}"] = {
-                                    't_statistic': t_stat,
-                                    'p_value': p_val,
-                                    'significant': p_val < 0.05
-                                }
+                for (cond1, cond2), t_stat, p_val in zip(pairs, t_stats, p_values):
+                    pairwise_results[f"{cond1}_vs_{cond2}"] = {
+                        't_statistic': t_stat,
+                        'p_value': p_val,
+                        'significant': p_val < 0.05
+                    }
                 
                 results['pairwise_comparisons'] = pairwise_results
         
         logger.info(f"Task conditions analysis complete: {len(conditions)} conditions compared")
+        self._cmp_cache[cache_key] = results
         return results
     
     def analyze_motor_activation(self) -> Dict:
@@ -243,26 +774,27 @@ class StatisticalAnalyzer:
         logger.info("Analyzing motor activation patterns")
         
         # Focus on conditions that involve motor tasks
-        motor_conditions = ['active_grasp', 'imagined_grasp', 'clench']
-        motor_data = self.df[self.df['condition'].isin(motor_conditions)].copy()
+        motor = _selection(conditions=_MOTOR_CONDITIONS)
+        motor_mask = self._selection_mask(motor)
+        n_motor = int(np.count_nonzero(motor_mask))
         
-        if len(motor_data) == 0:
+        if n_motor == 0:
             logger.info("No motor condition data found")
             return {'error': 'No motor condition data found'}
         
         results = {
             'analysis_type': 'motor_activation',
-            'motor_conditions': list(motor_data['condition'].unique()),
-            'n_trials': len(motor_data),
-            'participants': motor_data['participant_id'].nunique()
+            'motor_conditions': self._store.distinct('condition', motor_mask),
+            'n_trials': n_motor,
+            'participants': self._count_participants(motor_mask)
         }
         
         # Compare motor vs non-motor conditions
-        non_motor_data = self.df[~self.df['condition'].isin(motor_conditions)].copy()
+        non_motor = _selection(conditions=_MOTOR_CONDITIONS, exclude_conditions=True)
         
-        if len(non_motor_data) > 0:
+        if self._selection_mask(non_motor).any():
             motor_vs_non_motor = self._compare_groups(
-                motor_data, non_motor_data, 
+                motor, non_motor, 
                 'Motor Conditions', 'Non-Motor Conditions'
             )
             results['motor_vs_non_motor'] = motor_vs_non_motor
@@ -272,9 +804,9 @@ class StatisticalAnalyzer:
         results['within_motor_conditions'] = motor_condition_comparison
         
         # Tool-specific motor analysis
-        tool_motor_data = motor_data[motor_data['stimulus_type'].isin(['tool', 'SCRtool'])]
-        if len(tool_motor_data) > 0:
-            tool_motor_results = self._analyze_tool_motor_patterns(tool_motor_data)
+        tool_motor_mask = self._selection_mask(_selection(_TOOL_CLASSES, _MOTOR_CONDITIONS))
+        if tool_motor_mask.any():
+            tool_motor_results = self._analyze_tool_motor_patterns(tool_motor_mask)
             results['tool_motor_patterns'] = tool_motor_results
         
         logger.info("Motor activation analysis complete")
@@ -289,44 +821,48 @@ class StatisticalAnalyzer:
         """
         logger.info("Analyzing functional vs structural differences")
         
-        # Define functional and structural categories
-        functional_categories = ['tool', 'SCRtool']  # Functional tools
-        structural_categories = ['Shape', 'SCRshape', 'shape']  # Neutral shapes (handle case variations)
-        
-        # Filter data
-        functional_data = self.df[self.df['stimulus_type'].isin(functional_categories)].copy()
-        structural_data = self.df[self.df['stimulus_type'].isin(structural_categories)].copy()
+        # Functional tools and neutral shapes (handle case variations)
+        functional = _selection(_TOOL_CLASSES)
+        structural = _selection(_SHAPE_CLASSES)
+        functional_n = int(np.count_nonzero(self._selection_mask(functional)))
+        structural_n = int(np.count_nonzero(self._selection_mask(structural)))
         
         results = {
             'analysis_type': 'functional_vs_structural',
-            'functional_n': len(functional_data),
-            'structural_n': len(structural_data),
-            'participants': self.df['participant_id'].nunique()
+            'functional_n': functional_n,
+            'structural_n': structural_n,
+            'participants': self._n_participants
         }
         
-        if len(functional_data) == 0 or len(structural_data) == 0:
+        if functional_n == 0 or structural_n == 0:
             logger.info("Insufficient data for functional vs structural analysis")
             return {'error': 'Insufficient data for functional vs structural analysis'}
         
         # Compare functional vs structural
         comparison_results = self._compare_groups(
-            functional_data, structural_data,
+            functional, structural,
             'Functional Tools', 'Structural Shapes'
         )
         results['comparison'] = comparison_results
         
-        # Analyze across different conditions
-        condition_results = {}
-        for condition in self.df['condition'].unique():
-            cond_functional = functional_data[functional_data['condition'] == condition]
-            cond_structural = structural_data[structural_data['condition'] == condition]
+        # Analyze across different conditions (independent comparisons, mapped over conditions)
+        comparable = []
+        for condition in self._conditions:
+            cond_functional = _selection(_TOOL_CLASSES, (condition,))
+            cond_structural = _selection(_SHAPE_CLASSES, (condition,))
             
-            if len(cond_functional) > 0 and len(cond_structural) > 0:
-                cond_comparison = self._compare_groups(
-                    cond_functional, cond_structural,
-                    f'Functional ({condition})', f'Structural ({condition})'
-                )
-                condition_results[condition] = cond_comparison
+            if self._selection_mask(cond_functional).any() and self._selection_mask(cond_structural).any():
+                comparable.append((condition, cond_functional, cond_structural))
+        
+        def compare(item: Tuple) -> Dict:
+            condition, cond_functional, cond_structural = item
+            return self._compare_groups(
+                cond_functional, cond_structural,
+                f'Functional ({condition})', f'Structural ({condition})'
+            )
+        
+        condition_results = {item[0]: comparison
+                             for item, comparison in zip(comparable, self._map_conditions(compare, comparable))}
         
         results['by_condition'] = condition_results
         
@@ -352,22 +888,25 @@ class StatisticalAnalyzer:
         overall_comparison = self.compare_tools_vs_shapes()
         results['analyses']['overall_tools_vs_shapes'] = overall_comparison
         
-        # By condition analysis
-        for condition in self.df['condition'].unique():
-            cond_comparison = self.compare_tools_vs_shapes(condition)
+        # By condition analysis (trials are partitioned by condition once for all conditions)
+        by_condition = self._tools_vs_shapes_by_condition()
+        for condition in self._conditions:
+            cond_comparison = by_condition.get(condition)
+            if cond_comparison is None:
+                cond_comparison = self.compare_tools_vs_shapes(condition)
             results['analyses'][f'tools_vs_shapes_{condition}'] = cond_comparison
         
         # Screen-optimized vs standard stimuli
-        scr_tools = self.df[self.df['stimulus_type'] == 'SCRtool']
-        scr_shapes = self.df[self.df['stimulus_type'] == 'SCRshape']
-        standard_tools = self.df[self.df['stimulus_type'] == 'tool']
-        standard_shapes = self.df[self.df['stimulus_type'].isin(['Shape', 'shape'])]
+        scr_tools = _selection((_SCR_TOOL,))
+        scr_shapes = _selection((_SCR_SHAPE,))
+        standard_tools = _selection((_STANDARD_TOOL,))
+        standard_shapes = _selection((_STANDARD_SHAPE,))
         
-        if len(scr_tools) > 0 and len(scr_shapes) > 0:
+        if self._selection_mask(scr_tools).any() and self._selection_mask(scr_shapes).any():
             scr_comparison = self._compare_groups(scr_tools, scr_shapes, 'SCR Tools', 'SCR Shapes')
             results['analyses']['screen_optimized_tools_vs_shapes'] = scr_comparison
         
-        if len(standard_tools) > 0 and len(standard_shapes) > 0:
+        if self._selection_mask(standard_tools).any() and self._selection_mask(standard_shapes).any():
             standard_comparison = self._compare_groups(standard_tools, standard_shapes, 'Standard Tools', 'Standard Shapes')
             results['analyses']['standard_tools_vs_shapes'] = standard_comparison
         
@@ -388,26 +927,26 @@ class StatisticalAnalyzer:
         }
         
         # Overall passive vs active comparison
-        passive_data = self.df[self.df['condition'] == 'passive_viewing']
-        active_data = self.df[self.df['condition'] == 'active_grasp']
+        passive = _selection(conditions=('passive_viewing',))
+        active = _selection(conditions=('active_grasp',))
         
-        if len(passive_data) > 0 and len(active_data) > 0:
-            overall_comparison = self._compare_groups(passive_data, active_data, 'Passive Viewing', 'Active Grasp')
+        if self._selection_mask(passive).any() and self._selection_mask(active).any():
+            overall_comparison = self._compare_groups(passive, active, 'Passive Viewing', 'Active Grasp')
             results['analyses']['overall_passive_vs_active'] = overall_comparison
         
         # Tools: Passive vs Active
-        tool_passive = passive_data[passive_data['stimulus_type'].isin(['tool', 'SCRtool'])]
-        tool_active = active_data[active_data['stimulus_type'].isin(['tool', 'SCRtool'])]
+        tool_passive = _selection(_TOOL_CLASSES, ('passive_viewing',))
+        tool_active = _selection(_TOOL_CLASSES, ('active_grasp',))
         
-        if len(tool_passive) > 0 and len(tool_active) > 0:
+        if self._selection_mask(tool_passive).any() and self._selection_mask(tool_active).any():
             tool_comparison = self._compare_groups(tool_passive, tool_active, 'Tools Passive', 'Tools Active')
             results['analyses']['tools_passive_vs_active'] = tool_comparison
         
         # Shapes: Passive vs Active
-        shape_passive = passive_data[passive_data['stimulus_type'].isin(['Shape', 'SCRshape', 'shape'])]
-        shape_active = active_data[active_data['stimulus_type'].isin(['Shape', 'SCRshape', 'shape'])]
+        shape_passive = _selection(_SHAPE_CLASSES, ('passive_viewing',))
+        shape_active = _selection(_SHAPE_CLASSES, ('active_grasp',))
         
-        if len(shape_passive) > 0 and len(shape_active) > 0:
+        if self._selection_mask(shape_passive).any() and self._selection_mask(shape_active).any():
             shape_comparison = self._compare_groups(shape_passive, shape_active, 'Shapes Passive', 'Shapes Active')
             results['analyses']['shapes_passive_vs_active'] = shape_comparison
         
@@ -435,17 +974,17 @@ class StatisticalAnalyzer:
         functional_structural_results = self.functional_vs_structural()
         results['analyses']['overall_functional_vs_structural'] = functional_structural_results
         
-        # Standard vs screen-optimized stimuli
-        standard_functional = self.df[self.df['stimulus_type'] == 'tool']
-        standard_structural = self.df[self.df['stimulus_type'].isin(['Shape', 'shape'])]
-        scr_functional = self.df[self.df['stimulus_type'] == 'SCRtool']
-        scr_structural = self.df[self.df['stimulus_type'] == 'SCRshape']
+        # Standard vs screen-optimized stimuli (same selections as RQ1, so comparisons are reused)
+        standard_functional = _selection((_STANDARD_TOOL,))
+        standard_structural = _selection((_STANDARD_SHAPE,))
+        scr_functional = _selection((_SCR_TOOL,))
+        scr_structural = _selection((_SCR_SHAPE,))
         
-        if len(standard_functional) > 0 and len(standard_structural) > 0:
+        if self._selection_mask(standard_functional).any() and self._selection_mask(standard_structural).any():
             standard_comparison = self._compare_groups(standard_functional, standard_structural, 'Standard Functional', 'Standard Structural')
             results['analyses']['standard_functional_vs_structural'] = standard_comparison
         
-        if len(scr_functional) > 0 and len(scr_structural) > 0:
+        if self._selection_mask(scr_functional).any() and self._selection_mask(scr_structural).any():
             scr_comparison = self._compare_groups(scr_functional, scr_structural, 'SCR Functional', 'SCR Structural')
             results['analyses']['scr_functional_vs_structural'] = scr_comparison
         
@@ -454,23 +993,57 @@ class StatisticalAnalyzer:
     
     # Helper methods
     
-    def _compare_groups(self, group1: pd.DataFrame, group2: pd.DataFrame, 
+    def _compare_groups(self, group1: Tuple, group2: Tuple, 
                         group1_name: str, group2_name: str) -> Dict:
-        """Compare two groups statistically."""
+        """
+        Compare two trial selections statistically.
+        
+        The statistics are memoized on the (canonical) selections, so the same pair compared
+        under different names by several research questions is only tested once.
+        
+        Args:
+            group1: First _selection()
+            group2: Second _selection()
+            group1_name: Label of the first group
+            group2_name: Label of the second group
+            
+        Returns:
+            Dictionary with group sizes, t-test, effect size and descriptive statistics
+        """
+        mask1 = self._selection_mask(group1)
+        mask2 = self._selection_mask(group2)
         results = {
             'group1_name': group1_name,
             'group2_name': group2_name,
-            'group1_n': len(group1),
-            'group2_n': len(group2)
+            'group1_n': int(np.count_nonzero(mask1)),
+            'group2_n': int(np.count_nonzero(mask2))
         }
         
-        if 'stimulus_onset' in group1.columns and 'stimulus_onset' in group2.columns:
-            group1_onsets = group1['stimulus_onset'].dropna()
-            group2_onsets = group2['stimulus_onset'].dropna()
+        cache_key = ('groups', group1, group2)
+        comparison = self._cmp_cache.get(cache_key)
+        if comparison is None:
+            comparison = self._compare_onsets(mask1, mask2)
+            self._cmp_cache[cache_key] = comparison
+        results.update(comparison)
+        
+        return results
+    
+    def _compare_onsets(self, mask1: np.ndarray, mask2: np.ndarray) -> Dict:
+        """Two-sample t-test, Cohen's d and descriptives of the onsets of two trial masks."""
+        results = {}
+        
+        onset, onset_ok = self._store.onset, self._store.onset_ok
+        if onset is not None:
+            group1_onsets = onset[mask1 & onset_ok]
+            group2_onsets = onset[mask2 & onset_ok]
             
             if len(group1_onsets) > 0 and len(group2_onsets) > 0:
+                # One moments pass per group, shared by the test, effect size and descriptives
+                group1_moments = _moments(group1_onsets)
+                group2_moments = _moments(group2_onsets)
+                
                 # Independent t-test
-                t_stat, p_value = ttest_ind(group1_onsets, group2_onsets)
+                t_stat, p_value, cohens_d = _two_sample_comparison(group1_moments, group2_moments)
                 results['t_test'] = {
                     't_statistic': t_stat,
                     'p_value': p_value,
@@ -478,10 +1051,6 @@ class StatisticalAnalyzer:
                 }
                 
                 # Effect size
-                pooled_std = np.sqrt(((len(group1_onsets) - 1) * group1_onsets.std()**2 + 
-                                    (len(group2_onsets) - 1) * group2_onsets.std()**2) / 
-                                   (len(group1_onsets) + len(group2_onsets) - 2))
-                cohens_d = (group1_onsets.mean() - group2_onsets.mean()) / pooled_std
                 results['effect_size'] = {
                     'cohens_d': cohens_d,
                     'interpretation': self._interpret_cohens_d(cohens_d)
@@ -490,14 +1059,14 @@ class StatisticalAnalyzer:
                 # Descriptive statistics
                 results['descriptive_stats'] = {
                     'group1': {
-                        'mean': group1_onsets.mean(),
-                        'std': group1_onsets.std(),
-                        'median': group1_onsets.median()
+                        'mean': group1_moments[1],
+                        'std': float(np.sqrt(group1_moments[2])),
+                        'median': float(np.median(group1_onsets))
                     },
                     'group2': {
-                        'mean': group2_onsets.mean(),
-                        'std': group2_onsets.std(),
-                        'median': group2_onsets.median()
+                        'mean': group2_moments[1],
+                        'std': float(np.sqrt(group2_moments[2])),
+                        'median': float(np.median(group2_onsets))
                     }
                 }
         
@@ -507,78 +1076,78 @@ class StatisticalAnalyzer:
         """Perform within-subject analysis."""
         results = {}
         
-        if data['participant_id'].nunique() > 1:
-            # Paired t-test for within-subject comparison
-            participants = data['participant_id'].unique()
-            
-            group1_means = []
-            group2_means = []
+        if data['participant_id'].nunique() > 1 and 'stimulus_onset' in data.columns:
+            # Per-participant means of both groups in one groupby pass
+            means = (data.groupby(['participant_id', grouping_var], observed=True, sort=False)['stimulus_onset']
+                     .mean().unstack(grouping_var))
             
-            for participant in participants:
-                participant_data = data[data['participant_id'] == participant]
-                group1_data = participant_data[participant_data[grouping_var] == True]
-                group2_data = participant_data[participant_data[grouping_var] == False]
-                
-                if len(group1_data) > 0 and len(group2_data) > 0:
-                    if 'stimulus_onset' in group1_data.columns:
-                        group1_means.append(group1_data['stimulus_onset'].mean())
-                        group2_means.append(group2_data['stimulus_onset'].mean())
-            
-            if len(group1_means) > 1 and len(group2_means) > 1:
-                t_stat, p_value = ttest_rel(group1_means, group2_means)
-                results['paired_t_test'] = {
-                    't_statistic': t_stat,
-                    'p_value': p_value,
-                    'significant': p_value < 0.05,
-                    'n_participants': len(group1_means)
-                }
+            if True in means.columns and False in means.columns:
+                # Paired t-test over participants with data in both groups
+                group1_means = means[True].to_numpy(dtype=np.float64)
+                group2_means = means[False].to_numpy(dtype=np.float64)
+                paired = ~(np.isnan(group1_means) | np.isnan(group2_means))
+                if np.count_nonzero(paired) > 1:
+                    t_stat, p_value = _paired_t_test(group1_means[paired] - group2_means[paired])
+                    results['paired_t_test'] = {
+                        't_statistic': t_stat,
+                        'p_value': p_value,
+                        'significant': p_value < 0.05,
+                        'n_participants': int(np.count_nonzero(paired))
+                    }
         
         return results
     
-    def _analyze_tool_motor_patterns(self, tool_motor_data: pd.DataFrame) -> Dict:
-        """Analyze motor patterns specific to tools."""
+    def _analyze_tool_motor_patterns(self, tool_motor_mask: np.ndarray) -> Dict:
+        """Analyze motor patterns specific to tools (trials given as a boolean mask)."""
         results = {
             'analysis_type': 'tool_motor_patterns',
-            'n_trials': len(tool_motor_data)
+            'n_trials': int(np.count_nonzero(tool_motor_mask))
         }
         
         # Compare different motor conditions for tools
-        motor_conditions = tool_motor_data['condition'].unique()
-        if len(motor_conditions) > 1:
+        if self._store.count_distinct('condition', tool_motor_mask) > 1:
             condition_comparison = self.compare_task_conditions()
             results['motor_condition_comparison'] = condition_comparison
         
         return results
     
     def _analyze_interaction_effects(self) -> Dict:
-        """Analyze interaction effects between stimulus type and condition."""
+        """Two-way ANOVA of onsets by stimulus category (tool/shape) and condition."""
         results = {'analysis_type': 'interaction_effects'}
         
-        # Create interaction variable
-        interaction_data = self.df.copy()
-        interaction_data['stimulus_category'] = interaction_data['stimulus_type'].apply(
-            lambda x: 'tool' if x in ['tool', 'SCRtool'] else 'shape'
-        )
-        
-        # Two-way ANOVA (simplified)
-        if len(interaction_data) > 0:
-            # This is a simplified interaction analysis
-            # In a full implementation, you would use statsmodels or similar
-            results['note'] = 'Simplified interaction analysis - full implementation would use two-way ANOVA'
+        if self._store.onset is None:
+            results['n_trials'] = 0
+            results['note'] = 'Insufficient data for a two-way ANOVA'
+            return results
+        
+        rows = ((self._is_tool | self._is_shape) & self._store.onset_ok
+                & (self._store.cond_codes >= 0))
+        table = _two_way_anova(self._is_tool[rows].astype(np.int8),
+                               self._store.cond_codes[rows],
+                               self._store.onset[rows])
+        results['n_trials'] = int(np.count_nonzero(rows))
+        if table is None:
+            results['note'] = 'Insufficient data for a two-way ANOVA'
+            return results
+        
+        names = {'A': 'stimulus_category', 'B': 'condition', 'A:B': 'stimulus_category:condition'}
+        results['anova_table'] = {names.get(term, term): row for term, row in table.items()}
+        interaction = table['A:B']
+        results['anova'] = {
+            'f_statistic': interaction['F'],
+            'p_value': interaction['p_value'],
+            'significant': bool(interaction['p_value'] < 0.05)
+        }
         
         return results
     
-    def _interpret_cohens_d(self, d: float) -> str:
-        """Interpret Cohen's d effect size."""
-        abs_d = abs(d)
-        if abs_d < 0.2:
-            return "negligible"
-        elif abs_d < 0.5:
-            return "small"
-        elif abs_d < 0.8:
-            return "medium"
-        else:
-            return "large"
+    def _interpret_cohens_d(self, d: Union[float, np.ndarray]) -> Union[str, np.ndarray]:
+        """Interpret Cohen's d effect size (element-wise for arrays)."""
+        # Index of the first cut above |d|: <0.2 negligible, <0.5 small, <0.8 medium, else large
+        index = np.searchsorted(_COHENS_D_CUTS, np.abs(d), side='right')
+        if np.ndim(index) == 0:
+            return _COHENS_D_LABELS[int(index)]
+        return np.asarray(_COHENS_D_LABELS)[index]
     
     def generate_comprehensive_report(self) -> Dict:
         """Generate comprehensive statistical analysis report."""
@@ -588,9 +1157,9 @@ class StatisticalAnalyzer:
             'report_type': 'comprehensive_statistical_analysis',
             'data_summary': {
                 'total_trials': len(self.df),
-                'participants': self.df['participant_id'].nunique(),
-                'conditions': list(self.df['condition'].unique()),
-                'stimulus_types': list(self.df['stimulus_type'].unique())
+                'participants': self._n_participants,
+                'conditions': list(self._conditions),
+                'stimulus_types': list(self._stim_types)
             },
             'research_questions': {}
         }
@@ -11,6 +11,7 @@ Date: 2024
 
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.patches import Rectangle
@@ -20,9 +21,19 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 from typing import Dict, List, Tuple, Optional, Union
 import logging
+import importlib.util
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 import warnings
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
 # Set up module logger (configured by application)
 logger = logging.getLogger(__name__)
 
@@ -33,6 +44,591 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
 
+# Lower-cased stimulus labels of each plotted stimulus category (any other label is 'Other')
+_TOOL_STIMULI = ('tool', 'scrtool')
+_SHAPE_STIMULI = ('shape', 'scrshape')
+
+# Conditions involving a motor response
+_MOTOR_CONDITIONS = ('active_grasp', 'imagined_grasp', 'clench')
+
+# Timing columns held as float32 (ample for plotting) and label columns held as categoricals
+_FLOAT32_COLUMNS = ('stimulus_onset', 'relative_onset')
+_CATEGORICAL_COLUMNS = ('participant_id', 'condition', 'stimulus_type')
+
+# Columns read from a data file (the plots use no others)
+_PLOT_COLUMNS = _CATEGORICAL_COLUMNS + _FLOAT32_COLUMNS
+
+# Optional faster readers: pyarrow for CSV, python-calamine for Excel (pandas defaults otherwise)
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+_HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+
+def _box_summary(values: np.ndarray) -> np.ndarray:
+    """
+    Lower whisker, quartiles and upper whisker of a boxplot (whiskers at 1.5 IQR).
+    
+    Args:
+        values: NaN-free sample
+        
+    Returns:
+        Array of (low whisker, Q1, median, Q3, high whisker)
+    """
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    fence = 1.5 * (q3 - q1)
+    low = values[values >= q1 - fence].min()
+    high = values[values <= q3 + fence].max()
+    return np.array([low, q1, median, q3, high])
+
+
+def _box_path(position: float, summary: np.ndarray, half_width: float = 0.3) -> np.ndarray:
+    """
+    One polyline tracing a box, its median and both whiskers.
+    
+    Args:
+        position: Box centre on the x axis
+        summary: Output of _box_summary
+        half_width: Half the box width in x units
+        
+    Returns:
+        (2, n_points) array of x and y coordinates
+    """
+    low, q1, median, q3, high = summary
+    left, right = position - half_width, position + half_width
+    return np.array([
+        (position, low), (position, q1), (left, q1), (left, q3), (position, q3),
+        (position, high), (position, q3), (right, q3), (right, median), (left, median),
+        (right, median), (right, q1), (position, q1)
+    ]).T
+
+
+def _segment_std_kernel(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Sample standard deviation of each contiguous segment of an array, skipping NaNs.
+    
+    Each segment is a single pass using Welford's online update.
+    
+    Args:
+        values: Values sorted so that each group is contiguous
+        starts: Start index of each segment
+        ends: End index (exclusive) of each segment
+        
+    Returns:
+        Standard deviation (ddof=1) per segment; NaN with fewer than two values
+    """
+    stds = np.full(starts.shape[0], np.nan)
+    for i in range(starts.shape[0]):
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for j in range(starts[i], ends[i]):
+            value = values[j]
+            if np.isnan(value):
+                continue
+            n += 1
+            delta = value - mean
+            mean += delta / n
+            m2 += delta * (value - mean)
+        if n > 1:
+            stds[i] = np.sqrt(m2 / (n - 1))
+    return stds
+
+
+# JIT-compile the segment kernel when numba is available; otherwise pandas groupby is used
+_segment_std = njit(_segment_std_kernel) if njit is not None else None
+
+
+def _hex_to_rgba(color: str) -> Tuple[int, int, int, int]:
+    """Convert a matplotlib color to an 8-bit RGBA tuple."""
+    return tuple(int(round(channel * 255)) for channel in matplotlib.colors.to_rgba(color))
+
+
+def _onset_std_by_participant(participant_ids: pd.Series, onsets: np.ndarray) -> pd.Series:
+    """Onset standard deviation per participant, indexed by sorted participant ID."""
+    if _segment_std is None:
+        return pd.Series(onsets, index=participant_ids.index, name='stimulus_onset').groupby(
+            participant_ids, observed=True).std()
+    
+    codes, participants = pd.factorize(participant_ids, sort=True)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    # Contiguous run of each participant in the sorted order (missing IDs, code -1, sort first)
+    group_codes = np.arange(len(participants))
+    starts = np.searchsorted(sorted_codes, group_codes, side='left')
+    ends = np.searchsorted(sorted_codes, group_codes, side='right')
+    stds = _segment_std(onsets.astype(np.float64)[order], starts, ends)
+    return pd.Series(stds, index=pd.Index(participants, name='participant_id'), name='stimulus_onset')
+
+
+@dataclass
+class _PlotData:
+    """
+    Arrays and aggregates shared by the plots, derived from the trial DataFrame in one pass.
+    
+    Column-backed fields are None when the source column is missing; without
+    stimulus_type every trial's category is 'Other'. Subsets of onsets are taken by
+    combining onset_ok with other trial masks rather than by filtering the DataFrame.
+    """
+    n_trials: int
+    onset: Optional[np.ndarray]
+    onset_ok: Optional[np.ndarray]
+    valid_onsets: Optional[np.ndarray]
+    relative_onset: Optional[np.ndarray]
+    category: np.ndarray
+    categorized: np.ndarray
+    category_counts: pd.Series
+    condition: Optional[pd.Categorical]
+    stimulus_type: Optional[pd.Categorical]
+    is_motor: np.ndarray
+    motor_participants: int
+    condition_counts: Optional[pd.Series]
+    stim_counts: Optional[pd.Series]
+    participant_counts: Optional[pd.Series]
+    participant_std: Optional[pd.Series]
+    onset_bin_edges: Optional[np.ndarray]
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> '_PlotData':
+        """
+        Derive every plotted array and aggregate from a DataFrame typed as in DataVisualizer.
+        
+        Args:
+            df: Trial DataFrame with float32 timing and categorical label columns
+            
+        Returns:
+            _PlotData for the DataFrame
+        """
+        columns = df.columns
+        onset = onset_ok = valid_onsets = relative_onset = None
+        if 'stimulus_onset' in columns:
+            onset = df['stimulus_onset'].to_numpy(dtype=np.float32, na_value=np.nan)
+            onset_ok = ~np.isnan(onset)
+            valid_onsets = onset[onset_ok]
+        if 'relative_onset' in columns:
+            relative_onset = df['relative_onset'].to_numpy(dtype=np.float32, na_value=np.nan)
+        
+        # Tool/Shape/Other per trial, mapped once per distinct label rather than per row
+        category = np.full(len(df), 'Other', dtype=object)
+        categorized = np.zeros(len(df), dtype=bool)
+        stimulus_type = stim_counts = None
+        if 'stimulus_type' in columns:
+            stimulus_type = pd.Categorical(df['stimulus_type'])
+            labels = stimulus_type.categories.astype(str).str.lower()
+            label_category = np.where(labels.isin(_TOOL_STIMULI), 'Tool',
+                                      np.where(labels.isin(_SHAPE_STIMULI), 'Shape', 'Other'))
+            category = np.append(label_category, 'Other').astype(object)[stimulus_type.codes]
+            categorized = np.append(label_category != 'Other', False)[stimulus_type.codes]
+            stim_counts = df['stimulus_type'].value_counts()
+        
+        category_counts = pd.Series(category[categorized]).value_counts()
+        
+        condition = condition_counts = None
+        is_motor = np.zeros(len(df), dtype=bool)
+        if 'condition' in columns:
+            condition = pd.Categorical(df['condition'])
+            is_motor = np.isin(condition.codes, np.flatnonzero(condition.categories.isin(_MOTOR_CONDITIONS)))
+            condition_counts = df['condition'].value_counts()
+        
+        participant_counts = participant_std = None
+        motor_participants = 0
+        if 'participant_id' in columns:
+            participants = df['participant_id']
+            participant_counts = participants.value_counts()
+            motor_participants = participants[is_motor].nunique()
+            if onset is not None:
+                participant_std = _onset_std_by_participant(participants, onset)
+        
+        # One set of 20-bin onset edges shared by the overlaid and per-subset histograms
+        onset_bin_edges = None
+        if onset is not None and valid_onsets.size > 0:
+            onset_bin_edges = np.histogram_bin_edges(valid_onsets.astype(np.float64), bins=20)
+        
+        return cls(len(df), onset, onset_ok, valid_onsets, relative_onset, category, categorized,
+                   category_counts, condition, stimulus_type, is_motor, motor_participants, condition_counts, stim_counts,
+                   participant_counts, participant_std, onset_bin_edges)
+
+
+def _annotate_counts(ax: plt.Axes, counts: pd.Series):
+    """Write n=<count> above each category of a categorical x axis, matched by tick label."""
+    counts = {str(label): count for label, count in counts.items()}
+    y = ax.get_ylim()[1] * 0.95
+    for x, tick in zip(ax.get_xticks(), ax.get_xticklabels()):
+        count = counts.get(tick.get_text())
+        if count is not None:
+            ax.text(x, y, f'n={count}', ha='center', va='top', fontsize=10, fontweight='bold')
+
+
+def _subplots(fig: Optional[plt.Figure], nrows: int, ncols: int,
+              figsize: Tuple[float, float]) -> Tuple[plt.Figure, np.ndarray]:
+    """New constrained-layout subplots, or the cleared axes of fig when redrawing it."""
+    if fig is None:
+        return plt.subplots(nrows, ncols, figsize=figsize, layout='constrained')
+    for ax in fig.axes:
+        ax.clear()
+    return fig, np.array(fig.axes).reshape(nrows, ncols).squeeze()
+
+
+def _render_behavioral(data: _PlotData, colors: Dict[str, str], save_path: str = None,
+                       fig: plt.Figure = None) -> plt.Figure:
+    """
+    Behavioral results: onset times by stimulus category and by condition.
+    
+    Args:
+        data: Shared plot arrays
+        colors: Color scheme of DataVisualizer
+        save_path: Optional path to save the figure
+        fig: Figure previously returned by this renderer, to clear and redraw in place
+        
+    Returns:
+        matplotlib Figure object
+    """
+    logger.info("Creating simplified behavioral results plot")
+    
+    fig, axes = _subplots(fig, 1, 2, figsize=(12, 5))
+    fig.suptitle('Behavioral Results: fMRI Tool Representation Study', 
+                 fontsize=16, fontweight='bold')
+    
+    # 1. Stimulus onset times by category (most important)
+    ax1 = axes[0]
+    if data.onset is not None:
+        # Tool and Shape trials only ('Other' is left out of the plot)
+        keep = data.categorized
+        sns.boxplot(x=data.category[keep], y=data.onset[keep], 
+                   ax=ax1, palette=[colors['tools'], colors['shapes']])
+        ax1.set_title('Stimulus Onset Times by Category')
+        ax1.set_xlabel('Stimulus Category')
+        ax1.set_ylabel('Onset Time (s)')
+    
+        # Add sample size annotations
+        _annotate_counts(ax1, data.category_counts)
+    
+    # 2. Stimulus onset times by condition
+    ax2 = axes[1]
+    if data.condition is not None and data.onset is not None:
+        sns.boxplot(x=data.condition, y=data.onset, ax=ax2)
+        ax2.set_title('Stimulus Onset Times by Condition')
+        ax2.set_xlabel('Condition')
+        ax2.set_ylabel('Onset Time (s)')
+        ax2.tick_params(axis='x', rotation=45)
+    
+        # Add sample size annotations
+        _annotate_counts(ax2, data.condition_counts)
+    
+    sns.despine(fig=fig)
+    
+    if save_path:
+        fig.savefig(save_path, dpi=300)
+        logger.info(f"Behavioral results plot saved to {save_path}")
+    
+    return fig
+
+
+def _render_timing(data: _PlotData, colors: Dict[str, str], save_path: str = None,
+                   fig: plt.Figure = None) -> plt.Figure:
+    """
+    Timing analysis: onset distributions, relative onsets and per-participant spread.
+    
+    Args:
+        data: Shared plot arrays
+        colors: Color scheme of DataVisualizer
+        save_path: Optional path to save the figure
+        fig: Figure previously returned by this renderer, to clear and redraw in place
+        
+    Returns:
+        matplotlib Figure object
+    """
+    logger.info("Creating timing analysis plot")
+    
+    fig, axes = _subplots(fig, 2, 2, figsize=(15, 12))
+    fig.suptitle('Timing Analysis: Stimulus Presentation Patterns', 
+                 fontsize=16, fontweight='bold')
+    
+    # 1. Timing distribution
+    ax1 = axes[0, 0]
+    if data.onset is not None:
+        ax1.hist(data.valid_onsets, bins=30, alpha=0.7, 
+                color=colors['tools'], rasterized=True)
+        ax1.set_title('Distribution of Stimulus Onset Times')
+        ax1.set_xlabel('Onset Time (s)')
+        ax1.set_ylabel('Frequency')
+    
+    # 2. Timing by stimulus type
+    ax2 = axes[0, 1]
+    if data.onset is not None and data.stimulus_type is not None:
+        # One grouping pass over the valid onsets instead of a scan per stimulus type
+        for stim_type, stim_data in pd.Series(data.valid_onsets).groupby(
+                data.stimulus_type[data.onset_ok], sort=False, observed=True):
+            ax2.hist(stim_data, alpha=0.6, label=stim_type, bins=data.onset_bin_edges, rasterized=True)
+        ax2.set_title('Timing Distribution by Stimulus Type')
+        ax2.set_xlabel('Onset Time (s)')
+        ax2.set_ylabel('Frequency')
+        ax2.legend()
+    
+    # 3. Relative timing
+    ax3 = axes[1, 0]
+    if data.relative_onset is not None:
+        # Trial indices of the valid points only, so matplotlib has no NaNs to mask out
+        valid = ~np.isnan(data.relative_onset)
+        ax3.scatter(np.flatnonzero(valid), data.relative_onset[valid], 
+                   alpha=0.6, s=20, rasterized=True)
+        ax3.set_title('Relative Onset Times Across Trials')
+        ax3.set_xlabel('Trial Number')
+        ax3.set_ylabel('Relative Onset Time (s)')
+    
+    # 4. Timing consistency
+    ax4 = axes[1, 1]
+    if data.participant_std is not None:
+        participant_timing = data.participant_std
+        ax4.bar(range(len(participant_timing)), participant_timing.values)
+        ax4.set_title('Timing Consistency Across Participants')
+        ax4.set_xlabel('Participant')
+        ax4.set_ylabel('Timing Standard Deviation (s)')
+        ax4.set_xticks(range(len(participant_timing)))
+        ax4.set_xticklabels(participant_timing.index, rotation=45)
+    
+    sns.despine(fig=fig)
+    
+    if save_path:
+        fig.savefig(save_path, dpi=300)
+        logger.info(f"Timing analysis plot saved to {save_path}")
+    
+    return fig
+
+
+def _render_motor(data: _PlotData, colors: Dict[str, str], save_path: str = None,
+                  fig: plt.Figure = None) -> plt.Figure:
+    """
+    Motor network panels: motor vs non-motor onsets, tool motor onsets, conditions, counts.
+    
+    Args:
+        data: Shared plot arrays
+        colors: Color scheme of DataVisualizer
+        save_path: Optional path to save the figure
+        fig: Figure previously returned by this renderer, to clear and redraw in place
+        
+    Returns:
+        matplotlib Figure object
+    """
+    logger.info("Creating motor network plot")
+    
+    fig, axes = _subplots(fig, 2, 2, figsize=(15, 12))
+    fig.suptitle('Motor Network Analysis: Action-Related Activation', 
+                 fontsize=16, fontweight='bold')
+    
+    is_motor = data.is_motor
+    
+    # 1. Motor vs non-motor conditions
+    ax1 = axes[0, 0]
+    if is_motor.any() and not is_motor.all() and data.onset is not None:
+        motor_onsets = data.onset[is_motor & data.onset_ok]
+        non_motor_onsets = data.onset[~is_motor & data.onset_ok]
+        
+        if len(motor_onsets) > 0 and len(non_motor_onsets) > 0:
+            ax1.hist(motor_onsets, alpha=0.7, label='Motor Conditions', 
+                    bins=data.onset_bin_edges, color=colors['active_grasp'], rasterized=True)
+            ax1.hist(non_motor_onsets, alpha=0.7, label='Non-Motor Conditions', 
+                    bins=data.onset_bin_edges, color=colors['passive_viewing'], rasterized=True)
+            ax1.set_title('Motor vs Non-Motor Activation Patterns')
+            ax1.set_xlabel('Stimulus Onset Time (s)')
+            ax1.set_ylabel('Frequency')
+            ax1.legend()
+    
+    # 2. Tool-specific motor activation
+    ax2 = axes[0, 1]
+    tool_motor = is_motor & (data.category == 'Tool')
+    if tool_motor.any() and data.onset is not None:
+        tool_onsets = data.onset[tool_motor & data.onset_ok]
+        if len(tool_onsets) > 0:
+            ax2.hist(tool_onsets, bins=data.onset_bin_edges, alpha=0.7, color=colors['tools'],
+                     rasterized=True)
+            ax2.set_title('Tool-Specific Motor Activation')
+            ax2.set_xlabel('Stimulus Onset Time (s)')
+            ax2.set_ylabel('Frequency')
+    
+    # 3. Condition comparison
+    ax3 = axes[1, 0]
+    if data.condition is not None and data.onset is not None:
+        # One grouping pass over the valid onsets instead of a scan per condition
+        condition_labels = []
+        condition_data = []
+        for condition, cond_data in pd.Series(data.valid_onsets).groupby(
+                data.condition[data.onset_ok], sort=False, observed=True):
+            condition_labels.append(condition)
+            condition_data.append(cond_data.to_numpy())
+        
+        if condition_data:
+            ax3.boxplot(condition_data)
+            ax3.set_xticks(range(1, len(condition_labels) + 1))
+            ax3.set_xticklabels(condition_labels)
+            ax3.set_title('Activation Patterns by Condition')
+            ax3.set_xlabel('Condition')
+            ax3.set_ylabel('Stimulus Onset Time (s)')
+            ax3.tick_params(axis='x', rotation=45)
+    
+    # 4. Motor network summary
+    ax4 = axes[1, 1]
+    if is_motor.any():
+        shape_motor = is_motor & (data.category == 'Shape')
+        motor_summary = {
+            'Total Motor Trials': int(is_motor.sum()),
+            'Tool Motor Trials': int(tool_motor.sum()),
+            'Shape Motor Trials': int(shape_motor.sum()),
+            'Participants': data.motor_participants
+        }
+        
+        bars = ax4.bar(range(len(motor_summary)), list(motor_summary.values()))
+        ax4.set_title('Motor Network Summary')
+        ax4.set_xticks(range(len(motor_summary)))
+        ax4.set_xticklabels(list(motor_summary.keys()), rotation=45, ha='right')
+        ax4.set_ylabel('Count')
+        
+        # Add value labels on bars
+        ax4.bar_label(bars, labels=[f'{int(count)}' for count in motor_summary.values()], padding=3)
+    
+    sns.despine(fig=fig)
+    
+    if save_path:
+        fig.savefig(save_path, dpi=300)
+        logger.info(f"Motor network plot saved to {save_path}")
+    
+    return fig
+
+
+def _render_summary(data: _PlotData, colors: Dict[str, str], save_path: str = None,
+                    fig: plt.Figure = None) -> plt.Figure:
+    """
+    Multi-panel results summary.
+    
+    Args:
+        data: Shared plot arrays
+        colors: Color scheme of DataVisualizer
+        save_path: Optional path to save the figure
+        fig: Figure previously returned by this renderer, to clear and redraw in place
+        
+    Returns:
+        matplotlib Figure object
+    """
+    logger.info("Creating summary figures")
+    
+    if fig is None:
+        fig = plt.figure(figsize=(20, 16), layout='constrained')
+        gs = GridSpec(4, 4, figure=fig)
+        for cell in (gs[0:2, 0:2], gs[0, 2:4], gs[1, 2:4], gs[2, 0:2], gs[2, 2:4], gs[3, :]):
+            fig.add_subplot(cell)
+    else:
+        for ax in fig.axes:
+            ax.clear()
+    ax1, ax2, ax3, ax4, ax5, ax6 = fig.axes
+    
+    fig.suptitle('fMRI Tool Representation Study: Comprehensive Results Summary', 
+                 fontsize=20, fontweight='bold')
+    
+    # 1. Main tools vs shapes comparison (top left, large)
+    if data.onset is not None:
+        keep = data.categorized
+        sns.boxplot(x=data.category[keep], y=data.onset[keep], 
+                   ax=ax1, palette=[colors['tools'], colors['shapes']])
+        ax1.set_title('Tools vs Shapes: Main Comparison', fontsize=14, fontweight='bold')
+        ax1.set_xlabel('Stimulus Category', fontsize=12)
+        ax1.set_ylabel('Stimulus Onset Time (s)', fontsize=12)
+    
+    # 2. Condition breakdown (top right)
+    if data.condition_counts is not None:
+        condition_counts = data.condition_counts
+        wedges, texts, autotexts = ax2.pie(condition_counts.values, 
+                                         labels=condition_counts.index,
+                                         autopct='%1.1f%%', startangle=90)
+        ax2.set_title('Condition Distribution', fontsize=12, fontweight='bold')
+    
+    # 3. Stimulus type breakdown (second row, left)
+    if data.stim_counts is not None:
+        stim_counts = data.stim_counts
+        bars = ax3.bar(range(len(stim_counts)), stim_counts.values,
+                      color=[colors['tools'] if 'tool' in stim.lower() 
+                            else colors['shapes'] for stim in stim_counts.index])
+        ax3.set_title('Stimulus Type Distribution', fontsize=12, fontweight='bold')
+        ax3.set_xlabel('Stimulus Type')
+        ax3.set_ylabel('Number of Trials')
+        ax3.set_xticks(range(len(stim_counts)))
+        ax3.set_xticklabels(stim_counts.index, rotation=45, ha='right')
+    
+    # 4. Timing patterns (third row, left)
+    if data.onset is not None:
+        ax4.hist(data.valid_onsets, bins=30, alpha=0.7,
+                color=colors['tools'], edgecolor='black', rasterized=True)
+        ax4.set_title('Overall Timing Distribution', fontsize=12, fontweight='bold')
+        ax4.set_xlabel('Stimulus Onset Time (s)')
+        ax4.set_ylabel('Frequency')
+    
+    # 5. Participant summary (third row, right)
+    if data.participant_counts is not None:
+        participant_counts = data.participant_counts
+        bars = ax5.bar(range(len(participant_counts)), participant_counts.values,
+                      color=colors['passive_viewing'])
+        ax5.set_title('Trials per Participant', fontsize=12, fontweight='bold')
+        ax5.set_xlabel('Participant')
+        ax5.set_ylabel('Number of Trials')
+        ax5.set_xticks(range(len(participant_counts)))
+        ax5.set_xticklabels(participant_counts.index)
+    
+    # 6. Research questions summary (bottom row)
+    ax6.axis('off')
+    
+    # Create text summary
+    summary_text = """
+        RESEARCH QUESTIONS SUMMARY:
+        
+        RQ1: Are Tools Special? - Compare tools vs shapes across all tasks
+        RQ2: Action Potentiation - Compare passive viewing vs active grasping  
+        RQ3: Functional vs Structural - Compare functional tools vs neutral shapes
+        
+        Key Findings: Tools show distinct neural activation patterns compared to shapes,
+        with enhanced responses during active grasping tasks, supporting the hypothesis
+        that tools have special neural representations related to their functional properties.
+        """
+    
+    ax6.text(0.05, 0.5, summary_text, transform=ax6.transAxes, fontsize=11,
+            verticalalignment='center', bbox=dict(boxstyle="round,pad=0.3", 
+            facecolor="lightgray", alpha=0.5))
+    
+    sns.despine(fig=fig)
+    
+    if save_path:
+        fig.savefig(save_path, dpi=300)
+        logger.info(f"Summary figures saved to {save_path}")
+    
+    return fig
+
+
+# Figures by plot type: (export file name, renderer)
+_FIGURES = {
+    'behavioral': ('behavioral_results.png', _render_behavioral),
+    'timing': ('timing_analysis.png', _render_timing),
+    'motor': ('motor_network.png', _render_motor),
+    'summary': ('summary_figures.png', _render_summary),
+}
+
+
+def _export_figure(plot_type: str, data: _PlotData, colors: Dict[str, str], save_path: str) -> str:
+    """
+    Render one figure to file in an export worker process.
+    
+    Module-level so it can be pickled to worker processes; workers receive the slim
+    _PlotData bundle rather than the DataFrame.
+    
+    Args:
+        plot_type: Key of _FIGURES
+        data: Shared plot arrays
+        colors: Color scheme of DataVisualizer
+        save_path: Output image path
+        
+    Returns:
+        save_path
+    """
+    # Workers only write files; the Agg backend skips GUI setup
+    matplotlib.use('Agg')
+    plt.close(_FIGURES[plot_type][1](data, colors, save_path))
+    return save_path
+
 
 class DataVisualizer:
     """
@@ -51,9 +647,9 @@ class DataVisualizer:
             df: Pre-loaded DataFrame (alternative to data_path)
         """
         if df is not None:
-            self.df = df.copy()
+            df = df.copy()
         elif data_path is not None:
-            self.df = self._load_data(data_path)
+            df = self._load_data(data_path)
         else:
             raise ValueError("Either data_path or df must be provided")
         
@@ -67,16 +663,40 @@ class DataVisualizer:
             'clench': '#4A4A4A'
         }
         
+        # Figures redrawn in place by refresh_figure, by plot type
+        self._fig_cache: Dict[str, plt.Figure] = {}
+        
+        self._set_data(df)
+        
         logger.info(f"Initialized DataVisualizer with {len(self.df)} trials")
     
+    def _set_data(self, df: pd.DataFrame):
+        """Store the trial data with compact dtypes and derive the shared plot arrays from it."""
+        # Compact dtypes: half-width timing columns and code-backed labels
+        for column in _FLOAT32_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce', downcast='float')
+        self.df = df.astype({column: 'category' for column in _CATEGORICAL_COLUMNS
+                             if column in df.columns})
+        
+        # Shared arrays and aggregates, derived in a single pass for all plots
+        self._data = _PlotData.from_frame(self.df)
+        self.df['stimulus_category'] = self._data.category
+    
     def _load_data(self, data_path: str) -> pd.DataFrame:
-        """Load data from file."""
+        """Load the plotted columns from file, typed as in _set_data."""
         data_path = Path(data_path)
         
         if data_path.suffix == '.csv':
-            df = pd.read_csv(data_path)
+            header = pd.read_csv(data_path, nrows=0).columns
+            usecols = [column for column in _PLOT_COLUMNS if column in header]
+            dtypes = {column: 'category' if column in _CATEGORICAL_COLUMNS else 'float32'
+                      for column in usecols}
+            df = pd.read_csv(data_path, usecols=usecols, dtype=dtypes,
+                             engine='pyarrow' if _HAS_PYARROW else 'c')
         elif data_path.suffix in ['.xlsx', '.xls']:
-            df = pd.read_excel(data_path)
+            df = pd.read_excel(data_path, usecols=lambda column: column in _PLOT_COLUMNS,
+                               engine='calamine' if _HAS_CALAMINE else None)
         else:
             raise ValueError(f"Unsupported file format: {data_path.suffix}")
         
@@ -93,58 +713,78 @@ class DataVisualizer:
         Returns:
             matplotlib Figure object
         """
-        logger.info("Creating simplified behavioral results plot")
-        
-        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-        fig.suptitle('Behavioral Results: fMRI Tool Representation Study', 
-                     fontsize=16, fontweight='bold')
-        
-        # 1. Stimulus onset times by category (most important)
-        ax1 = axes[0]
-        if 'stimulus_onset' in self.df.columns:
-            # Create stimulus categories
-            self.df['stimulus_category'] = self.df['stimulus_type'].apply(
-                lambda x: 'Tool' if x.lower() in ['tool', 'scrtool'] else 'Shape' if x.lower() in ['shape', 'scrshape'] else 'Other'
-            )
+        return _render_behavioral(self._data, self.colors, save_path)
+    
+    def plot_behavioral_results_fast(self, size: Tuple[int, int] = (300, 400)) -> np.ndarray:
+        """
+        Render the behavioral boxplots straight to an RGBA image with justpyplot.
+        
+        Intended for previews and refresh loops, where building a matplotlib figure costs
+        far more than the data work; publication figures come from plot_behavioral_results.
+        
+        Args:
+            size: (height, width) of each panel in pixels
             
-            # Filter out 'Other' category for the plot
-            plot_df = self.df[self.df['stimulus_category'] != 'Other'].copy()
+        Returns:
+            uint8 RGBA array of shape (height, 2 * width, 4): onsets by stimulus category
+            (left) and by condition (right)
+        """
+        try:
+            from justpyplot import justpyplot as jplt
+        except ImportError:
+            raise ImportError("justpyplot is required for fast previews: pip install justpyplot")
+        
+        data = self._data
+        panels = []
+        if data.onset is not None:
+            category_valid = data.onset_ok & data.categorized
+            groups = [(category, group.to_numpy()) for category, group in
+                      pd.Series(data.onset[category_valid]).groupby(data.category[category_valid], sort=False)]
+            panels.append(self._render_boxes_fast(
+                jplt, groups, 'Onset by category', size,
+                [self.colors['tools'] if category == 'Tool' else self.colors['shapes'] for category, _ in groups]
+            ))
             
-            sns.boxplot(data=plot_df, x='stimulus_category', y='stimulus_onset', 
-                       ax=ax1, palette=[self.colors['tools'], self.colors['shapes']])
-            ax1.set_title('Stimulus Onset Times by Category')
-            ax1.set_xlabel('Stimulus Category')
-            ax1.set_ylabel('Onset Time (s)')
-        
-            # Add sample size annotations
-            for i, category in enumerate(['Tool', 'Shape']):
-                count = len(plot_df[plot_df['stimulus_category'] == category])
-                ax1.text(i, ax1.get_ylim()[1]*0.95, f'n={count}', 
-                        ha='center', va='top', fontsize=10, fontweight='bold')
-        
-        # 2. Stimulus onset times by condition
-        ax2 = axes[1]
-        if 'condition' in self.df.columns and 'stimulus_onset' in self.df.columns:
-            sns.boxplot(data=self.df, x='condition', y='stimulus_onset', ax=ax2)
-            ax2.set_title('Stimulus Onset Times by Condition')
-            ax2.set_xlabel('Condition')
-            ax2.set_ylabel('Onset Time (s)')
-            ax2.tick_params(axis='x', rotation=45)
-        
-            # Add sample size annotations
-            condition_counts = self.df['condition'].value_counts()
-            for i, condition in enumerate(condition_counts.index):
-                count = condition_counts[condition]
-                ax2.text(i, ax2.get_ylim()[1]*0.95, f'n={count}', 
-                        ha='center', va='top', fontsize=10, fontweight='bold')
-        
-        plt.tight_layout()
-        
-        if save_path:
-            fig.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"Behavioral results plot saved to {save_path}")
+            if data.condition is not None:
+                groups = [(condition, group.to_numpy()) for condition, group in
+                          pd.Series(data.valid_onsets).groupby(data.condition[data.onset_ok],
+                                                              sort=False, observed=True)]
+                panels.append(self._render_boxes_fast(
+                    jplt, groups, 'Onset by condition', size,
+                    [self.colors.get(condition, '#4A4A4A') for condition, _ in groups]
+                ))
+        
+        while len(panels) < 2:
+            panels.append(np.full((*size, 4), 255, dtype=np.uint8))
+        return np.concatenate(panels, axis=1)
+    
+    def _render_boxes_fast(self, jplt, groups: List[Tuple[str, np.ndarray]], title: str,
+                           size: Tuple[int, int], colors: List[str]) -> np.ndarray:
+        """Draw one boxplot panel with justpyplot layers composited over a white canvas."""
+        canvas = np.full((*size, 4), 255, dtype=np.uint8)
+        if not groups:
+            return canvas
+        
+        summaries = np.array([_box_summary(values) for _, values in groups])
+        low, high = summaries.min(), summaries.max()
+        if high == low:
+            low, high = low - 0.5, high + 0.5
+        # Shared bounds keep every box on the same axes
+        bounds = np.array([[-0.5, len(groups) - 0.5], [low, high]])
+        title = f"{title}: {' | '.join(str(label) for label, _ in groups)}"
+        
+        for i, summary in enumerate(summaries):
+            figure, grid, labels, title_layer = jplt.plot(
+                _box_path(i, summary), bounds=bounds, title=title, size=size, grid={'nticks': 8},
+                figure={'scatter': False, 'line_color': _hex_to_rgba(colors[i]),
+                        'point_color': _hex_to_rgba(colors[i]), 'point_radius': 1}
+            )
+            # Grid, labels and title are the same for every box; composite them once
+            layers = (grid, labels, title_layer, figure) if i == 0 else (figure,)
+            for layer in layers:
+                canvas = np.where(layer[..., 3:] > 0, layer, canvas)
         
-        return fig
+        return canvas
     
     def plot_timing_analysis(self, save_path: str = None) -> plt.Figure:
         """
@@ -156,59 +796,69 @@ class DataVisualizer:
         Returns:
             matplotlib Figure object
         """
-        logger.info("Creating timing analysis plot")
-        
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle('Timing Analysis: Stimulus Presentation Patterns', 
-                     fontsize=16, fontweight='bold')
-        
-        # 1. Timing distribution
-        ax1 = axes[0, 0]
-        if 'stimulus_onset' in self.df.columns:
-            ax1.hist(self.df['stimulus_onset'].dropna(), bins=30, alpha=0.7, 
-                    color=self.colors['tools'])
-            ax1.set_title('Distribution of Stimulus Onset Times')
-            ax1.set_xlabel('Onset Time (s)')
-            ax1.set_ylabel('Frequency')
+        return _render_timing(self._data, self.colors, save_path)
+    
+    def plot_timing_analysis_gpu(self, show: bool = True):
+        """
+        Interactive GPU-rendered timing panels (onset histogram, relative onsets per trial) via VisPy.
         
-        # 2. Timing by stimulus type
-        ax2 = axes[0, 1]
-        if 'stimulus_onset' in self.df.columns and 'stimulus_type' in self.df.columns:
-            for stim_type in self.df['stimulus_type'].unique():
-                stim_data = self.df[self.df['stimulus_type'] == stim_type]['stimulus_onset'].dropna()
-                ax2.hist(stim_data, alpha=0.6, label=stim_type, bins=20)
-            ax2.set_title('Timing Distribution by Stimulus Type')
-            ax2.set_xlabel('Onset Time (s)')
-            ax2.set_ylabel('Frequency')
-            ax2.legend()
-        
-        # 3. Relative timing
-        ax3 = axes[1, 0]
-        if 'relative_onset' in self.df.columns:
-            ax3.scatter(range(len(self.df)), self.df['relative_onset'], 
-                       alpha=0.6, s=20)
-            ax3.set_title('Relative Onset Times Across Trials')
-            ax3.set_xlabel('Trial Number')
-            ax3.set_ylabel('Relative Onset Time (s)')
-        
-        # 4. Timing consistency
-        ax4 = axes[1, 1]
-        if 'stimulus_onset' in self.df.columns and 'participant_id' in self.df.columns:
-            participant_timing = self.df.groupby('participant_id')['stimulus_onset'].std()
-            ax4.bar(range(len(participant_timing)), participant_timing.values)
-            ax4.set_title('Timing Consistency Across Participants')
-            ax4.set_xlabel('Participant')
-            ax4.set_ylabel('Timing Standard Deviation (s)')
-            ax4.set_xticks(range(len(participant_timing)))
-            ax4.set_xticklabels(participant_timing.index, rotation=45)
-        
-        plt.tight_layout()
+        Points and bars live in OpenGL vertex buffers, so pan/zoom stays interactive for
+        cohorts with far more trials than the matplotlib scatter can handle.
         
-        if save_path:
-            fig.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"Timing analysis plot saved to {save_path}")
+        Args:
+            show: Whether to open the canvas window immediately
         
-        return fig
+        Returns:
+            vispy.scene.SceneCanvas holding the panels
+        """
+        try:
+            from vispy import scene
+        except ImportError:
+            raise ImportError("vispy is required for GPU plots: pip install vispy")
+        
+        logger.info("Creating GPU timing analysis plot")
+        
+        canvas = scene.SceneCanvas(title='Timing Analysis: Stimulus Presentation Patterns',
+                                   size=(1400, 600), bgcolor='white', show=show)
+        grid = canvas.central_widget.add_grid()
+        
+        panels = []
+        if self._data.onset is not None:
+            counts, edges = np.histogram(self._data.valid_onsets, bins=30)
+            panels.append(('Distribution of Stimulus Onset Times', counts, edges))
+        if self._data.relative_onset is not None:
+            relative = self._data.relative_onset
+            valid = ~np.isnan(relative)
+            xy = np.column_stack([np.flatnonzero(valid).astype(np.float32), relative[valid]])
+            panels.append(('Relative Onset Times Across Trials', xy, None))
+        
+        for col, (title, data, edges) in enumerate(panels):
+            label = scene.Label(title, color='black', font_size=12)
+            label.height_max = 40
+            grid.add_widget(label, row=0, col=col)
+            view = grid.add_view(row=1, col=col, border_color='gray')
+            view.camera = 'panzoom'
+            
+            if edges is not None:
+                # One quad (two triangles) per bin, drawn as a single mesh
+                left, right = edges[:-1], edges[1:]
+                heights = data.astype(np.float32)
+                corners = np.stack([
+                    np.column_stack([left, np.zeros_like(heights)]),
+                    np.column_stack([right, np.zeros_like(heights)]),
+                    np.column_stack([right, heights]),
+                    np.column_stack([left, heights])
+                ], axis=1).reshape(-1, 2).astype(np.float32)
+                first = np.arange(len(heights), dtype=np.uint32)[:, None] * 4
+                faces = np.concatenate([first + [0, 1, 2], first + [0, 2, 3]])
+                scene.visuals.Mesh(vertices=corners, faces=faces, color=self.colors['tools'],
+                                   parent=view.scene)
+            else:
+                markers = scene.visuals.Markers(parent=view.scene)
+                markers.set_data(data, size=4, face_color=self.colors['tools'], edge_width=0)
+            view.camera.set_range()
+        
+        return canvas
     
     def plot_motor_network(self, save_path: str = None) -> plt.Figure:
         """
@@ -220,90 +870,7 @@ class DataVisualizer:
         Returns:
             matplotlib Figure object
         """
-        logger.info("Creating motor network plot")
-        
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle('Motor Network Analysis: Action-Related Activation', 
-                     fontsize=16, fontweight='bold')
-        
-        # 1. Motor vs non-motor conditions
-        ax1 = axes[0, 0]
-        motor_conditions = ['active_grasp', 'imagined_grasp', 'clench']
-        motor_data = self.df[self.df['condition'].isin(motor_conditions)]
-        non_motor_data = self.df[~self.df['condition'].isin(motor_conditions)]
-        
-        if len(motor_data) > 0 and len(non_motor_data) > 0:
-            motor_onsets = motor_data['stimulus_onset'].dropna() if 'stimulus_onset' in motor_data.columns else []
-            non_motor_onsets = non_motor_data['stimulus_onset'].dropna() if 'stimulus_onset' in non_motor_data.columns else []
-            
-            if len(motor_onsets) > 0 and len(non_motor_onsets) > 0:
-                ax1.hist(motor_onsets, alpha=0.7, label='Motor Conditions', 
-                        bins=20, color=self.colors['active_grasp'])
-                ax1.hist(non_motor_onsets, alpha=0.7, label='Non-Motor Conditions', 
-                        bins=20, color=self.colors['passive_viewing'])
-                ax1.set_title('Motor vs Non-Motor Activation Patterns')
-                ax1.set_xlabel('Stimulus Onset Time (s)')
-                ax1.set_ylabel('Frequency')
-                ax1.legend()
-        
-        # 2. Tool-specific motor activation
-        ax2 = axes[0, 1]
-        tool_motor_data = motor_data[motor_data['stimulus_type'].isin(['tool', 'SCRtool'])]
-        if len(tool_motor_data) > 0 and 'stimulus_onset' in tool_motor_data.columns:
-            tool_onsets = tool_motor_data['stimulus_onset'].dropna()
-            if len(tool_onsets) > 0:
-                ax2.hist(tool_onsets, bins=20, alpha=0.7, color=self.colors['tools'])
-                ax2.set_title('Tool-Specific Motor Activation')
-                ax2.set_xlabel('Stimulus Onset Time (s)')
-                ax2.set_ylabel('Frequency')
-        
-        # 3. Condition comparison
-        ax3 = axes[1, 0]
-        if 'condition' in self.df.columns and 'stimulus_onset' in self.df.columns:
-            condition_data = []
-            condition_labels = []
-            for condition in self.df['condition'].unique():
-                cond_data = self.df[self.df['condition'] == condition]['stimulus_onset'].dropna()
-                if len(cond_data) > 0:
-                    condition_data.append(cond_data)
-                    condition_labels.append(condition)
-            
-            if condition_data:
-                ax3.boxplot(condition_data, labels=condition_labels)
-                ax3.set_title('Activation Patterns by Condition')
-                ax3.set_xlabel('Condition')
-                ax3.set_ylabel('Stimulus Onset Time (s)')
-                ax3.tick_params(axis='x', rotation=45)
-        
-        # 4. Motor network summary
-        ax4 = axes[1, 1]
-        if len(motor_data) > 0:
-            motor_summary = {
-                'Total Motor Trials': len(motor_data),
-                'Tool Motor Trials': len(tool_motor_data),
-                'Shape Motor Trials': len(motor_data[motor_data['stimulus_type'].isin(['Shape', 'SCRshape'])]),
-                'Participants': motor_data['participant_id'].nunique() if 'participant_id' in motor_data.columns else 0
-            }
-            
-            bars = ax4.bar(range(len(motor_summary)), list(motor_summary.values()))
-            ax4.set_title('Motor Network Summary')
-            ax4.set_xticks(range(len(motor_summary)))
-            ax4.set_xticklabels(list(motor_summary.keys()), rotation=45, ha='right')
-            ax4.set_ylabel('Count')
-            
-            # Add value labels on bars
-            for i, bar in enumerate(bars):
-                height = bar.get_height()
-                ax4.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                        f'{int(height)}', ha='center', va='bottom')
-        
-        plt.tight_layout()
-        
-        if save_path:
-            fig.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"Motor network plot saved to {save_path}")
-        
-        return fig
+        return _render_motor(self._data, self.colors, save_path)
     
     def create_summary_figures(self, save_path: str = None) -> plt.Figure:
         """
@@ -315,96 +882,32 @@ class DataVisualizer:
         Returns:
             matplotlib Figure object
         """
-        logger.info("Creating summary figures")
-        
-        fig = plt.figure(figsize=(20, 16))
-        gs = GridSpec(4, 4, figure=fig)
-        fig.suptitle('fMRI Tool Representation Study: Comprehensive Results Summary', 
-                     fontsize=20, fontweight='bold')
-        
-        # 1. Main tools vs shapes comparison (top left, large)
-        ax1 = fig.add_subplot(gs[0:2, 0:2])
-        if 'stimulus_onset' in self.df.columns:
-            self.df['stimulus_category'] = self.df['stimulus_type'].apply(
-                lambda x: 'Tool' if x in ['tool', 'SCRtool'] else 'Shape'
-            )
-            
-            sns.boxplot(data=self.df, x='stimulus_category', y='stimulus_onset', 
-                       ax=ax1, palette=[self.colors['tools'], self.colors['shapes']])
-            ax1.set_title('Tools vs Shapes: Main Comparison', fontsize=14, fontweight='bold')
-            ax1.set_xlabel('Stimulus Category', fontsize=12)
-            ax1.set_ylabel('Stimulus Onset Time (s)', fontsize=12)
-        
-        # 2. Condition breakdown (top right)
-        ax2 = fig.add_subplot(gs[0, 2:4])
-        if 'condition' in self.df.columns:
-            condition_counts = self.df['condition'].value_counts()
-            wedges, texts, autotexts = ax2.pie(condition_counts.values, 
-                                             labels=condition_counts.index,
-                                             autopct='%1.1f%%', startangle=90)
-            ax2.set_title('Condition Distribution', fontsize=12, fontweight='bold')
-        
-        # 3. Stimulus type breakdown (second row, left)
-        ax3 = fig.add_subplot(gs[1, 2:4])
-        if 'stimulus_type' in self.df.columns:
-            stim_counts = self.df['stimulus_type'].value_counts()
-            bars = ax3.bar(range(len(stim_counts)), stim_counts.values,
-                          color=[self.colors['tools'] if 'tool' in stim.lower() 
-                                else self.colors['shapes'] for stim in stim_counts.index])
-            ax3.set_title('Stimulus Type Distribution', fontsize=12, fontweight='bold')
-            ax3.set_xlabel('Stimulus Type')
-            ax3.set_ylabel('Number of Trials')
-            ax3.set_xticks(range(len(stim_counts)))
-            ax3.set_xticklabels(stim_counts.index, rotation=45, ha='right')
-        
-        # 4. Timing patterns (third row, left)
-        ax4 = fig.add_subplot(gs[2, 0:2])
-        if 'stimulus_onset' in self.df.columns:
-            ax4.hist(self.df['stimulus_onset'].dropna(), bins=30, alpha=0.7,
-                    color=self.colors['tools'], edgecolor='black')
-            ax4.set_title('Overall Timing Distribution', fontsize=12, fontweight='bold')
-            ax4.set_xlabel('Stimulus Onset Time (s)')
-            ax4.set_ylabel('Frequency')
-        
-        # 5. Participant summary (third row, right)
-        ax5 = fig.add_subplot(gs[2, 2:4])
-        if 'participant_id' in self.df.columns:
-            participant_counts = self.df['participant_id'].value_counts()
-            bars = ax5.bar(range(len(participant_counts)), participant_counts.values,
-                          color=self.colors['passive_viewing'])
-            ax5.set_title('Trials per Participant', fontsize=12, fontweight='bold')
-            ax5.set_xlabel('Participant')
-            ax5.set_ylabel('Number of Trials')
-            ax5.set_xticks(range(len(participant_counts)))
-            ax5.set_xticklabels(participant_counts.index)
-        
-        # 6. Research questions summary (bottom row)
-        ax6 = fig.add_subplot(gs[3, :])
-        ax6.axis('off')
-        
-        # Create text summary
-        summary_text = """
-        RESEARCH QUESTIONS SUMMARY:
-        
-        RQ1: Are Tools Special? - Compare tools vs shapes across all tasks
-        RQ2: Action Potentiation - Compare passive viewing vs active grasping  
-        RQ3: Functional vs Structural - Compare functional tools vs neutral shapes
-        
-        Key Findings: Tools show distinct neural activation patterns compared to shapes,
-        with enhanced responses during active grasping tasks, supporting the hypothesis
-        that tools have special neural representations related to their functional properties.
+        return _render_summary(self._data, self.colors, save_path)
+    
+    def refresh_figure(self, plot_type: str, df: pd.DataFrame = None, save_path: str = None) -> plt.Figure:
         """
+        Redraw a figure on its cached Figure and Axes instead of building new ones.
         
-        ax6.text(0.05, 0.5, summary_text, transform=ax6.transAxes, fontsize=11,
-                verticalalignment='center', bbox=dict(boxstyle="round,pad=0.3", 
-                facecolor="lightgray", alpha=0.5))
+        For GUI and animation loops: the axes are cleared and replotted, skipping the
+        figure and axes construction that dominates the cost of each update. The first
+        call for a plot type creates the figure.
         
-        plt.tight_layout()
+        Args:
+            plot_type: 'behavioral', 'timing', 'motor' or 'summary'
+            df: Optional new trial data, replacing the current data before redrawing
+            save_path: Optional path to save the figure
+            
+        Returns:
+            The cached matplotlib Figure, redrawn
+        """
+        if plot_type not in _FIGURES:
+            raise ValueError(f"Unknown plot type: {plot_type}")
         
-        if save_path:
-            fig.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"Summary figures saved to {save_path}")
+        if df is not None:
+            self._set_data(df.copy())
         
+        fig = _FIGURES[plot_type][1](self._data, self.colors, save_path, fig=self._fig_cache.get(plot_type))
+        self._fig_cache[plot_type] = fig
         return fig
     
     def create_interactive_plots(self, save_path: str = None) -> go.Figure:
@@ -428,41 +931,37 @@ class DataVisualizer:
                    [{"secondary_y": False}, {"secondary_y": False}]]
         )
         
-        # 1. Tools vs Shapes
-        if 'stimulus_onset' in self.df.columns:
-            self.df['stimulus_category'] = self.df['stimulus_type'].apply(
-                lambda x: 'Tool' if x in ['tool', 'SCRtool'] else 'Shape'
+        data = self._data
+        
+        # 1. Tools vs Shapes (one trace, boxes grouped by the x labels)
+        if data.onset is not None:
+            keep = data.categorized & data.onset_ok
+            fig.add_trace(
+                go.Box(x=data.category[keep], y=data.onset[keep], name='Tools vs Shapes',
+                       marker_color=self.colors['tools']),
+                row=1, col=1
+            )
+        
+        # 2. Condition comparison (one trace, boxes grouped by the x labels)
+        if data.condition is not None and data.onset is not None:
+            keep = data.onset_ok & (data.condition.codes >= 0)
+            fig.add_trace(
+                go.Box(x=np.asarray(data.condition[keep]), y=data.onset[keep], name='Conditions'),
+                row=1, col=2
             )
-            
-            for category in self.df['stimulus_category'].unique():
-                data = self.df[self.df['stimulus_category'] == category]['stimulus_onset'].dropna()
-                fig.add_trace(
-                    go.Box(y=data, name=category, 
-                          marker_color=self.colors['tools'] if category == 'Tool' else self.colors['shapes']),
-                    row=1, col=1
-                )
-        
-        # 2. Condition comparison
-        if 'condition' in self.df.columns and 'stimulus_onset' in self.df.columns:
-            for condition in self.df['condition'].unique():
-                data = self.df[self.df['condition'] == condition]['stimulus_onset'].dropna()
-                fig.add_trace(
-                    go.Box(y=data, name=condition),
-                    row=1, col=2
-                )
         
         # 3. Timing distribution
-        if 'stimulus_onset' in self.df.columns:
+        if data.onset is not None:
             fig.add_trace(
-                go.Histogram(x=self.df['stimulus_onset'].dropna(), 
+                go.Histogram(x=data.valid_onsets, 
                            name='Timing Distribution',
                            marker_color=self.colors['tools']),
                 row=2, col=1
             )
         
         # 4. Participant summary
-        if 'participant_id' in self.df.columns:
-            participant_counts = self.df['participant_id'].value_counts()
+        if data.participant_counts is not None:
+            participant_counts = data.participant_counts
             fig.add_trace(
                 go.Bar(x=list(participant_counts.index), 
                       y=list(participant_counts.values),
@@ -485,16 +984,29 @@ class DataVisualizer:
         
         return fig
     
-    def export_all_plots(self, output_dir: str = None) -> Dict[str, str]:
+    def export_all_plots(self, output_dir: str = None, plots: Tuple[str, ...] = ('behavioral',),
+                         max_workers: Optional[int] = None) -> Dict[str, str]:
         """
-        Export only the behavioral results plot.
+        Export plots to PNG files (by default only the behavioral results plot).
+        
+        Figures are rendered serially unless max_workers > 1, in which case several
+        figures are rendered in a spawned process pool. Spawned workers re-import the
+        calling script, so a script using the pool must guard its entry point with
+        ``if __name__ == '__main__':``.
         
         Args:
             output_dir: Output directory (defaults to current directory)
+            plots: Plot types to export, from 'behavioral', 'timing', 'motor' and 'summary'
+            max_workers: Worker processes for rendering figures in parallel (None or 1 runs
+                serially; capped at the number of figures and CPUs)
             
         Returns:
             Dictionary mapping plot types to file paths
         """
+        unknown = [plot for plot in plots if plot not in _FIGURES]
+        if unknown:
+            raise ValueError(f"Unknown plot types: {unknown}")
+        
         if output_dir is None:
             output_dir = Path.cwd()
         else:
@@ -502,15 +1014,22 @@ class DataVisualizer:
         
         output_dir.mkdir(exist_ok=True)
         
-        exported_files = {}
+        paths = [str(output_dir / _FIGURES[plot][0]) for plot in plots]
+        workers = min(max_workers or 1, len(plots), os.cpu_count() or 1)
+        if workers > 1:
+            n = len(plots)
+            # Spawned (not forked) workers: forking after numba has started its thread
+            # pool can leave the parent hanging on exit
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                paths = list(executor.map(_export_figure, plots, [self._data] * n, [self.colors] * n, paths))
+        else:
+            for plot, path in zip(plots, paths):
+                plt.close(_FIGURES[plot][1](self._data, self.colors, path))
         
-        # Create only behavioral results plot
-        behavioral_fig = self.plot_behavioral_results()
-        behavioral_path = output_dir / "behavioral_results.png"
-        behavioral_fig.savefig(behavioral_path, dpi=300, bbox_inches='tight')
-        exported_files['behavioral'] = str(behavioral_path)
+        exported_files = dict(zip(plots, paths))
         
-        logger.info(f"Behavioral results plot exported to {behavioral_path}")
+        logger.info(f"Exported {len(exported_files)} plots to {output_dir}")
         return exported_files
 
 
@@ -547,6 +1066,9 @@ def export_all_visualizations(data_path: str, output_dir: str = None) -> Dict[st
 
 
 if __name__ == "__main__":
+    # Figures are only written to files here; the non-interactive Agg backend skips GUI setup
+    matplotlib.use('Agg')
+    
     # Example usage
     data_path = "/Users/hernandez/fmri_prosthetics/fmri-tool-representation/data/processed/trial_data.csv"
     
@@ -18,6 +18,10 @@ import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import matplotlib
+
+# The pipeline only writes figures to files; use the non-interactive Agg backend
+matplotlib.use('Agg')
 
 # Add analysis directory to path
 sys.path.append(str(Path(__file__).parent / "analysis"))
@@ -211,7 +215,6 @@ def main():
     print(f"   • Run 3 (Clench Localizer): Complete experimental design")
     print(f"   • Quality report: {exported_files.get('quality_report', 'N/A')}")
     print(f"   • CSV export: {exported_files.get('csv', 'N/A')}")
-    print(f"   • Excel export: {exported_files.get('excel', 'N/A')}")
     print()
     
     print("2. BRAIN IMAGE PROCESSING:")
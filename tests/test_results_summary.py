@@ -0,0 +1,70 @@
+"""
+Tests for the results summary module.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'analysis'))
+
+import results_summary  # noqa: E402
+from results_summary import ResultsSummarizer, _group_moments_kernel  # noqa: E402
+
+
+def _trial_frame():
+    """Trials for four participants: several onsets, one onset, only NaN onsets and a missing ID."""
+    rng = np.random.default_rng(3)
+    onsets = rng.normal(60, 20, 12)
+    onsets[[2, 5]] = np.nan
+    return pd.DataFrame({
+        'participant_id': ['P1'] * 6 + ['P2'] + ['P3'] * 3 + [None, 'P1'],
+        'trial_number': np.arange(1, 13),
+        'stimulus_onset': np.r_[onsets[:7], [np.nan] * 3, onsets[10:]]
+    })
+
+
+class TestGroupMoments(unittest.TestCase):
+    
+    def setUp(self):
+        self.df = _trial_frame()
+        self.codes, self.participants = pd.factorize(self.df['participant_id'], sort=False)
+        grouped = self.df.groupby('participant_id', sort=False)['stimulus_onset']
+        self.expected_means = grouped.mean().reindex(self.participants).to_numpy()
+        self.expected_stds = grouped.std().reindex(self.participants).to_numpy()
+    
+    def _check(self, means, stds):
+        # P2 has a single onset (std NaN) and P3 only NaN onsets (both NaN), as with pandas
+        np.testing.assert_allclose(means, self.expected_means, rtol=1e-12)
+        np.testing.assert_allclose(stds, self.expected_stds, rtol=1e-12)
+    
+    def test_kernel_matches_pandas(self):
+        onsets = self.df['stimulus_onset'].to_numpy()
+        self._check(*_group_moments_kernel(self.codes, onsets, len(self.participants)))
+    
+    def test_compiled_kernel_matches_pandas(self):
+        group_moments = results_summary._group_moments()
+        if group_moments is None:
+            self.skipTest('numba is not installed')
+        onsets = self.df['stimulus_onset'].to_numpy()
+        self._check(*group_moments(self.codes, onsets, len(self.participants)))
+    
+    def test_participant_statistics_paths_agree(self):
+        expected = results_summary._reduce_participant_statistics(
+            self.df.groupby('participant_id', sort=False)['trial_number'].count().to_numpy(),
+            self.expected_means, self.expected_stds)
+        
+        for compiled in (results_summary._group_moments(), None):
+            with mock.patch.object(results_summary, '_group_moments', return_value=compiled):
+                stats = ResultsSummarizer(df=self.df)._participant_statistics()
+            self.assertEqual(stats.keys(), expected.keys())
+            for key, value in expected.items():
+                np.testing.assert_allclose(stats[key], value, rtol=1e-12, err_msg=key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Tests for the statistical analysis module.
+"""
+
+import sys
+import unittest
+import warnings
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'analysis'))
+
+import statistical_analysis  # noqa: E402
+from statistical_analysis import (  # noqa: E402
+    StatisticalAnalyzer, _moments, _sample_moments_kernel, _paired_t_test, _student_t_tests, _two_sample_comparison,
+    _two_way_anova
+)
+
+
+def _ols_rss(design, values):
+    """Residual sum of squares and rank of an observation-level least-squares fit."""
+    coef, _, rank, _ = np.linalg.lstsq(design, values, rcond=None)
+    return float(np.sum((values - design @ coef) ** 2)), int(rank)
+
+
+def _type2_anova_reference(a_codes, b_codes, values):
+    """Type II two-way ANOVA from direct OLS fits on the individual observations."""
+    n = values.size
+    intercept = np.ones((n, 1))
+    dummies_a = (a_codes[:, None] == np.unique(a_codes)[1:]).astype(float)
+    dummies_b = (b_codes[:, None] == np.unique(b_codes)[1:]).astype(float)
+    dummies_ab = (dummies_a[:, :, None] * dummies_b[:, None, :]).reshape(n, -1)
+    
+    rss_a, rank_a = _ols_rss(np.hstack([intercept, dummies_a]), values)
+    rss_b, rank_b = _ols_rss(np.hstack([intercept, dummies_b]), values)
+    rss_main, rank_main = _ols_rss(np.hstack([intercept, dummies_a, dummies_b]), values)
+    rss_full, rank_full = _ols_rss(np.hstack([intercept, dummies_a, dummies_b, dummies_ab]), values)
+    
+    df_within = n - rank_full
+    mean_sq_within = rss_full / df_within
+    table = {}
+    for term, sum_sq, df in (('A', rss_b - rss_main, rank_main - rank_b),
+                             ('B', rss_a - rss_main, rank_main - rank_a),
+                             ('A:B', rss_main - rss_full, rank_full - rank_main)):
+        f_stat = sum_sq / df / mean_sq_within
+        table[term] = {'sum_sq': sum_sq, 'df': df, 'F': f_stat,
+                       'p_value': stats.f.sf(f_stat, df, df_within)}
+    table['residual'] = {'sum_sq': rss_full, 'df': df_within}
+    return table
+
+
+def _scipy_quietly(test, *args, **kwargs):
+    """Run a scipy test, silencing its small-sample warnings (the result is then NaN)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return test(*args, **kwargs)
+
+
+# Group pairs covering a regular comparison, a single observation against several,
+# two single observations (no degrees of freedom) and an all-NaN group
+_GROUP_PAIRS = (
+    (np.array([3.1, 4.7, 5.2, 2.9, 4.4, 3.8]), np.array([5.5, 6.1, 4.9, 7.2, 5.8])),
+    (np.array([4.2]), np.array([5.5, 6.1, 4.9, 7.2])),
+    (np.array([4.2]), np.array([5.5])),
+    (np.array([np.nan, np.nan]), np.array([5.5, 6.1, 4.9]))
+)
+
+
+class TestSampleMoments(unittest.TestCase):
+    
+    SAMPLES = (np.array([3.1, 4.7, 5.2, 2.9, 4.4, 3.8]), np.array([4.2]), np.array([], dtype=np.float64),
+               np.random.default_rng(1).normal(1e4, 0.5, 1000))
+    
+    def _check(self, moments, sample):
+        n, mean, var = moments
+        self.assertEqual(n, sample.size)
+        if sample.size:
+            np.testing.assert_allclose(mean, np.mean(sample), rtol=1e-12)
+        else:
+            self.assertTrue(np.isnan(mean))
+        if sample.size > 1:
+            np.testing.assert_allclose(var, np.var(sample, ddof=1), rtol=1e-9)
+        else:
+            self.assertTrue(np.isnan(var))
+    
+    def test_kernel_matches_numpy(self):
+        for sample in self.SAMPLES:
+            n, mean, m2 = _sample_moments_kernel(sample)
+            self.assertEqual(n, sample.size)
+            if sample.size > 1:
+                np.testing.assert_allclose(mean, np.mean(sample), rtol=1e-12)
+                np.testing.assert_allclose(m2, np.sum((sample - sample.mean()) ** 2), rtol=1e-9)
+    
+    def test_moments_compiled_and_numpy_paths(self):
+        for compiled in (statistical_analysis._sample_moments, None):
+            with mock.patch.object(statistical_analysis, '_sample_moments', compiled):
+                for sample in self.SAMPLES:
+                    self._check(_moments(sample), sample)
+                    # float32 onsets are accumulated in float64
+                    single = sample.astype(np.float32)
+                    self._check(_moments(single), single.astype(np.float64))
+
+
+class TestClosedFormTTests(unittest.TestCase):
+    
+    def test_student_t_tests_match_ttest_ind(self):
+        moments1 = np.array([_moments(a[~np.isnan(a)]) for a, _ in _GROUP_PAIRS])
+        moments2 = np.array([_moments(b[~np.isnan(b)]) for _, b in _GROUP_PAIRS])
+        t_stats, p_values = _student_t_tests(moments1, moments2)
+        
+        for i, (a, b) in enumerate(_GROUP_PAIRS):
+            expected = _scipy_quietly(stats.ttest_ind, a, b, nan_policy='omit')
+            np.testing.assert_allclose(t_stats[i], expected.statistic, rtol=1e-10)
+            np.testing.assert_allclose(p_values[i], expected.pvalue, rtol=1e-10)
+    
+    def test_two_sample_comparison_matches_ttest_ind(self):
+        for a, b in _GROUP_PAIRS:
+            a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+            t_stat, p_value, cohens_d = _two_sample_comparison(_moments(a), _moments(b))
+            expected = _scipy_quietly(stats.ttest_ind, a, b)
+            
+            np.testing.assert_allclose(t_stat, expected.statistic, rtol=1e-10)
+            np.testing.assert_allclose(p_value, expected.pvalue, rtol=1e-10)
+            if a.size and b.size and a.size + b.size > 2:
+                pooled_std = np.sqrt((np.sum((a - a.mean()) ** 2) + np.sum((b - b.mean()) ** 2))
+                                     / (a.size + b.size - 2))
+                np.testing.assert_allclose(cohens_d, (a.mean() - b.mean()) / pooled_std, rtol=1e-10)
+    
+    def test_paired_t_test_matches_ttest_rel(self):
+        pairs = (
+            (np.array([3.1, 4.7, 5.2, 2.9, 4.4]), np.array([3.6, 4.9, 6.0, 3.5, 4.1])),
+            (np.array([3.1]), np.array([3.6])),
+            (np.array([], dtype=np.float64), np.array([], dtype=np.float64))
+        )
+        for before, after in pairs:
+            t_stat, p_value = _paired_t_test(before - after)
+            expected = _scipy_quietly(stats.ttest_rel, before, after)
+            
+            np.testing.assert_allclose(t_stat, expected.statistic, rtol=1e-10)
+            np.testing.assert_allclose(p_value, expected.pvalue, rtol=1e-10)
+
+
+class TestTwoWayAnova(unittest.TestCase):
+    
+    def setUp(self):
+        # Unbalanced 2 x 4 design with the (1, 3) cell left empty
+        rng = np.random.default_rng(42)
+        a_codes = rng.integers(0, 2, 300)
+        b_codes = rng.integers(0, 4, 300)
+        keep = ~((a_codes == 1) & (b_codes == 3))
+        self.a_codes, self.b_codes = a_codes[keep], b_codes[keep]
+        self.values = (rng.normal(10, 2, self.a_codes.size) + 0.8 * self.a_codes
+                       + 0.5 * self.b_codes + 0.6 * (self.a_codes * (self.b_codes == 2)))
+    
+    def test_matches_ols_type2_with_empty_cell(self):
+        table = _two_way_anova(self.a_codes, self.b_codes, self.values)
+        expected = _type2_anova_reference(self.a_codes, self.b_codes, self.values)
+        
+        self.assertEqual(table['A:B']['df'], 2)  # one interaction df lost to the empty cell
+        for term in ('A', 'B', 'A:B'):
+            for key in ('sum_sq', 'df', 'F', 'p_value'):
+                self.assertAlmostEqual(table[term][key], expected[term][key], places=8,
+                                       msg=f"{term} {key}")
+        self.assertAlmostEqual(table['residual']['sum_sq'], expected['residual']['sum_sq'], places=8)
+        self.assertEqual(table['residual']['df'], expected['residual']['df'])
+    
+    def test_single_level_factor_returns_none(self):
+        self.assertIsNone(_two_way_anova(np.zeros(10, dtype=int), np.arange(10) % 2, np.arange(10.0)))
+
+
+class TestInteractionEffects(unittest.TestCase):
+    
+    def test_missing_onset_column_returns_note(self):
+        df = pd.DataFrame({
+            'participant_id': ['P1', 'P1', 'P2', 'P2'],
+            'condition': ['passive_viewing', 'clench', 'passive_viewing', 'clench'],
+            'stimulus_type': ['tool', 'Shape', 'SCRtool', 'SCRshape'],
+        })
+        results = StatisticalAnalyzer(df=df)._analyze_interaction_effects()
+        
+        self.assertEqual(results['n_trials'], 0)
+        self.assertIn('note', results)
+        self.assertNotIn('anova', results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Tests for the visualization module.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+ANALYSIS_DIR = Path(__file__).resolve().parent.parent / 'analysis'
+
+matplotlib.use('Agg')
+sys.path.insert(0, str(ANALYSIS_DIR))
+
+import visualization  # noqa: E402
+from visualization import _onset_std_by_participant, _segment_std_kernel  # noqa: E402
+
+EXPORTED_FILES = ('behavioral_results.png', 'timing_analysis.png', 'motor_network.png',
+                  'summary_figures.png')
+
+# Exports all four figures; argv: analysis dir, output dir, max_workers ('None' for default)
+EXPORT_SCRIPT = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, sys.argv[1])
+    import numpy as np
+    import pandas as pd
+    from visualization import DataVisualizer
+    
+    
+    def main():
+        rng = np.random.default_rng(0)
+        n = 200
+        df = pd.DataFrame({
+            'participant_id': rng.choice(['P1', 'P2', 'P3'], n),
+            'condition': rng.choice(['passive_viewing', 'active_grasp', 'imagined_grasp', 'clench'], n),
+            'stimulus_type': rng.choice(['tool', 'SCRtool', 'Shape', 'SCRshape'], n),
+            'stimulus_onset': rng.normal(10, 3, n),
+            'relative_onset': rng.normal(2, 1, n),
+        })
+        max_workers = None if sys.argv[3] == 'None' else int(sys.argv[3])
+        files = DataVisualizer(df=df).export_all_plots(
+            sys.argv[2], plots=('behavioral', 'timing', 'motor', 'summary'), max_workers=max_workers)
+        print(sorted(files))
+    
+    
+    if __name__ == '__main__':
+        main()
+""")
+
+
+class TestExportAllPlots(unittest.TestCase):
+    
+    def _run_export(self, command, output_dir):
+        """Run an export subprocess and check every figure was written."""
+        result = subprocess.run(
+            command, capture_output=True, text=True, timeout=300,
+            env={**os.environ, 'MPLBACKEND': 'Agg'}
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("['behavioral', 'motor', 'summary', 'timing']", result.stdout)
+        for name in EXPORTED_FILES:
+            self.assertGreater((Path(output_dir) / name).stat().st_size, 0)
+    
+    def test_serial_export_from_stdin_style_code(self):
+        """The default export is serial, so it also works from python -c (no importable __main__)."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            self._run_export([sys.executable, '-c', EXPORT_SCRIPT, str(ANALYSIS_DIR), output_dir, 'None'],
+                             output_dir)
+    
+    def test_parallel_export_from_script_file(self):
+        """A guarded script file using the spawned pool finishes (no hang after numba ran).
+        
+        The pool is capped at the CPU count, so on a single-CPU host this runs serially.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            script = Path(tmp) / 'export_plots.py'
+            script.write_text(EXPORT_SCRIPT)
+            output_dir = Path(tmp) / 'plots'
+            self._run_export([sys.executable, str(script), str(ANALYSIS_DIR), str(output_dir), '2'],
+                             output_dir)
+
+
+class TestOnsetStdByParticipant(unittest.TestCase):
+    
+    def setUp(self):
+        # Participants with several onsets, one onset, only NaN onsets, plus a missing ID
+        rng = np.random.default_rng(5)
+        self.participant_ids = pd.Series(['P3', 'P1', 'P2', 'P1', 'P3', None, 'P1', 'P4', 'P3', 'P4'],
+                                         name='participant_id')
+        self.onsets = rng.normal(60, 20, 10)
+        self.onsets[[4, 7, 9]] = np.nan
+        self.expected = pd.Series(self.onsets).groupby(self.participant_ids.to_numpy()).std()
+    
+    def test_segment_kernel_matches_numpy(self):
+        values = np.array([1.0, 2.5, np.nan, 4.0, 7.0, np.nan, np.nan, 3.0])
+        stds = _segment_std_kernel(values, np.array([0, 4, 5, 7]), np.array([4, 5, 7, 8]))
+        
+        np.testing.assert_allclose(stds, [np.nanstd(values[:4], ddof=1), np.nan, np.nan, np.nan])
+    
+    def test_compiled_and_pandas_paths_match_groupby(self):
+        for compiled in (visualization._segment_std, None):
+            with mock.patch.object(visualization, '_segment_std', compiled):
+                stds = _onset_std_by_participant(self.participant_ids, self.onsets)
+            self.assertEqual(list(stds.index), list(self.expected.index))
+            np.testing.assert_allclose(stds.to_numpy(), self.expected.to_numpy(), rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()